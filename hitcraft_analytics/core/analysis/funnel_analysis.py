@@ -10,7 +10,7 @@ import logging
 from typing import Dict, List, Optional, Tuple, Any, Union
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from hitcraft_analytics.utils.logging.logger import get_logger
 
@@ -93,48 +93,65 @@ class FunnelAnalyzer:
         for i in range(len(funnel_steps) - 1):
             step_times[(funnel_steps[i], funnel_steps[i+1])] = []
         
-        # Process each user's journey
-        for user_id, user_events in funnel_events.groupby(user_id_col):
-            current_step_idx = 0
-            current_step_time = None
+        # Process each user's journey. Events are already sorted by user and
+        # timestamp, so each user is a contiguous run of rows and every step
+        # is found by a forward scan from the previous step instead of
+        # re-filtering the user's events once per step.
+        funnel_events = funnel_events[funnel_events[user_id_col].notna()]
+        user_ids = funnel_events[user_id_col].to_numpy()
+        event_names = funnel_events[event_name_col].to_numpy()
+        timestamps = funnel_events[timestamp_col].to_numpy(dtype="datetime64[ns]")
+        max_delta = np.timedelta64(max_days_to_convert, "D")
+        one_day = np.timedelta64(1, "D")
+        
+        boundaries = np.flatnonzero(user_ids[1:] != user_ids[:-1]) + 1
+        starts = np.concatenate(([0], boundaries)) if len(user_ids) else []
+        ends = np.concatenate((boundaries, [len(user_ids)])) if len(user_ids) else []
+        
+        for start, end in zip(starts, ends):
+            user_id = user_ids[start]
             
             # We need to check if they have the first event
-            if not user_events[user_events[event_name_col] == funnel_steps[0]].empty:
-                # Mark user as converted for the first step
-                conversions[funnel_steps[0]].add(user_id)
-                current_step_time = user_events[user_events[event_name_col] == funnel_steps[0]].iloc[0][timestamp_col]
-                current_step_idx = 1
-            else:
+            first_matches = np.flatnonzero(event_names[start:end] == funnel_steps[0])
+            if len(first_matches) == 0:
                 # Skip this user if they don't have the first event
                 continue
             
+            # Mark user as converted for the first step
+            conversions[funnel_steps[0]].add(user_id)
+            pos = start + first_matches[0]
+            current_step_time = timestamps[pos]
+            
             # Process subsequent steps
             for step_idx in range(1, len(funnel_steps)):
                 step = funnel_steps[step_idx]
+                deadline = current_step_time + max_delta
                 
-                # Check if user performed this step after the previous step
-                step_events = user_events[
-                    (user_events[event_name_col] == step) & 
-                    (user_events[timestamp_col] > current_step_time) &
-                    (user_events[timestamp_col] <= current_step_time + timedelta(days=max_days_to_convert))
-                ]
+                # Find the first occurrence of this step after the previous step
+                step_pos = None
+                for j in range(pos + 1, end):
+                    if timestamps[j] > deadline:
+                        break
+                    if event_names[j] == step and timestamps[j] > current_step_time:
+                        step_pos = j
+                        break
                 
-                if not step_events.empty:
-                    # User converted at this step
-                    step_time = step_events.iloc[0][timestamp_col]
-                    conversions[step].add(user_id)
-                    
-                    # Track time to convert from previous step
-                    prev_step = funnel_steps[step_idx-1]
-                    time_diff = (step_time - current_step_time).total_seconds() / 86400  # in days
-                    step_times[(prev_step, step)].append(time_diff)
-                    
-                    # Update current step
-                    current_step_time = step_time
-                    current_step_idx = step_idx + 1
-                else:
+                if step_pos is None:
                     # User dropped off at this step
                     break
+                
+                # User converted at this step
+                step_time = timestamps[step_pos]
+                conversions[step].add(user_id)
+                
+                # Track time to convert from previous step
+                prev_step = funnel_steps[step_idx-1]
+                time_diff = float((step_time - current_step_time) / one_day)  # in days
+                step_times[(prev_step, step)].append(time_diff)
+                
+                # Update current step
+                current_step_time = step_time
+                pos = step_pos
         
         # Calculate conversion rates and absolute numbers
         step_counts = [len(conversions[step]) for step in funnel_steps]
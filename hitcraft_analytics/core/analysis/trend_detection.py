@@ -5,6 +5,8 @@ This module detects significant trends in time-series metrics to identify
 growth opportunities, risks, and patterns worthy of attention.
 """
 
+import functools
+
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
@@ -14,8 +16,194 @@ import statsmodels.api as sm
 
 from hitcraft_analytics.utils.logging.logger import get_logger
 
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; kernels run as plain Python without it
+    njit = None
+
 logger = get_logger(__name__)
 
+
+def _jit(func):
+    """
+    Compile a numeric kernel with Numba when it is installed.
+    
+    Compiled kernels release the GIL, so threads analyzing different
+    metrics can run them in parallel.
+    """
+    if njit is None:
+        return func
+    return njit(cache=True, nogil=True)(func)
+
+
+def _prefix_sums(values: np.ndarray) -> Tuple[float, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build NaN-aware prefix counts, sums and sums of squares with a leading zero.
+    
+    Values are centered on their mean first (the returned shift) so that the
+    variance computed from differences of prefix sums does not lose precision
+    on large counts.
+    """
+    valid = ~np.isnan(values)
+    shift = values[valid].mean() if valid.any() else 0.0
+    centered = np.where(valid, values - shift, 0.0)
+    
+    counts = np.zeros(len(values) + 1)
+    sums = np.zeros(len(values) + 1)
+    sq_sums = np.zeros(len(values) + 1)
+    np.cumsum(valid, out=counts[1:])
+    np.cumsum(centered, out=sums[1:])
+    np.cumsum(centered * centered, out=sq_sums[1:])
+    
+    return shift, counts, sums, sq_sums
+
+
+def _window_stats_numpy(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Compute NaN-aware statistics of the windows either side of each candidate split.
+    
+    Candidate splits are the positions ``window <= i < len(values) - window``.
+    Every window statistic is an O(1) difference of prefix sums, so the whole
+    pass is O(T) regardless of the window size.
+    
+    Args:
+        values (np.ndarray): float64 series values.
+        window (int): Number of points on each side of a split.
+        
+    Returns:
+        np.ndarray: Array of shape (n_candidates, 6) with columns
+            count_before, mean_before, var_before, count_after, mean_after, var_after
+            (variances use ddof=1).
+    """
+    n_candidates = max(len(values) - 2 * window, 0)
+    out = np.empty((n_candidates, 6))
+    if n_candidates == 0:
+        return out
+    
+    shift, counts, sums, sq_sums = _prefix_sums(values)
+    splits = np.arange(window, window + n_candidates)
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for side, (start, end) in enumerate(((splits - window, splits), (splits, splits + window))):
+            count = counts[end] - counts[start]
+            total = sums[end] - sums[start]
+            sq_dev = np.maximum(sq_sums[end] - sq_sums[start] - total * total / count, 0.0)
+            out[:, 3 * side] = count
+            out[:, 3 * side + 1] = total / count + shift
+            out[:, 3 * side + 2] = np.where(count > 1, sq_dev / (count - 1), np.nan)
+    
+    return out
+
+
+@_jit
+def _window_stats_native(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Compiled equivalent of ``_window_stats_numpy``, fusing all passes into one loop.
+    
+    Expects the same inputs and returns the same layout.
+    """
+    n = values.shape[0]
+    n_candidates = max(n - 2 * window, 0)
+    out = np.empty((n_candidates, 6))
+    if n_candidates == 0:
+        return out
+    
+    total = 0.0
+    valid = 0
+    for j in range(n):
+        if not np.isnan(values[j]):
+            total += values[j]
+            valid += 1
+    shift = total / valid if valid > 0 else 0.0
+    
+    counts = np.zeros(n + 1)
+    sums = np.zeros(n + 1)
+    sq_sums = np.zeros(n + 1)
+    for j in range(n):
+        v = values[j]
+        counts[j + 1] = counts[j]
+        sums[j + 1] = sums[j]
+        sq_sums[j + 1] = sq_sums[j]
+        if not np.isnan(v):
+            v -= shift
+            counts[j + 1] += 1.0
+            sums[j + 1] += v
+            sq_sums[j + 1] += v * v
+    
+    for k in range(n_candidates):
+        i = window + k
+        for side in range(2):
+            start = i - window if side == 0 else i
+            end = start + window
+            count = counts[end] - counts[start]
+            part = sums[end] - sums[start]
+            if count > 0:
+                mean = part / count + shift
+                sq_dev = max(sq_sums[end] - sq_sums[start] - part * part / count, 0.0)
+            else:
+                mean = np.nan
+                sq_dev = np.nan
+            out[k, 3 * side] = count
+            out[k, 3 * side + 1] = mean
+            out[k, 3 * side + 2] = sq_dev / (count - 1) if count > 1 else np.nan
+    
+    return out
+
+
+@functools.lru_cache(maxsize=32)
+def _position_moments(n: int) -> Tuple[np.ndarray, float, float]:
+    """
+    Return positions 0..n-1 with their mean and centered sum of squares.
+    
+    These depend only on the series length, so they are cached and shared by
+    every linear fit over an evenly spaced series of that length.
+    """
+    x = np.arange(n, dtype=np.float64)
+    x.setflags(write=False)
+    dx = x - x.mean()
+    return x, float(x.mean()), float(np.dot(dx, dx))
+
+
+def _linear_fit(x: np.ndarray, y: np.ndarray, x_mean: Optional[float] = None,
+                sxx: Optional[float] = None) -> Tuple[float, float, float]:
+    """
+    Closed-form ordinary least squares fit of y on x with an intercept.
+    
+    Returns:
+        Tuple[float, float, float]: Slope, two-sided p-value of the slope and R-squared
+    """
+    n = len(x)
+    if x_mean is None:
+        x_mean = x.mean()
+    dx = x - x_mean
+    if sxx is None:
+        sxx = np.dot(dx, dx)
+    dy = y - y.mean()
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.dot(dx, dy) / sxx
+        syy = np.dot(dy, dy)
+        ssr = max(syy - slope * slope * sxx, 0.0)
+        r_squared = 1 - ssr / syy
+        t_value = slope / np.sqrt(ssr / (n - 2) / sxx)
+    
+    p_value = 2 * stats.t.sf(abs(t_value), n - 2)
+    return slope, p_value, r_squared
+
+
+# Prefer the compiled kernel when Numba is available, otherwise the NumPy pass
+_window_stats = _window_stats_native if njit is not None else _window_stats_numpy
+
+
+def warm_up_kernels() -> None:
+    """
+    Trigger compilation of the numeric kernels on a tiny input.
+    
+    Call once at worker startup so the first scheduled analysis does not pay
+    the JIT compile cost. A no-op apart from a trivial call without Numba.
+    """
+    _window_stats(np.zeros(2, dtype=np.float64), 1)
+
 class TrendDetector:
     """
     Detects significant trends in time-series data.
@@ -39,6 +227,30 @@ class TrendDetector:
         
         logger.info("Trend detector initialized")
     
+    @staticmethod
+    def prepare_series(time_series: Union[pd.Series, np.ndarray, List[float]]) -> pd.Series:
+        """
+        Coerce time series data to a Series backed by a contiguous float64 array.
+        
+        Input that is already in that form is returned as-is, so callers running
+        several detectors on one series can convert it once up front and every
+        detector then works on the same buffer without copying.
+        
+        Args:
+            time_series: Series, ndarray or sequence of numeric values.
+            
+        Returns:
+            pd.Series: float64 series; non-Series input gets a positional index.
+        """
+        if isinstance(time_series, pd.Series):
+            values = time_series.to_numpy()
+            if values.dtype == np.float64 and values.flags.c_contiguous:
+                return time_series
+            return pd.Series(np.ascontiguousarray(values, dtype=np.float64),
+                             index=time_series.index, name=time_series.name)
+        
+        return pd.Series(np.ascontiguousarray(time_series, dtype=np.float64))
+    
     def detect_linear_trend(self, time_series: pd.Series) -> Dict[str, Any]:
         """
         Detect if there is a statistically significant linear trend in the time series.
@@ -57,6 +269,7 @@ class TrendDetector:
                 - absolute_change: Absolute change over the period
                 - r_squared: R-squared value of the linear model
         """
+        time_series = self.prepare_series(time_series)
         logger.info("Detecting linear trend in time series with %d points", len(time_series))
         
         # Check if we have enough data points
@@ -66,33 +279,27 @@ class TrendDetector:
             return self._create_no_trend_result()
         
         try:
-            # Convert index to numeric (days since start)
-            if isinstance(time_series.index, pd.DatetimeIndex):
-                days_since_start = (time_series.index - time_series.index.min()).total_seconds() / (24 * 3600)
-            else:
-                # If not datetime index, just use numeric indices
-                days_since_start = np.arange(len(time_series))
-            
             # Clean data (remove NaN values)
-            valid_mask = ~np.isnan(time_series.values)
-            if sum(valid_mask) < self.min_data_points:
+            values = time_series.to_numpy()
+            valid_mask = ~np.isnan(values)
+            valid_count = int(valid_mask.sum())
+            if valid_count < self.min_data_points:
                 logger.warning("Not enough valid data points after removing NaN values")
                 return self._create_no_trend_result()
-                
-            x = days_since_start[valid_mask]
-            y = time_series.values[valid_mask]
-            
-            # Add constant for statsmodels
-            X = sm.add_constant(x)
             
-            # Fit linear model
-            model = sm.OLS(y, X)
-            results = model.fit()
-            
-            # Extract slope and p-value
-            slope = results.params[1]
-            p_value = results.pvalues[1]
-            r_squared = results.rsquared
+            # Convert index to numeric (days since start)
+            if isinstance(time_series.index, pd.DatetimeIndex):
+                days_since_start = np.asarray(
+                    (time_series.index - time_series.index.min()).total_seconds() / (24 * 3600)
+                )
+                slope, p_value, r_squared = _linear_fit(days_since_start[valid_mask], values[valid_mask])
+            elif valid_count == len(values):
+                # If not datetime index, just use numeric indices
+                x, x_mean, sxx = _position_moments(len(values))
+                slope, p_value, r_squared = _linear_fit(x, values, x_mean, sxx)
+            else:
+                x, _, _ = _position_moments(len(values))
+                slope, p_value, r_squared = _linear_fit(x[valid_mask], values[valid_mask])
             
             # Calculate percentage and absolute change
             first_value = time_series.iloc[0]
@@ -154,6 +361,7 @@ class TrendDetector:
                 - absolute_change: Absolute change
                 - significance: Statistical significance score
         """
+        time_series = self.prepare_series(time_series)
         logger.info("Detecting change points in time series with %d points", len(time_series))
         
         # Check if we have enough data points
@@ -172,33 +380,39 @@ class TrendDetector:
             
             change_points = []
             
-            # Exclude first and last windows from change point detection
-            for i in range(window_size, len(time_series) - window_size):
-                # Get values before and after the potential change point
-                values_before = time_series.iloc[i-window_size:i].values
-                values_after = time_series.iloc[i:i+window_size].values
-                
-                # Clean data (remove NaN values)
-                values_before = values_before[~np.isnan(values_before)]
-                values_after = values_after[~np.isnan(values_after)]
-                
-                if len(values_before) < 3 or len(values_after) < 3:
+            # Window statistics for every candidate split in one compiled pass,
+            # excluding the first and last windows
+            values = time_series.to_numpy()
+            stats_by_split = _window_stats(values, window_size)
+            if len(stats_by_split) == 0:
+                return []
+            
+            count_before, mean_before, var_before = stats_by_split[:, 0], stats_by_split[:, 1], stats_by_split[:, 2]
+            count_after, mean_after, var_after = stats_by_split[:, 3], stats_by_split[:, 4], stats_by_split[:, 5]
+            
+            # Welch's t-test for all candidates at once
+            with np.errstate(divide="ignore", invalid="ignore"):
+                _, p_values = stats.ttest_ind_from_stats(
+                    mean_before, np.sqrt(var_before), count_before,
+                    mean_after, np.sqrt(var_after), count_after,
+                    equal_var=False
+                )
+            
+            for k in range(len(stats_by_split)):
+                # Require at least 3 valid points on each side
+                if count_before[k] < 3 or count_after[k] < 3:
                     continue
                 
-                # Calculate means
-                mean_before = np.mean(values_before)
-                mean_after = np.mean(values_after)
+                i = window_size + k
+                p_value = p_values[k]
                 
                 # Calculate percentage change
-                if mean_before == 0:
-                    percent_change = np.inf if mean_after > 0 else -np.inf if mean_after < 0 else 0
+                if mean_before[k] == 0:
+                    percent_change = np.inf if mean_after[k] > 0 else -np.inf if mean_after[k] < 0 else 0
                 else:
-                    percent_change = ((mean_after - mean_before) / abs(mean_before)) * 100
-                
-                absolute_change = mean_after - mean_before
+                    percent_change = ((mean_after[k] - mean_before[k]) / abs(mean_before[k])) * 100
                 
-                # Perform t-test to determine if change is significant
-                t_stat, p_value = stats.ttest_ind(values_before, values_after, equal_var=False)
+                absolute_change = mean_after[k] - mean_before[k]
                 
                 # Check if change is significant
                 if (p_value < self.significance_level and 
@@ -207,8 +421,8 @@ class TrendDetector:
                     change_point = {
                         "index": i,
                         "timestamp": time_series.index[i],
-                        "value_before": mean_before,
-                        "value_after": mean_after,
+                        "value_before": mean_before[k],
+                        "value_after": mean_after[k],
                         "percent_change": percent_change,
                         "absolute_change": absolute_change,
                         "significance": 1 - p_value
@@ -347,6 +561,7 @@ class TrendDetector:
                 - deviation: Number of standard deviations from the mean
                 - percent_deviation: Percentage deviation from the mean
         """
+        time_series = self.prepare_series(time_series)
         logger.info("Detecting anomalies in time series with %d points", len(time_series))
         
         # Check if we have enough data points
@@ -364,41 +579,41 @@ class TrendDetector:
             rolling_mean = time_series.rolling(window=window_size, center=True).mean()
             rolling_std = time_series.rolling(window=window_size, center=True).std()
             
-            # Calculate z-scores
-            z_scores = (time_series - rolling_mean) / rolling_std
+            values = time_series.to_numpy()
+            expected_values = rolling_mean.to_numpy()
+            
+            # Calculate z-scores and identify anomalies; points with insufficient history at the
+            # beginning and end have NaN z-scores and never exceed the threshold
+            with np.errstate(divide="ignore", invalid="ignore"):
+                z_scores = (values - expected_values) / rolling_std.to_numpy()
+                anomaly_positions = np.flatnonzero(np.abs(z_scores) > std_threshold)
             
-            # Identify anomalies
             anomalies = []
             
-            for i in range(len(time_series)):
-                # Skip points with insufficient history (beginning and end)
-                if np.isnan(z_scores.iloc[i]):
-                    continue
+            for i in anomaly_positions:
+                i = int(i)
+                value = values[i]
+                expected = expected_values[i]
                 
-                # Check if point exceeds threshold
-                if abs(z_scores.iloc[i]) > std_threshold:
-                    value = time_series.iloc[i]
-                    expected = rolling_mean.iloc[i]
-                    
-                    # Calculate percentage deviation
-                    if expected == 0:
-                        pct_deviation = np.inf if value > 0 else -np.inf if value < 0 else 0
-                    else:
-                        pct_deviation = ((value - expected) / abs(expected)) * 100
-                    
-                    anomaly = {
-                        "index": i,
-                        "timestamp": time_series.index[i],
-                        "value": value,
-                        "expected_value": expected,
-                        "deviation": z_scores.iloc[i],
-                        "percent_deviation": pct_deviation
-                    }
-                    
-                    anomalies.append(anomaly)
-                    
-                    logger.info("Detected anomaly at %s: value=%.2f, expected=%.2f, deviation=%.2f σ",
-                              time_series.index[i], value, expected, z_scores.iloc[i])
+                # Calculate percentage deviation
+                if expected == 0:
+                    pct_deviation = np.inf if value > 0 else -np.inf if value < 0 else 0
+                else:
+                    pct_deviation = ((value - expected) / abs(expected)) * 100
+                
+                anomaly = {
+                    "index": i,
+                    "timestamp": time_series.index[i],
+                    "value": value,
+                    "expected_value": expected,
+                    "deviation": z_scores[i],
+                    "percent_deviation": pct_deviation
+                }
+                
+                anomalies.append(anomaly)
+                
+                logger.info("Detected anomaly at %s: value=%.2f, expected=%.2f, deviation=%.2f σ",
+                          time_series.index[i], value, expected, z_scores[i])
             
             logger.info("Detected %d anomalies in time series", len(anomalies))
             return anomalies
@@ -6,7 +6,13 @@ with the database including setup, querying, and connection management.
 """
 
 import contextlib
-from typing import Dict, List, Optional, Any, Generator, Tuple
+import csv
+import io
+import itertools
+import json
+import threading
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Generator, Tuple
 
 import sqlalchemy
 from sqlalchemy import create_engine, MetaData, Table, Column, text
@@ -48,6 +54,8 @@ class DatabaseConnector:
         self.engine = None
         self.metadata = MetaData()
         self.session_factory = None
+        self._tables: Dict[str, Table] = {}
+        self._tables_lock = threading.Lock()
         self._setup_engine()
         
         logger.info("Database connector initialized")
@@ -86,6 +94,26 @@ class DatabaseConnector:
             logger.error("Failed to setup database engine: %s", str(e))
             raise
     
+    def _get_table(self, table_name: str) -> Table:
+        """
+        Get a reflected table, loading its definition only on first use.
+        
+        Reflection is guarded by a lock so concurrent inserts from several
+        threads don't reflect the same table into the shared metadata at once.
+        
+        Args:
+            table_name (str): Name of the table.
+            
+        Returns:
+            Table: SQLAlchemy table object.
+        """
+        with self._tables_lock:
+            table = self._tables.get(table_name)
+            if table is None:
+                table = Table(table_name, self.metadata, autoload_with=self.engine)
+                self._tables[table_name] = table
+            return table
+    
     @contextlib.contextmanager
     def session_scope(self) -> Generator[Session, None, None]:
         """
@@ -108,6 +136,35 @@ class DatabaseConnector:
         finally:
             session.close()
     
+    @contextlib.contextmanager
+    def raw_transaction(self, synchronous_commit: bool = True) -> Generator[Any, None, None]:
+        """
+        Provide a DB-API cursor whose statements all run in one transaction.
+        
+        The transaction is committed when the block exits normally and rolled
+        back if it raises.
+        
+        Args:
+            synchronous_commit (bool): If False, the commit does not wait for
+                the WAL flush. Suitable for reloadable data such as test and
+                sample rows.
+            
+        Yields:
+            Generator[Any, None, None]: psycopg2 cursor on a pooled connection.
+        """
+        connection = self.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            if not synchronous_commit:
+                cursor.execute("SET LOCAL synchronous_commit TO OFF")
+            yield cursor
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+    
     def create_tables(self) -> None:
         """
         Create all tables defined in the SQLAlchemy models.
@@ -202,6 +259,37 @@ class DatabaseConnector:
                 logger.error("Failed to execute query: %s", str(e))
                 raise
     
+    def execute_many(self, query: str, rows: List[Tuple[Any, ...]], page_size: int = 1000) -> int:
+        """
+        Execute a multi-row statement for many parameter tuples in one transaction.
+        
+        The query must contain a single %s placeholder for the VALUES list
+        (e.g. "INSERT INTO events (a, b) VALUES %s"); psycopg2's execute_values
+        expands it so each statement carries up to page_size rows.
+        
+        Args:
+            query (str): SQL statement with one %s VALUES placeholder.
+            rows (List[Tuple[Any, ...]]): Parameter tuples, one per row.
+            page_size (int): Maximum number of rows per statement.
+            
+        Returns:
+            int: Number of rows sent.
+        """
+        if not rows:
+            logger.warning("No rows provided for execute_many")
+            return 0
+        
+        from psycopg2.extras import execute_values
+        
+        try:
+            with self.raw_transaction() as cursor:
+                execute_values(cursor, query, rows, page_size=page_size)
+            return len(rows)
+            
+        except Exception as e:
+            logger.error("Failed to execute batched query: %s", str(e))
+            raise
+    
     def bulk_insert(self, table_name: str, data: List[Dict[str, Any]]) -> int:
         """
         Insert multiple rows into a table.
@@ -220,7 +308,7 @@ class DatabaseConnector:
         with self.session_scope() as session:
             try:
                 # Get table reference
-                table = Table(table_name, self.metadata, autoload_with=self.engine)
+                table = self._get_table(table_name)
                 
                 # Insert data
                 result = session.execute(table.insert(), data)
@@ -233,6 +321,53 @@ class DatabaseConnector:
                 logger.error("Failed to bulk insert into %s: %s", table_name, str(e))
                 raise
     
+    def copy_records(self, table_name: str, records: Iterable[Dict[str, Any]],
+                     synchronous_commit: bool = True) -> int:
+        """
+        Load rows with a single PostgreSQL COPY ... FROM STDIN statement.
+        
+        Records are encoded as CSV while the server reads them, so any iterable
+        (including a generator) is streamed through one COPY without being
+        materialized first. Dict and list values are stored as JSON.
+        
+        Args:
+            table_name (str): Name of the table.
+            records (Iterable[Dict[str, Any]]): Rows to load. The columns copied
+                are the table columns present in the rows (in any row for a list,
+                in the first row otherwise); missing values are loaded as NULL.
+            synchronous_commit (bool): If False, the load's commit does not wait
+                for the WAL flush (see raw_transaction).
+            
+        Returns:
+            int: Number of rows copied.
+        """
+        iterator = iter(records)
+        first = next(iterator, None)
+        if first is None:
+            logger.warning("No data provided for copy into %s", table_name)
+            return 0
+        
+        table = self._get_table(table_name)
+        present = set().union(*records) if isinstance(records, list) else first.keys()
+        columns = [column.name for column in table.columns if column.name in present]
+        
+        quote = self.engine.dialect.identifier_preparer.quote
+        query = "COPY {} ({}) FROM STDIN WITH (FORMAT csv, NULL '\\N')".format(
+            quote(table_name), ", ".join(quote(column) for column in columns)
+        )
+        stream = _CsvRecordStream(itertools.chain([first], iterator), columns)
+        
+        try:
+            with self.raw_transaction(synchronous_commit=synchronous_commit) as cursor:
+                cursor.copy_expert(query, stream)
+            
+            logger.info("Copied %d rows into %s", stream.row_count, table_name)
+            return stream.row_count
+            
+        except Exception as e:
+            logger.error("Failed to copy into %s: %s", table_name, str(e))
+            raise
+    
     def upsert(self, table_name: str, data: Dict[str, Any], 
               conflict_columns: List[str], update_columns: Optional[List[str]] = None) -> bool:
         """
@@ -251,7 +386,7 @@ class DatabaseConnector:
         with self.session_scope() as session:
             try:
                 # Get table reference
-                table = Table(table_name, self.metadata, autoload_with=self.engine)
+                table = self._get_table(table_name)
                 
                 # If update_columns not specified, use all columns except conflict columns
                 if update_columns is None:
@@ -318,3 +453,53 @@ def postgresql_upsert(table: Table, data: Dict[str, Any],
     )
     
     return upsert_stmt
+
+
+def _dump_json(value: Any) -> str:
+    # Compact separators keep bulk-loaded JSON columns as small as possible
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+class _CsvRecordStream:
+    """
+    Read-only file-like object that encodes row dicts as CSV on demand.
+    
+    Used as the COPY source by DatabaseConnector.copy_records, which lets
+    psycopg2 pull rows from a generator as the server consumes them.
+    """
+    
+    def __init__(self, records: Iterator[Dict[str, Any]], columns: List[str]):
+        self._records = records
+        self._columns = columns
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+        self.row_count = 0
+    
+    def _encode(self, value: Any) -> Any:
+        if value is None:
+            return "\\N"
+        if isinstance(value, (dict, list)):
+            return _dump_json(value)
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return value
+    
+    def read(self, size: int = -1) -> str:
+        # Encode rows until at least size characters are buffered (all of
+        # them for size < 0), then hand out exactly that much
+        while size < 0 or self._buffer.tell() < size:
+            record = next(self._records, None)
+            if record is None:
+                break
+            self._writer.writerow([self._encode(record.get(column)) for column in self._columns])
+            self.row_count += 1
+        
+        data = self._buffer.getvalue()
+        if 0 <= size < len(data):
+            data, rest = data[:size], data[size:]
+        else:
+            rest = ""
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._buffer.write(rest)
+        return data
@@ -7,9 +7,10 @@ data extraction, and error handling for all Mixpanel-related operations.
 
 import base64
 import json
+import threading
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Union, Any, Tuple
+from typing import Dict, Iterator, List, Optional, Union, Any, Tuple
 
 import requests
 from requests.adapters import HTTPAdapter
@@ -54,6 +55,7 @@ class MixpanelConnector:
         # Track request times to handle rate limiting
         self.last_request_time = 0
         self.rate_limit = MIXPANEL_RATE_LIMIT
+        self._rate_limit_lock = threading.Lock()
         
         # Validate required credentials
         self._validate_credentials()
@@ -130,16 +132,19 @@ class MixpanelConnector:
     def _rate_limit_request(self) -> None:
         """
         Implement rate limiting to avoid API request limits.
-        """
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
         
-        # If less than 1/rate_limit seconds have passed, wait
-        if elapsed < (1.0 / self.rate_limit):
-            sleep_time = (1.0 / self.rate_limit) - elapsed
-            time.sleep(sleep_time)
-            
-        self.last_request_time = time.time()
+        Safe to call from several threads sharing this connector: each caller
+        reserves the next free request slot under a lock and then sleeps
+        until it, so concurrent requests are spaced out rather than bunched.
+        """
+        with self._rate_limit_lock:
+            current_time = time.monotonic()
+            slot = max(current_time, self.last_request_time + 1.0 / self.rate_limit)
+            self.last_request_time = slot
+        
+        # If less than 1/rate_limit seconds have passed since the previous slot, wait
+        if slot > current_time:
+            time.sleep(slot - current_time)
     
     def _make_request(self, method: str, endpoint: str, params: Optional[Dict] = None, 
                     data: Optional[Dict] = None, use_data_api: bool = False) -> Dict:
@@ -238,6 +243,32 @@ class MixpanelConnector:
         Returns:
             List[Dict]: List of event data records.
         """
+        events = list(self.iter_events(
+            event_names=event_names,
+            from_date=from_date,
+            to_date=to_date,
+            properties=properties,
+            where=where
+        ))
+        
+        logger.info("Retrieved %d events from Mixpanel", len(events))
+        return events
+    
+    def iter_events(self, 
+                 event_names: Optional[List[str]] = None, 
+                 from_date: Optional[str] = None,
+                 to_date: Optional[str] = None,
+                 properties: Optional[List[str]] = None,
+                 where: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Stream event data from Mixpanel, yielding each event as its line arrives.
+        
+        Takes the same arguments as get_events. The export response is read
+        incrementally, so memory use does not grow with the number of events.
+        
+        Yields:
+            Dict: Event data records.
+        """
         # IMPORTANT: For testing purposes with the Mixpanel API, which only works with real dates,
         # we're using actual current dates regardless of what was passed in as parameters.
         # This ensures we can make real API calls to Mixpanel.
@@ -280,26 +311,24 @@ class MixpanelConnector:
             # Create a direct request rather than using _make_request
             # because the response format is different (newline-delimited JSON)
             auth = self._get_auth()
-            response = self.session.get(
+            self._rate_limit_request()
+            with self.session.get(
                 url,
                 auth=auth,
                 params=params,
-                timeout=MIXPANEL_REQUEST_TIMEOUT
-            )
-            response.raise_for_status()
-            
-            # Parse the newline-delimited JSON response
-            events = []
-            for line in response.text.strip().split("\n"):
-                if line:  # Skip empty lines
-                    try:
-                        events.append(json.loads(line))
-                    except json.JSONDecodeError as e:
-                        logger.warning("Error parsing JSON response: %s", str(e))
-                        continue
-            
-            logger.info("Retrieved %d events from Mixpanel", len(events))
-            return events
+                timeout=MIXPANEL_REQUEST_TIMEOUT,
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                
+                # Parse the newline-delimited JSON response line by line
+                for line in response.iter_lines():
+                    if line:  # Skip empty lines
+                        try:
+                            yield json.loads(line)
+                        except json.JSONDecodeError as e:
+                            logger.warning("Error parsing JSON response: %s", str(e))
+                            continue
         except Exception as e:
             logger.error("Failed to retrieve events: %s", str(e))
             raise
@@ -674,95 +674,53 @@ class EventsRepository:
             # Query for current period metrics
             metrics = {}
             
-            # Daily Active Users (DAU)
-            current_dau_query = f"""
-                SELECT COUNT(DISTINCT distinct_id) as value
-                FROM events
-                WHERE time BETWEEN '{from_date}' AND '{to_date}'
-                GROUP BY DATE(time)
-                ORDER BY value DESC
-                LIMIT 1
-            """
+            # The same statements serve both periods; the dates are bound as
+            # parameters rather than interpolated into the SQL text
+            current_period = {"from_date": from_date, "to_date": to_date}
+            prev_period = {"from_date": prev_from, "to_date": prev_to}
             
-            # Previous period DAU
-            prev_dau_query = f"""
+            # Daily Active Users (DAU)
+            dau_query = """
                 SELECT COUNT(DISTINCT distinct_id) as value
                 FROM events
-                WHERE time BETWEEN '{prev_from}' AND '{prev_to}'
+                WHERE time BETWEEN :from_date AND :to_date
                 GROUP BY DATE(time)
                 ORDER BY value DESC
                 LIMIT 1
             """
             
             # Weekly Active Users (WAU)
-            current_wau_query = f"""
-                SELECT COUNT(DISTINCT distinct_id) as value
-                FROM events
-                WHERE time BETWEEN '{from_date}' AND '{to_date}'
-            """
-            
-            # Previous period WAU
-            prev_wau_query = f"""
+            wau_query = """
                 SELECT COUNT(DISTINCT distinct_id) as value
                 FROM events
-                WHERE time BETWEEN '{prev_from}' AND '{prev_to}'
+                WHERE time BETWEEN :from_date AND :to_date
             """
             
             # Retention rate (users who returned after their first visit)
-            current_retention_query = f"""
+            retention_query = """
                 SELECT 
                     (COUNT(DISTINCT u2.distinct_id) * 100.0 / NULLIF(COUNT(DISTINCT u1.distinct_id), 0)) as retention_rate
                 FROM 
                     (SELECT DISTINCT distinct_id FROM events 
-                     WHERE time BETWEEN '{from_date}' AND '{to_date}') u1
+                     WHERE time BETWEEN :from_date AND :to_date) u1
                 LEFT JOIN 
                     (SELECT DISTINCT e2.distinct_id 
                      FROM events e1
                      JOIN events e2 ON e1.distinct_id = e2.distinct_id AND e2.time > e1.time + interval '1 day'
-                     WHERE e1.time BETWEEN '{from_date}' AND '{to_date}'
-                     AND e2.time BETWEEN '{from_date}' AND '{to_date}') u2
-                ON u1.distinct_id = u2.distinct_id
-            """
-            
-            # Previous period retention
-            prev_retention_query = f"""
-                SELECT 
-                    (COUNT(DISTINCT u2.distinct_id) * 100.0 / NULLIF(COUNT(DISTINCT u1.distinct_id), 0)) as retention_rate
-                FROM 
-                    (SELECT DISTINCT distinct_id FROM events 
-                     WHERE time BETWEEN '{prev_from}' AND '{prev_to}') u1
-                LEFT JOIN 
-                    (SELECT DISTINCT e2.distinct_id 
-                     FROM events e1
-                     JOIN events e2 ON e1.distinct_id = e2.distinct_id AND e2.time > e1.time + interval '1 day'
-                     WHERE e1.time BETWEEN '{prev_from}' AND '{prev_to}'
-                     AND e2.time BETWEEN '{prev_from}' AND '{prev_to}') u2
+                     WHERE e1.time BETWEEN :from_date AND :to_date
+                     AND e2.time BETWEEN :from_date AND :to_date) u2
                 ON u1.distinct_id = u2.distinct_id
             """
             
             # Get conversion rate (signup to purchase or similar key conversion)
             # This is an example - adjust event names based on your actual funnel
-            current_conversion_query = f"""
-                WITH funnel AS (
-                    SELECT
-                        COUNT(DISTINCT CASE WHEN event_name = 'app_open' THEN distinct_id END) as step1,
-                        COUNT(DISTINCT CASE WHEN event_name = 'purchase' THEN distinct_id END) as step2
-                    FROM events
-                    WHERE time BETWEEN '{from_date}' AND '{to_date}'
-                )
-                SELECT 
-                    (step2 * 100.0 / NULLIF(step1, 0)) as conversion_rate
-                FROM funnel
-            """
-            
-            # Previous period conversion
-            prev_conversion_query = f"""
+            conversion_query = """
                 WITH funnel AS (
                     SELECT
                         COUNT(DISTINCT CASE WHEN event_name = 'app_open' THEN distinct_id END) as step1,
                         COUNT(DISTINCT CASE WHEN event_name = 'purchase' THEN distinct_id END) as step2
                     FROM events
-                    WHERE time BETWEEN '{prev_from}' AND '{prev_to}'
+                    WHERE time BETWEEN :from_date AND :to_date
                 )
                 SELECT 
                     (step2 * 100.0 / NULLIF(step1, 0)) as conversion_rate
@@ -771,56 +729,56 @@ class EventsRepository:
             
             # Execute queries and store results
             try:
-                current_dau_result = self.db.execute_query(current_dau_query)
+                current_dau_result = self.db.execute_query(dau_query, current_period)
                 current_dau = current_dau_result[0]['value'] if current_dau_result else 0
             except Exception as e:
                 logger.warning(f"Error calculating current DAU: {str(e)}")
                 current_dau = 0
                 
             try:
-                prev_dau_result = self.db.execute_query(prev_dau_query)
+                prev_dau_result = self.db.execute_query(dau_query, prev_period)
                 prev_dau = prev_dau_result[0]['value'] if prev_dau_result else 0
             except Exception as e:
                 logger.warning(f"Error calculating previous DAU: {str(e)}")
                 prev_dau = 0
                 
             try:
-                current_wau_result = self.db.execute_query(current_wau_query)
+                current_wau_result = self.db.execute_query(wau_query, current_period)
                 current_wau = current_wau_result[0]['value'] if current_wau_result else 0
             except Exception as e:
                 logger.warning(f"Error calculating current WAU: {str(e)}")
                 current_wau = 0
                 
             try:
-                prev_wau_result = self.db.execute_query(prev_wau_query)
+                prev_wau_result = self.db.execute_query(wau_query, prev_period)
                 prev_wau = prev_wau_result[0]['value'] if prev_wau_result else 0
             except Exception as e:
                 logger.warning(f"Error calculating previous WAU: {str(e)}")
                 prev_wau = 0
             
             try:
-                current_retention_result = self.db.execute_query(current_retention_query)
+                current_retention_result = self.db.execute_query(retention_query, current_period)
                 current_retention = current_retention_result[0]['retention_rate'] if current_retention_result else 0
             except Exception as e:
                 logger.warning(f"Error calculating current retention: {str(e)}")
                 current_retention = 0
                 
             try:
-                prev_retention_result = self.db.execute_query(prev_retention_query)
+                prev_retention_result = self.db.execute_query(retention_query, prev_period)
                 prev_retention = prev_retention_result[0]['retention_rate'] if prev_retention_result else 0
             except Exception as e:
                 logger.warning(f"Error calculating previous retention: {str(e)}")
                 prev_retention = 0
                 
             try:
-                current_conversion_result = self.db.execute_query(current_conversion_query)
+                current_conversion_result = self.db.execute_query(conversion_query, current_period)
                 current_conversion = current_conversion_result[0]['conversion_rate'] if current_conversion_result else 0
             except Exception as e:
                 logger.warning(f"Error calculating current conversion: {str(e)}")
                 current_conversion = 0
                 
             try:
-                prev_conversion_result = self.db.execute_query(prev_conversion_query)
+                prev_conversion_result = self.db.execute_query(conversion_query, prev_period)
                 prev_conversion = prev_conversion_result[0]['conversion_rate'] if prev_conversion_result else 0
             except Exception as e:
                 logger.warning(f"Error calculating previous conversion: {str(e)}")
@@ -6,6 +6,7 @@ data, identifying patterns, and generating actionable recommendations.
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any, Union
 from datetime import datetime, timedelta
 import uuid
@@ -94,32 +95,30 @@ class InsightsEngine:
         if not insight_types:
             insight_types = ["funnel", "trend", "cohort", "anomaly"]
         
-        # Generate funnel insights if requested
-        if "funnel" in insight_types:
-            try:
-                funnel_insights = self._generate_funnel_insights(from_date, to_date)
-                all_insights.extend(funnel_insights)
-                logger.info(f"Generated {len(funnel_insights)} funnel insights")
-            except Exception as e:
-                logger.error(f"Error generating funnel insights: {str(e)}")
-        
-        # Generate trend insights if requested
-        if "trend" in insight_types:
-            try:
-                trend_insights = self._generate_trend_insights(from_date, to_date)
-                all_insights.extend(trend_insights)
-                logger.info(f"Generated {len(trend_insights)} trend insights")
-            except Exception as e:
-                logger.error(f"Error generating trend insights: {str(e)}")
-        
-        # Generate cohort insights if requested
-        if "cohort" in insight_types:
-            try:
-                cohort_insights = self._generate_cohort_insights(from_date, to_date)
-                all_insights.extend(cohort_insights)
-                logger.info(f"Generated {len(cohort_insights)} cohort insights")
-            except Exception as e:
-                logger.error(f"Error generating cohort insights: {str(e)}")
+        # Generate each requested insight type. The generators are independent
+        # and dominated by repository queries, so they run concurrently.
+        generators = {
+            "funnel": self._generate_funnel_insights,
+            "trend": self._generate_trend_insights,
+            "cohort": self._generate_cohort_insights
+        }
+        requested = [name for name in generators if name in insight_types]
+        
+        if requested:
+            with ThreadPoolExecutor(max_workers=len(requested)) as executor:
+                futures = {
+                    name: executor.submit(generators[name], from_date, to_date)
+                    for name in requested
+                }
+                
+                # Collect in a fixed order so results don't depend on timing
+                for name in requested:
+                    try:
+                        insights = futures[name].result()
+                        all_insights.extend(insights)
+                        logger.info(f"Generated {len(insights)} {name} insights")
+                    except Exception as e:
+                        logger.error(f"Error generating {name} insights: {str(e)}")
         
         # Process insights: prioritize, filter, and enrich
         processed_insights = self._process_insights(all_insights, max_insights)
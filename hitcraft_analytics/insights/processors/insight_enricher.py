@@ -24,12 +24,15 @@ class InsightEnricher:
         """
         logger.info("Insight Enricher initialized")
     
-    def enrich_insights(self, insights: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def enrich_insights(self, insights: List[Dict[str, Any]],
+                       now: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """
         Enrich insights with additional context and recommendations.
         
         Args:
             insights (List[Dict[str, Any]]): List of insights to enrich.
+            now (Optional[datetime]): Enrichment time stamped on every insight.
+                Defaults to the current time, sampled once per call.
             
         Returns:
             List[Dict[str, Any]]: Enriched insights.
@@ -40,11 +43,12 @@ class InsightEnricher:
         logger.info(f"Enriching {len(insights)} insights")
         
         enriched_insights = []
+        enriched_at = (now or datetime.now()).isoformat()
         
         for insight in insights:
             try:
                 # Enrich insight based on its type
-                enriched_insight = self._enrich_insight(insight)
+                enriched_insight = self._enrich_insight(insight, enriched_at)
                 enriched_insights.append(enriched_insight)
             except Exception as e:
                 logger.error(f"Error enriching insight: {str(e)}")
@@ -53,12 +57,15 @@ class InsightEnricher:
         
         return enriched_insights
     
-    def _enrich_insight(self, insight: Dict[str, Any]) -> Dict[str, Any]:
+    def _enrich_insight(self, insight: Dict[str, Any],
+                       enriched_at: Optional[str] = None) -> Dict[str, Any]:
         """
         Enrich a single insight based on its type.
         
         Args:
             insight (Dict[str, Any]): Insight to enrich.
+            enriched_at (Optional[str]): ISO timestamp of the enrichment.
+                Defaults to the current time.
             
         Returns:
             Dict[str, Any]: Enriched insight.
@@ -67,7 +74,7 @@ class InsightEnricher:
         enriched = insight.copy()
         
         # Add enrichment timestamp
-        enriched["enriched_at"] = datetime.now().isoformat()
+        enriched["enriched_at"] = enriched_at or datetime.now().isoformat()
         
         # Ensure we have basic fields
         if "recommendations" not in enriched:
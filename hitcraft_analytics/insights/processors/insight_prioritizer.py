@@ -10,6 +10,8 @@ import logging
 from typing import Dict, List, Optional, Any, Union
 from datetime import datetime
 
+import numpy as np
+
 from hitcraft_analytics.utils.logging.logger import get_logger
 
 logger = get_logger(__name__)
@@ -44,12 +46,25 @@ class InsightPrioritizer:
         
         logger.info("Insight Prioritizer initialized")
     
-    def prioritize_insights(self, insights: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def prioritize_insights(self,
+                          insights: List[Dict[str, Any]],
+                          max_insights: Optional[int] = None,
+                          prioritization_criteria: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
         """
         Prioritize insights based on multiple factors.
         
+        The impact and trend components of each insight are stamped on it as
+        ``_score_impact`` and ``_score_trend`` and reused when the same
+        insights are prioritized again (for example by the weekly summary),
+        so only the time-dependent recency component is recomputed.
+        
         Args:
             insights (List[Dict[str, Any]]): List of insights to prioritize.
+            max_insights (Optional[int]): Number of top insights to return.
+                If None, all insights are returned.
+            prioritization_criteria (Optional[Dict[str, float]]): Weights for the
+                "impact", "recency" and "trend" components, overriding the
+                prioritizer's own weights for this call.
             
         Returns:
             List[Dict[str, Any]]: Prioritized list of insights.
@@ -59,13 +74,35 @@ class InsightPrioritizer:
         
         logger.info(f"Prioritizing {len(insights)} insights")
         
-        # Calculate priority score for each insight
-        for insight in insights:
-            priority_score = self._calculate_priority_score(insight)
+        # Gather the score components of every insight, measuring recency
+        # against a single clock reading
+        now = datetime.now()
+        components = np.empty((len(insights), 3), dtype=np.float64)
+        for i, insight in enumerate(insights):
+            if "_score_impact" not in insight or "_score_trend" not in insight:
+                insight["_score_impact"] = insight.get("impact_score", 0.5)
+                insight["_score_trend"] = self._calculate_trend_score(insight)
+            components[i] = (
+                insight["_score_impact"],
+                self._calculate_recency_score(insight, now),
+                insight["_score_trend"]
+            )
+        
+        # Calculate weighted scores
+        scores = components @ self._get_weights(prioritization_criteria)
+        for insight, priority_score in zip(insights, scores.tolist()):
             insight["priority_score"] = priority_score
         
-        # Sort insights by priority score (descending)
-        prioritized_insights = sorted(insights, key=lambda x: x.get("priority_score", 0), reverse=True)
+        # Order by priority score (descending), keeping input order among ties.
+        # When only the top insights are needed, select them in linear time
+        # and sort just those.
+        positions = np.arange(len(insights))
+        if max_insights is not None and 0 < max_insights < len(insights):
+            positions = np.argpartition(-scores, max_insights - 1)[:max_insights]
+        order = positions[np.lexsort((positions, -scores[positions]))]
+        if max_insights is not None and max_insights <= 0:
+            order = order[:0]
+        prioritized_insights = [insights[i] for i in order.tolist()]
         
         # Log top insights
         if prioritized_insights:
@@ -74,46 +111,43 @@ class InsightPrioritizer:
         
         return prioritized_insights
     
-    def _calculate_priority_score(self, insight: Dict[str, Any]) -> float:
+    def _get_weights(self, prioritization_criteria: Optional[Dict[str, float]] = None) -> np.ndarray:
         """
-        Calculate a priority score for an insight.
+        Get normalized (impact, recency, trend) weights.
         
         Args:
-            insight (Dict[str, Any]): Insight to calculate priority score for.
+            prioritization_criteria (Optional[Dict[str, float]]): Per-call weight
+                overrides keyed by component name.
             
         Returns:
-            float: Priority score between 0 and 1.
+            np.ndarray: Weights summing to 1.
         """
-        # Impact component (from insight's impact score)
-        impact_score = insight.get("impact_score", 0.5)
-        
-        # Recency component
-        recency_score = self._calculate_recency_score(insight)
-        
-        # Trend component
-        trend_score = self._calculate_trend_score(insight)
-        
-        # Calculate weighted score
-        priority_score = (
-            (impact_score * self.impact_weight) +
-            (recency_score * self.recency_weight) +
-            (trend_score * self.trend_weight)
-        )
-        
-        return priority_score
+        criteria = prioritization_criteria or {}
+        weights = np.array([
+            criteria.get("impact", self.impact_weight),
+            criteria.get("recency", self.recency_weight),
+            criteria.get("trend", self.trend_weight)
+        ], dtype=np.float64)
+        
+        total_weight = weights.sum()
+        return weights / total_weight if total_weight > 0 else weights
     
-    def _calculate_recency_score(self, insight: Dict[str, Any]) -> float:
+    def _calculate_recency_score(self, insight: Dict[str, Any],
+                                now: Optional[datetime] = None) -> float:
         """
         Calculate a recency score for an insight.
         
         Args:
             insight (Dict[str, Any]): Insight to calculate recency score for.
+            now (Optional[datetime]): Reference time. Defaults to the current time.
             
         Returns:
             float: Recency score between 0 and 1.
         """
+        now = now or datetime.now()
+        
         # Default to current time if generated_at is not present
-        generated_at = insight.get("generated_at", datetime.now().isoformat())
+        generated_at = insight.get("generated_at", now)
         
         try:
             # Parse the generated_at timestamp
@@ -123,7 +157,7 @@ class InsightPrioritizer:
                 generated_time = generated_at
             
             # Calculate time since generation
-            time_diff = (datetime.now() - generated_time).total_seconds()
+            time_diff = (now - generated_time).total_seconds()
             
             # Convert to hours
             hours_diff = time_diff / 3600
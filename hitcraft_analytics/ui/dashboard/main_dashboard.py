@@ -27,6 +27,81 @@ from hitcraft_analytics.utils.logging_config import setup_logger
 # Setup logger
 logger = setup_logger("dashboard")
 
+@st.cache_resource
+def get_events_repository() -> EventsRepository:
+    """Get the events repository shared by every dashboard session and rerun."""
+    return EventsRepository()
+
+
+@st.cache_resource
+def get_insights_engine() -> InsightsEngine:
+    """Get the insights engine shared by every dashboard session and rerun."""
+    return InsightsEngine()
+
+
+@st.cache_data(ttl=3600)
+def load_dashboard_data(from_date: str, to_date: str):
+    """
+    Load the metrics, funnels, segments and insights for a date range.
+    
+    Results are cached for an hour per date range, so reruns triggered by
+    widget interaction don't repeat the queries and insight generation.
+    
+    Args:
+        from_date: Start date in ISO format
+        to_date: End date in ISO format
+        
+    Returns:
+        Dict: Metrics (with trends), funnel, segment and insight data
+    """
+    repository = get_events_repository()
+    insights_engine = get_insights_engine()
+    
+    # Get metrics data
+    metrics_data = repository.get_key_metrics(
+        from_date=from_date,
+        to_date=to_date
+    )
+    
+    # Get trend data
+    trend_data = repository.get_trend_data(
+        from_date=from_date,
+        to_date=to_date,
+        metrics=["dau", "wau", "mau", "session_duration", "retention_rate"]
+    )
+    
+    # Add trend data to metrics
+    metrics_data["trends"] = trend_data
+    
+    # Get funnel data
+    funnel_data = repository.get_funnel_data(
+        from_date=from_date,
+        to_date=to_date
+    )
+    
+    # Get segment data
+    segment_data = repository.get_segment_data(
+        from_date=from_date,
+        to_date=to_date,
+        segment_by=["user_type", "platform", "country"]
+    )
+    
+    # Get insights
+    insights = insights_engine.generate_insights(
+        from_date=from_date,
+        to_date=to_date,
+        insight_types=["trend", "funnel", "cohort"],
+        max_insights=5
+    )
+    
+    return {
+        "metrics": metrics_data,
+        "funnels": funnel_data,
+        "segments": segment_data,
+        "insights": insights
+    }
+
+
 class Dashboard:
     """
     Main dashboard class that orchestrates all components and data flow.
@@ -39,9 +114,9 @@ class Dashboard:
         self.funnel_panel = FunnelPanel()
         self.ai_insights_panel = AIInsightsPanel()
         
-        # Initialize data repositories
-        self.repository = EventsRepository()
-        self.insights_engine = InsightsEngine()
+        # Initialize data repositories (cached across reruns)
+        self.repository = get_events_repository()
+        self.insights_engine = get_insights_engine()
         
         # Set default date range (last 30 days)
         end_date = datetime.now().date()
@@ -66,48 +141,10 @@ class Dashboard:
         end_date = st.session_state.end_date
         
         try:
-            # Get metrics data
-            metrics_data = self.repository.get_key_metrics(
-                from_date=start_date.isoformat(),
-                to_date=end_date.isoformat()
-            )
-            
-            # Get trend data
-            trend_data = self.repository.get_trend_data(
-                from_date=start_date.isoformat(),
-                to_date=end_date.isoformat(),
-                metrics=["dau", "wau", "mau", "session_duration", "retention_rate"]
-            )
-            
-            # Add trend data to metrics
-            metrics_data["trends"] = trend_data
-            
-            # Get funnel data
-            funnel_data = self.repository.get_funnel_data(
-                from_date=start_date.isoformat(),
-                to_date=end_date.isoformat()
-            )
-            
-            # Get segment data
-            segment_data = self.repository.get_segment_data(
-                from_date=start_date.isoformat(),
-                to_date=end_date.isoformat(),
-                segment_by=["user_type", "platform", "country"]
-            )
-            
-            # Get insights
-            insights = self.insights_engine.generate_insights(
-                from_date=start_date.isoformat(),
-                to_date=end_date.isoformat(),
-                insight_types=["trend", "funnel", "cohort"],
-                max_insights=5
-            )
+            data = load_dashboard_data(start_date.isoformat(), end_date.isoformat())
             
             return {
-                "metrics": metrics_data,
-                "funnels": funnel_data,
-                "segments": segment_data,
-                "insights": insights,
+                **data,
                 "timeframe": {
                     "start_date": start_date.isoformat(),
                     "end_date": end_date.isoformat(),
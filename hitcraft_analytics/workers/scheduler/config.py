@@ -17,6 +17,9 @@ WEEKLY_REPORT_TIME = time(hour=8, minute=0)  # 8:00 AM Monday
 # Time periods for data collection
 DAILY_DATA_DAYS = 7  # Collect last 7 days of data each day
 FULL_BACKFILL_DAYS = 90  # Maximum days for full data backfill
+BACKFILL_CHUNK_DAYS = 7  # Days of events requested per backfill export call
+BACKFILL_MAX_WORKERS = 4  # Concurrent backfill export calls (keep within Mixpanel rate limits)
+EVENT_STORE_BATCH_SIZE = 10000  # Events buffered per repository write while streaming
 
 # Retry settings
 MAX_RETRIES = 3  # Maximum number of retry attempts
@@ -6,12 +6,15 @@ The scheduler is responsible for running tasks at specified times and managing
 task dependencies, retries, and execution.
 """
 
+import asyncio
+import heapq
+import itertools
 import logging
 import signal
 import threading
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 from hitcraft_analytics.utils.logging_config import setup_logger
 from hitcraft_analytics.workers.scheduler.config import (
@@ -37,12 +40,39 @@ class TaskScheduler:
     def __init__(self):
         self.tasks: Dict[str, BaseTask] = {}
         self.task_dependencies: Dict[str, Set[str]] = {}
+        self.task_dependents: Dict[str, Set[str]] = {}
         self.task_results: Dict[str, TaskResult] = {}
         self.running_tasks: Set[str] = set()
         self.stop_event = threading.Event()
         self.lock = threading.RLock()
         self.task_threads: Dict[str, threading.Thread] = {}
         
+        # Event loop and wake-up event of a running run() coroutine, so stop()
+        # can interrupt its sleep from any thread
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        
+        # Integer-indexed dependency state. Each task ID gets a stable bit
+        # index; dependency sets, successful completions and running tasks
+        # are mirrored as int bitmasks so readiness is a single bitwise test.
+        self._task_index: Dict[str, int] = {}
+        self._task_ids: List[str] = []
+        self._dep_mask: List[int] = []
+        self._ok_mask = 0
+        self._running_mask = 0
+        
+        # Pending runs as a min-heap of (next_run, seq, task_id). Entries are
+        # never removed in place: an entry whose time no longer matches the
+        # task's next_run is stale and skipped when popped. The ID set lets
+        # schedule_task drop exact duplicates instead of growing the heap.
+        self._schedule_heap: List[Tuple[datetime, int, str]] = []
+        self._scheduled_ids: Set[str] = set()
+        
+        # Due entries held back on running tasks or unmet dependencies. They
+        # are kept off the heap so its head is always the next future run.
+        self._deferred: List[Tuple[datetime, int, str]] = []
+        self._schedule_seq = itertools.count()
+        
         # Configure task execution settings
         self.check_interval = SCHEDULER_CHECK_INTERVAL
         self.task_timeout = TASK_TIMEOUT_SECONDS
@@ -56,10 +86,19 @@ class TaskScheduler:
         Args:
             task: The task to register
             dependencies: List of task IDs that must complete before this task
+            
+        Raises:
+            ValueError: If the dependencies would introduce a cycle
         """
         with self.lock:
             task_id = task.task_id
             
+            # Reject the registration before mutating any state if it
+            # would make the dependency graph cyclic
+            graph = dict(self.task_dependencies)
+            graph[task_id] = set(dependencies or [])
+            self._topological_order(graph)
+            
             if task_id in self.tasks:
                 logger.warning(f"Task {task_id} already registered, replacing")
             
@@ -69,9 +108,19 @@ class TaskScheduler:
             task.max_retries = task.max_retries or MAX_RETRIES
             task.retry_delay = task.retry_delay or RETRY_DELAY_SECONDS
             
+            # Drop reverse edges from a previous registration of this task
+            for dep_id in self.task_dependencies.get(task_id, ()):
+                self.task_dependents.get(dep_id, set()).discard(task_id)
+            
             # Register dependencies
+            index = self._index_for(task_id)
             if dependencies:
                 self.task_dependencies[task_id] = set(dependencies)
+                self._dep_mask[index] = self._mask_for(dependencies)
+                
+                # Record reverse edges so completions can wake dependents
+                for dep_id in dependencies:
+                    self.task_dependents.setdefault(dep_id, set()).add(task_id)
                 
                 # Verify all dependencies exist
                 for dep_id in dependencies:
@@ -79,6 +128,7 @@ class TaskScheduler:
                         logger.warning(f"Dependency {dep_id} for task {task_id} is not registered")
             else:
                 self.task_dependencies[task_id] = set()
+                self._dep_mask[index] = 0
             
             logger.info(f"Task {task_id} registered with dependencies: {dependencies or []}")
     
@@ -96,16 +146,112 @@ class TaskScheduler:
             
             if task_id in self.tasks:
                 self.tasks.pop(task_id)
-                self.task_dependencies.pop(task_id, None)
+                for dep_id in self.task_dependencies.pop(task_id, ()):
+                    self.task_dependents.get(dep_id, set()).discard(task_id)
+                self.task_dependents.pop(task_id, None)
                 
                 # Remove this task from other tasks' dependencies
                 for deps in self.task_dependencies.values():
                     deps.discard(task_id)
                 
+                bit = 1 << self._task_index[task_id]
+                self._dep_mask = [mask & ~bit for mask in self._dep_mask]
+                self._dep_mask[self._task_index[task_id]] = 0
+                self._ok_mask &= ~bit
+                
+                self._scheduled_ids.discard(task_id)
+                
                 logger.info(f"Task {task_id} unregistered")
             else:
                 logger.warning(f"Task {task_id} not found in registry")
     
+    @staticmethod
+    def _topological_order(graph: Dict[str, Set[str]]) -> List[str]:
+        """
+        Order a dependency graph so that every task follows its dependencies.
+        
+        Uses an iterative depth-first search with white/gray/black coloring;
+        reaching a gray node means a back edge, i.e. a cycle.
+        
+        Args:
+            graph: Mapping of task ID to the IDs it depends on
+            
+        Returns:
+            List[str]: Task IDs in dependency order
+            
+        Raises:
+            ValueError: If the graph contains a cycle
+        """
+        white, gray, black = 0, 1, 2
+        color: Dict[str, int] = {}
+        order: List[str] = []
+        
+        for root in graph:
+            if color.get(root, white) != white:
+                continue
+            
+            color[root] = gray
+            stack = [(root, iter(graph.get(root, ())))]
+            while stack:
+                node, deps = stack[-1]
+                for dep_id in deps:
+                    dep_color = color.get(dep_id, white)
+                    if dep_color == gray:
+                        raise ValueError(
+                            f"Dependency cycle detected: {node} -> {dep_id}"
+                        )
+                    if dep_color == white:
+                        color[dep_id] = gray
+                        stack.append((dep_id, iter(graph.get(dep_id, ()))))
+                        break
+                else:
+                    color[node] = black
+                    order.append(node)
+                    stack.pop()
+        
+        return order
+    
+    def _index_for(self, task_id: str) -> int:
+        """
+        Return the bit index of a task ID, assigning a new one if needed.
+        
+        Indexes are never reused, so a dependency on a task that has not been
+        registered yet still maps to a bit that can only be set once it runs.
+        """
+        index = self._task_index.get(task_id)
+        if index is None:
+            index = len(self._task_ids)
+            self._task_index[task_id] = index
+            self._task_ids.append(task_id)
+            self._dep_mask.append(0)
+        return index
+    
+    def _mask_for(self, task_ids) -> int:
+        """Build a bitmask with one bit set per task ID."""
+        mask = 0
+        for task_id in task_ids:
+            mask |= 1 << self._index_for(task_id)
+        return mask
+    
+    def _set_running(self, task_id: str, running: bool) -> None:
+        """Mark a task as running or finished. Caller must hold ``self.lock``."""
+        bit = 1 << self._task_index[task_id]
+        if running:
+            self.running_tasks.add(task_id)
+            self._running_mask |= bit
+        else:
+            self.running_tasks.discard(task_id)
+            self._running_mask &= ~bit
+    
+    def _record_result(self, task_id: str, result: TaskResult) -> None:
+        """Store a task result and update the success mask. Caller must hold ``self.lock``."""
+        self.task_results[task_id] = result
+        bit = 1 << self._task_index[task_id]
+        if result.success:
+            self._ok_mask |= bit
+        else:
+            self._ok_mask &= ~bit
+    
     def schedule_task(self, task_id: str, next_run: datetime) -> bool:
         """
         Schedule a task to run at a specific time.
@@ -123,7 +269,17 @@ class TaskScheduler:
                 return False
             
             task = self.tasks[task_id]
+            
+            # Already queued for this exact time, nothing to add
+            if task_id in self._scheduled_ids and task.next_run == next_run:
+                return True
+            
             task.schedule_next_run(next_run)
+            heapq.heappush(
+                self._schedule_heap,
+                (next_run, next(self._schedule_seq), task_id)
+            )
+            self._scheduled_ids.add(task_id)
             return True
     
     def _can_run_task(self, task_id: str) -> bool:
@@ -136,34 +292,24 @@ class TaskScheduler:
         Returns:
             bool: True if all dependencies have completed successfully
         """
-        # If task has no dependencies, it can always run
-        if task_id not in self.task_dependencies or not self.task_dependencies[task_id]:
+        index = self._task_index.get(task_id)
+        if index is None:
             return True
         
-        # Check each dependency
-        for dep_id in self.task_dependencies[task_id]:
-            # Check if dependency exists
-            if dep_id not in self.tasks:
-                logger.warning(f"Task {task_id} has unknown dependency {dep_id}")
-                return False
-                
-            # Check if dependency is currently running
-            if dep_id in self.running_tasks:
-                logger.debug(f"Task {task_id} waiting for dependency {dep_id} to complete")
-                return False
-                
-            # Check if dependency has results
-            if dep_id not in self.task_results:
-                logger.debug(f"Task {task_id} waiting for dependency {dep_id} to run")
-                return False
-            
-            # Check if dependency completed successfully
-            if not self.task_results[dep_id].success:
-                logger.warning(f"Task {task_id} blocked: dependency {dep_id} failed")
-                return False
+        # A task is ready when every dependency bit is in the success mask
+        # and none of them is currently running
+        dep_mask = self._dep_mask[index]
+        blocked = (dep_mask & ~self._ok_mask) | (dep_mask & self._running_mask)
+        if not blocked:
+            return True
         
-        logger.debug(f"All dependencies for task {task_id} are satisfied")
-        return True
+        if logger.isEnabledFor(logging.DEBUG):
+            waiting_on = [
+                dep_id for i, dep_id in enumerate(self._task_ids)
+                if blocked >> i & 1
+            ]
+            logger.debug(f"Task {task_id} waiting for dependencies: {waiting_on}")
+        return False
     
     def _execute_task(self, task_id: str) -> None:
         """
@@ -177,7 +323,7 @@ class TaskScheduler:
         try:
             # Mark task as running
             with self.lock:
-                self.running_tasks.add(task_id)
+                self._set_running(task_id, True)
             
             logger.info(f"Executing task {task_id}")
             
@@ -185,7 +331,13 @@ class TaskScheduler:
             result = task.execute()
             
             with self.lock:
-                self.task_results[task_id] = result
+                self._record_result(task_id, result)
+                
+                # Dispatch dependents that were only waiting on this task
+                # in the same lock acquisition, instead of on the next tick
+                if result.success:
+                    self._set_running(task_id, False)
+                    self._dispatch_ready_dependents(task_id)
             
             logger.info(f"Task {task_id} completed with status: {result.success}")
             
@@ -200,7 +352,7 @@ class TaskScheduler:
         finally:
             # Mark task as no longer running
             with self.lock:
-                self.running_tasks.discard(task_id)
+                self._set_running(task_id, False)
                 self.task_threads.pop(task_id, None)
     
     def _execute_task_sync(self, task_id: str) -> TaskResult:
@@ -218,7 +370,7 @@ class TaskScheduler:
         try:
             # Mark task as running
             with self.lock:
-                self.running_tasks.add(task_id)
+                self._set_running(task_id, True)
             
             logger.info(f"Executing task {task_id} synchronously")
             
@@ -227,7 +379,7 @@ class TaskScheduler:
             
             # Store the result
             with self.lock:
-                self.task_results[task_id] = result
+                self._record_result(task_id, result)
             
             logger.info(f"Task {task_id} completed with status: {result.success}")
             
@@ -239,44 +391,91 @@ class TaskScheduler:
         finally:
             # Mark task as no longer running
             with self.lock:
-                self.running_tasks.discard(task_id)
+                self._set_running(task_id, False)
+    
+    def _start_task_thread(self, task_id: str) -> None:
+        """
+        Start a due task in a new thread. Caller must hold ``self.lock``.
+        
+        Args:
+            task_id: ID of the task to start
+        """
+        # Clear the next run time to prevent repeated execution
+        # It will be rescheduled if this is a recurring task
+        self.tasks[task_id].next_run = None
+        self._scheduled_ids.discard(task_id)
+        
+        # Mark as running before the thread starts so that no other
+        # dispatch path can start the same task twice
+        self._set_running(task_id, True)
+        
+        thread = threading.Thread(
+            target=self._execute_task,
+            args=(task_id,),
+            name=f"task-{task_id}"
+        )
+        thread.daemon = True
+        self.task_threads[task_id] = thread
+        thread.start()
+    
+    def _dispatch_ready_dependents(self, task_id: str) -> None:
+        """
+        Start every due dependent of a task whose dependencies are now satisfied.
+        
+        Newly-ready dependents are collected first and then started in a single
+        pass. Caller must hold ``self.lock``.
+        
+        Args:
+            task_id: ID of the task that just completed successfully
+        """
+        now = datetime.now()
+        ready_now = [
+            dependent_id
+            for dependent_id in self.task_dependents.get(task_id, ())
+            if dependent_id in self.tasks
+            and dependent_id not in self.running_tasks
+            and self.tasks[dependent_id].next_run
+            and self.tasks[dependent_id].next_run <= now
+            and self._can_run_task(dependent_id)
+        ]
+        
+        for dependent_id in ready_now:
+            logger.info(f"Task {dependent_id} is ready after {task_id} completed")
+            self._start_task_thread(dependent_id)
     
     def _check_schedule(self) -> None:
         """Check for tasks that are due to run and execute them."""
         now = datetime.now()
         
         with self.lock:
-            for task_id, task in self.tasks.items():
-                # Skip tasks that are already running
-                if task_id in self.running_tasks:
+            # Retry previously deferred entries alongside the newly due ones
+            due = self._deferred
+            while self._schedule_heap and self._schedule_heap[0][0] <= now:
+                due.append(heapq.heappop(self._schedule_heap))
+            
+            deferred = []
+            for entry in sorted(due):
+                run_at, _, task_id = entry
+                task = self.tasks.get(task_id)
+                
+                # Skip entries for unregistered or since-rescheduled tasks
+                if task is None or task.next_run != run_at:
                     continue
                 
-                # Skip tasks that don't have a next run time
-                if not task.next_run:
+                # Tasks that are still running stay queued for a later tick
+                if task_id in self.running_tasks:
+                    deferred.append(entry)
                     continue
                 
-                # Check if task is due to run
-                if task.next_run <= now:
-                    # Check if dependencies are satisfied
-                    if self._can_run_task(task_id):
-                        logger.info(f"Task {task_id} is due to run")
-                        
-                        # Clear the next run time to prevent repeated execution
-                        # It will be rescheduled if this is a recurring task
-                        task.next_run = None
-                        
-                        # Start task in a new thread
-                        thread = threading.Thread(
-                            target=self._execute_task,
-                            args=(task_id,),
-                            name=f"task-{task_id}"
-                        )
-                        thread.daemon = True
-                        thread.start()
-                        
-                        self.task_threads[task_id] = thread
-                    else:
-                        logger.info(f"Task {task_id} is due but dependencies not met")
+                # Check if dependencies are satisfied
+                if self._can_run_task(task_id):
+                    logger.info(f"Task {task_id} is due to run")
+                    self._start_task_thread(task_id)
+                else:
+                    logger.info(f"Task {task_id} is due but dependencies not met")
+                    deferred.append(entry)
+            
+            self._deferred = deferred
     
     def start(self) -> None:
         """Start the scheduler."""
@@ -306,16 +505,80 @@ class TaskScheduler:
         finally:
             logger.info("Scheduler stopped")
     
+    def _seconds_until_next_run(self) -> float:
+        """
+        Get how long the scheduler loop can sleep before its next check.
+        
+        Returns:
+            float: Seconds until the earliest pending run, capped at the check
+                interval. Deferred entries are retried on the regular interval.
+        """
+        with self.lock:
+            if not self._schedule_heap:
+                return self.check_interval
+            next_run = self._schedule_heap[0][0]
+        
+        delay = (next_run - datetime.now()).total_seconds()
+        return min(max(delay, 0.0), self.check_interval)
+    
+    async def run(self) -> None:
+        """
+        Run the scheduler on the current asyncio event loop.
+        
+        Due tasks are dispatched the same way as by start(), on their own
+        threads since task code does blocking HTTP and database I/O. Between
+        checks the loop sleeps until the next scheduled run instead of
+        polling on a fixed interval.
+        """
+        logger.info("Starting scheduler")
+        
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        
+        # Set up signal handlers, but only in the main thread
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                self._loop.add_signal_handler(signum, self._handle_stop_signal, signum)
+        
+        # Reset stop event
+        self.stop_event.clear()
+        
+        try:
+            while not self.stop_event.is_set():
+                try:
+                    self._check_schedule()
+                except Exception as e:
+                    logger.error(f"Error in scheduler loop: {str(e)}", exc_info=True)
+                
+                # Sleep until the next run is due or stop() wakes the loop
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self._seconds_until_next_run())
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._loop = None
+            self._wakeup = None
+            logger.info("Scheduler stopped")
+    
+    def _handle_stop_signal(self, signum: int) -> None:
+        """Stop the scheduler in response to a signal."""
+        logger.info(f"Received signal {signum}, stopping scheduler")
+        self.stop()
+    
     def stop(self) -> None:
         """Stop the scheduler."""
         logger.info("Stopping scheduler")
         self.stop_event.set()
         
+        loop, wakeup = self._loop, self._wakeup
+        if loop is not None and wakeup is not None:
+            loop.call_soon_threadsafe(wakeup.set)
+        
         # Wait for all tasks to complete with timeout
         logger.info("Waiting for running tasks to complete")
-        deadline = time.time() + 30  # 30 second timeout
+        deadline = time.monotonic() + 30  # 30 second timeout
         
-        while time.time() < deadline:
+        while time.monotonic() < deadline:
             with self.lock:
                 if not self.running_tasks:
                     break
@@ -326,6 +589,41 @@ class TaskScheduler:
             if self.running_tasks:
                 logger.warning(f"Forcing stop with {len(self.running_tasks)} tasks still running")
     
+    def _build_status_unlocked(self, task_id: str) -> Dict:
+        """
+        Build the status dict for a registered task. Caller must hold ``self.lock``.
+        
+        Args:
+            task_id: ID of the task
+            
+        Returns:
+            Dict: Status information for the task
+        """
+        task = self.tasks[task_id]
+        
+        status = {
+            "task_id": task_id,
+            "description": task.description,
+            "is_running": task_id in self.running_tasks,
+            "last_run": task.last_run.isoformat() if task.last_run else None,
+            "next_run": task.next_run.isoformat() if task.next_run else None,
+            "dependencies": list(self.task_dependencies.get(task_id, [])),
+            "retries_attempted": task.retries_attempted,
+        }
+        
+        # Include last result if available
+        result = self.task_results.get(task_id)
+        if result is not None:
+            status["last_result"] = {
+                "success": result.success,
+                "message": result.message,
+                "start_time": result.start_time.isoformat(),
+                "end_time": result.end_time.isoformat(),
+                "duration": result.duration
+            }
+        
+        return status
+    
     def get_task_status(self, task_id: str) -> Dict:
         """
         Get the current status of a task.
@@ -340,32 +638,7 @@ class TaskScheduler:
             if task_id not in self.tasks:
                 return {"error": f"Task {task_id} not found"}
             
-            task = self.tasks[task_id]
-            
-            status = {
-                "task_id": task_id,
-                "description": task.description,
-                "is_running": task_id in self.running_tasks,
-                "last_run": task.last_run.isoformat() if task.last_run else None,
-                "next_run": task.next_run.isoformat() if task.next_run else None,
-                "dependencies": list(self.task_dependencies.get(task_id, [])),
-                "retries_attempted": task.retries_attempted,
-            }
-            
-            # Include last result if available
-            if task_id in self.task_results:
-                result = self.task_results[task_id]
-                status.update({
-                    "last_result": {
-                        "success": result.success,
-                        "message": result.message,
-                        "start_time": result.start_time.isoformat(),
-                        "end_time": result.end_time.isoformat(),
-                        "duration": result.duration
-                    }
-                })
-            
-            return status
+            return self._build_status_unlocked(task_id)
     
     def get_all_task_statuses(self) -> Dict:
         """
@@ -376,6 +649,6 @@ class TaskScheduler:
         """
         with self.lock:
             return {
-                task_id: self.get_task_status(task_id)
+                task_id: self._build_status_unlocked(task_id)
                 for task_id in self.tasks
             }
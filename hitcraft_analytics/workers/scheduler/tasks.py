@@ -5,10 +5,10 @@ This module defines the base classes for all scheduled tasks in the HitCraft Ana
 All tasks derive from the BaseTask class which provides common functionality.
 """
 
+import functools
 import logging
 import time
-from abc import ABC, abstractmethod
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 from hitcraft_analytics.utils.logging_config import setup_logger
@@ -16,27 +16,72 @@ from hitcraft_analytics.utils.logging_config import setup_logger
 # Set up task-specific logger
 logger = setup_logger("scheduler.tasks")
 
+
+@functools.lru_cache(maxsize=64)
+def _date_range(days_back: int, today_ord: int) -> Tuple[str, str]:
+    """Format the ISO date range ending on the given proleptic ordinal day."""
+    to_date = date.fromordinal(today_ord)
+    from_date = to_date - timedelta(days=days_back)
+    
+    return from_date.isoformat(), to_date.isoformat()
+
+
 class TaskResult:
-    """Represents the result of a scheduled task execution."""
+    """
+    Represents the result of a scheduled task execution.
+    
+    Timing is stored as a wall-clock start anchor plus two perf_counter
+    readings; ``end_time`` and ``duration`` are derived only when read.
+    """
+    
+    __slots__ = (
+        "success", "task_id", "message", "data", "error",
+        "_wall_anchor", "_start_mono", "_end_mono", "_end_time"
+    )
     
     def __init__(
         self, 
         success: bool, 
         task_id: str,
         start_time: datetime,
-        end_time: datetime,
+        end_time: Optional[datetime] = None,
         message: str = "",
         data: Optional[Dict[str, Any]] = None,
-        error: Optional[Exception] = None
+        error: Optional[Exception] = None,
+        start_mono: Optional[float] = None,
+        end_mono: Optional[float] = None
     ):
         self.success = success
         self.task_id = task_id
-        self.start_time = start_time
-        self.end_time = end_time
-        self.duration = (end_time - start_time).total_seconds()
         self.message = message
-        self.data = data or {}
+        self.data = data if data is not None else {}
         self.error = error
+        self._wall_anchor = start_time
+        self._end_time = end_time
+        
+        if start_mono is not None and end_mono is not None:
+            self._start_mono = start_mono
+            self._end_mono = end_mono
+        else:
+            # Only wall-clock times were given; fall back to their difference
+            self._start_mono = 0.0
+            self._end_mono = (
+                (end_time - start_time).total_seconds() if end_time else 0.0
+            )
+    
+    @property
+    def start_time(self) -> datetime:
+        return self._wall_anchor
+    
+    @property
+    def end_time(self) -> datetime:
+        if self._end_time is None:
+            self._end_time = self._wall_anchor + timedelta(seconds=self.duration)
+        return self._end_time
+    
+    @property
+    def duration(self) -> float:
+        return self._end_mono - self._start_mono
     
     def __str__(self) -> str:
         status = "SUCCESS" if self.success else "FAILURE"
@@ -44,7 +89,7 @@ class TaskResult:
                 f"(Duration: {self.duration:.2f}s)")
 
 
-class BaseTask(ABC):
+class BaseTask:
     """
     Base class for all scheduled tasks.
     
@@ -52,6 +97,13 @@ class BaseTask(ABC):
     """
     
     def __init__(self, task_id: str, description: str = ""):
+        # Enforce that concrete tasks implement run() without ABCMeta
+        if type(self).run is BaseTask.run:
+            raise TypeError(
+                f"Can't instantiate task class {type(self).__name__} "
+                f"without an implementation of run()"
+            )
+        
         self.task_id = task_id
         self.description = description
         self.last_run: Optional[datetime] = None
@@ -59,9 +111,13 @@ class BaseTask(ABC):
         self.retries_attempted = 0
         self.max_retries = 3
         self.retry_delay = 300  # seconds
-        self.logger = logging.getLogger(f"scheduler.tasks.{task_id}")
+        # Share the module logger instead of creating a child logger per task
+        # ID; the task ID travels on each record via the adapter's extra
+        self.logger = logging.LoggerAdapter(logger, {"task_id": task_id})
+        
+        # Bind run() once so execute() skips the method lookup on each call
+        self._run = self.run
     
-    @abstractmethod
     def run(self, *args, **kwargs) -> Dict[str, Any]:
         """
         Execute the task logic.
@@ -72,7 +128,7 @@ class BaseTask(ABC):
         Returns:
             Dict[str, Any]: Result data from the task execution
         """
-        pass
+        raise NotImplementedError
     
     def execute(self, *args, **kwargs) -> TaskResult:
         """
@@ -85,44 +141,45 @@ class BaseTask(ABC):
         """
         start_time = datetime.now()
         self.last_run = start_time
+        started = time.perf_counter()
         
         self.logger.info(f"Starting task {self.task_id}")
         
         try:
             # Execute the task's custom logic
-            result = self.run(*args, **kwargs)
+            result = self._run(*args, **kwargs)
             
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
+            finished = time.perf_counter()
             
             # Reset retry counter on success
             self.retries_attempted = 0
             
-            self.logger.info(f"Task {self.task_id} completed successfully in {duration:.2f}s")
+            self.logger.info(f"Task {self.task_id} completed successfully in {finished - started:.2f}s")
             
             return TaskResult(
                 success=True,
                 task_id=self.task_id,
                 start_time=start_time,
-                end_time=end_time,
                 message="Task completed successfully",
-                data=result
+                data=result,
+                start_mono=started,
+                end_mono=finished
             )
             
         except Exception as e:
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
+            finished = time.perf_counter()
             
             self.retries_attempted += 1
-            self.logger.error(f"Task {self.task_id} failed after {duration:.2f}s: {str(e)}", exc_info=True)
+            self.logger.error(f"Task {self.task_id} failed after {finished - started:.2f}s: {str(e)}", exc_info=True)
             
             return TaskResult(
                 success=False,
                 task_id=self.task_id,
                 start_time=start_time,
-                end_time=end_time,
                 message=f"Task failed: {str(e)}",
-                error=e
+                error=e,
+                start_mono=started,
+                end_mono=finished
             )
     
     def should_retry(self) -> bool:
@@ -163,10 +220,7 @@ class DataPullTask(BaseTask):
         Returns:
             Tuple[str, str]: from_date and to_date formatted as YYYY-MM-DD
         """
-        to_date = datetime.now().date()
-        from_date = to_date - timedelta(days=days_back)
-        
-        return from_date.isoformat(), to_date.isoformat()
+        return _date_range(days_back, date.today().toordinal())
 
 
 class AnalysisTask(BaseTask):
@@ -6,11 +6,14 @@ These tasks run after data has been successfully collected from Mixpanel.
 """
 
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, Hashable, List, Optional, Tuple
 
-from hitcraft_analytics.data.repositories.events_repository import EventsRepository
-from hitcraft_analytics.core.analysis.trend_detection import TrendDetector
+from hitcraft_analytics.workers.tasks.shared_resources import get_events_repository
+from hitcraft_analytics.core.analysis.trend_detection import TrendDetector, warm_up_kernels
 from hitcraft_analytics.core.analysis.cohort_analysis import CohortAnalyzer
 from hitcraft_analytics.core.analysis.funnel_analysis import FunnelAnalyzer
 from hitcraft_analytics.workers.scheduler.tasks import AnalysisTask
@@ -19,6 +22,48 @@ from hitcraft_analytics.utils.logging_config import setup_logger
 # Set up logger
 logger = setup_logger("workers.tasks.analysis")
 
+try:
+    from cachetools import TTLCache
+except ImportError:  # cachetools is optional; without it every call hits the repository
+    TTLCache = None
+
+# Process-wide caches for repository reads that scheduled analyses repeat
+# with the same arguments. The 10 minute TTL lets newly pulled data show up.
+_RESULTS_CACHE_TTL_SECONDS = 600
+_event_metrics_cache = TTLCache(maxsize=256, ttl=_RESULTS_CACHE_TTL_SECONDS) if TTLCache else None
+_funnel_results_cache = TTLCache(maxsize=256, ttl=_RESULTS_CACHE_TTL_SECONDS) if TTLCache else None
+_cache_lock = threading.Lock()
+
+
+def _cached_call(cache: Optional[Any], key: Hashable, compute: Callable[[], Any],
+                 should_cache: Callable[[Any], bool] = bool) -> Any:
+    """
+    Return a cached value for ``key``, computing and storing it on a miss.
+    
+    Args:
+        cache: TTL cache to use, or None to always compute
+        key: Cache key built from the call arguments
+        compute: Zero-argument callable producing the value
+        should_cache: Predicate deciding whether a computed value is stored
+        
+    Returns:
+        Any: The cached or freshly computed value
+    """
+    if cache is None:
+        return compute()
+    
+    with _cache_lock:
+        if key in cache:
+            return cache[key]
+    
+    # Compute outside the lock so concurrent misses on other keys don't serialize
+    value = compute()
+    if should_cache(value):
+        with _cache_lock:
+            cache[key] = value
+    return value
+
+
 class TrendAnalysisTask(AnalysisTask):
     """
     Task for analyzing trends in event data.
@@ -32,8 +77,12 @@ class TrendAnalysisTask(AnalysisTask):
         description = "Analyze trends, change points, and anomalies in event data"
         super().__init__(task_id, description)
         
-        self.repository = EventsRepository()
+        self.repository = get_events_repository()
         self.trend_detector = TrendDetector()
+        
+        # Compile the detector kernels now, at scheduler startup, rather than
+        # inside the first scheduled run
+        warm_up_kernels()
     
     def run(self, 
             from_date: Optional[str] = None, 
@@ -68,14 +117,26 @@ class TrendAnalysisTask(AnalysisTask):
         
         # Get event volume data from repository
         try:
-            metrics_data = self.repository.get_event_metrics(
-                from_date=from_date,
-                to_date=to_date,
-                group_by="day",
-                metrics=event_metrics
+            metrics_data = _cached_call(
+                _event_metrics_cache,
+                (from_date, to_date, "day", tuple(sorted(event_metrics))),
+                lambda: self.repository.get_event_metrics(
+                    from_date=from_date,
+                    to_date=to_date,
+                    group_by="day",
+                    metrics=event_metrics
+                )
             )
             
-            if not metrics_data or all(len(metrics_data.get(metric, [])) < min_data_points for metric in event_metrics):
+            # Select metrics with enough data points in one pass; this list is
+            # both the insufficient-data check and the analysis work list
+            metrics_data = metrics_data or {}
+            metrics_to_analyze = [
+                metric for metric in event_metrics
+                if len(metrics_data.get(metric, ())) >= min_data_points
+            ]
+            
+            if not metrics_to_analyze:
                 logger.warning(f"Insufficient data for trend analysis: {from_date} to {to_date}")
                 return {
                     "status": "insufficient_data",
@@ -83,25 +144,17 @@ class TrendAnalysisTask(AnalysisTask):
                     "to_date": to_date
                 }
             
-            # Analyze trends for each metric
-            trends_results = {}
-            
-            for metric in event_metrics:
-                if metric in metrics_data and len(metrics_data[metric]) >= min_data_points:
-                    # Get time series data for this metric
-                    time_series = metrics_data[metric]
-                    
-                    # Detect trends
-                    linear_trend = self.trend_detector.detect_linear_trend(time_series)
-                    change_points = self.trend_detector.detect_change_points(time_series)
-                    anomalies = self.trend_detector.detect_anomalies(time_series)
-                    
-                    trends_results[metric] = {
-                        "linear_trend": linear_trend,
-                        "change_points": change_points,
-                        "anomalies": anomalies,
-                        "data_points": len(time_series)
-                    }
+            # Analyze trends for each metric on a thread pool; metrics are
+            # independent. Only the compiled change-point window-statistics
+            # kernel runs without the GIL (when Numba is installed); the rest
+            # of each metric's analysis is pandas/SciPy code that mostly
+            # holds it, so threads overlap that kernel rather than everything.
+            max_workers = min(len(metrics_to_analyze), os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                trends_results = dict(executor.map(
+                    lambda metric: self._analyze_metric(metric, metrics_data[metric]),
+                    metrics_to_analyze
+                ))
             
             logger.info(f"Completed trend analysis for {len(trends_results)} metrics")
             
@@ -113,20 +166,50 @@ class TrendAnalysisTask(AnalysisTask):
                 results=trends_results
             )
             
+            # Tally all summary counters in a single pass over the results
+            trends_detected = 0
+            change_points_detected = 0
+            anomalies_detected = 0
+            for m in trends_results.values():
+                if m.get("linear_trend", {}).get("trend_detected", False):
+                    trends_detected += 1
+                change_points_detected += len(m.get("change_points", []))
+                anomalies_detected += len(m.get("anomalies", []))
+            
             return {
                 "status": "completed",
                 "metrics_analyzed": list(trends_results.keys()),
                 "from_date": from_date,
                 "to_date": to_date,
-                "trends_detected": sum(1 for m in trends_results.values() 
-                                      if m.get("linear_trend", {}).get("detected", False)),
-                "change_points_detected": sum(len(m.get("change_points", [])) for m in trends_results.values()),
-                "anomalies_detected": sum(len(m.get("anomalies", [])) for m in trends_results.values())
+                "trends_detected": trends_detected,
+                "change_points_detected": change_points_detected,
+                "anomalies_detected": anomalies_detected
             }
             
         except Exception as e:
             logger.error(f"Error during trend analysis: {str(e)}", exc_info=True)
             raise
+    
+    def _analyze_metric(self, metric: str, time_series: Any) -> Tuple[str, Dict[str, Any]]:
+        """
+        Run all trend detectors on a single metric's time series.
+        
+        Args:
+            metric: Name of the metric
+            time_series: Time series data for the metric
+            
+        Returns:
+            Tuple[str, Dict[str, Any]]: The metric name and its trend results
+        """
+        # Convert once so all three detectors share one contiguous float64 buffer
+        time_series = self.trend_detector.prepare_series(time_series)
+        
+        return metric, {
+            "linear_trend": self.trend_detector.detect_linear_trend(time_series),
+            "change_points": self.trend_detector.detect_change_points(time_series),
+            "anomalies": self.trend_detector.detect_anomalies(time_series),
+            "data_points": len(time_series)
+        }
 
 
 class FunnelAnalysisTask(AnalysisTask):
@@ -164,7 +247,7 @@ class FunnelAnalysisTask(AnalysisTask):
             ]
         }
         
-        self.repository = EventsRepository()
+        self.repository = get_events_repository()
         self.funnel_analyzer = FunnelAnalyzer()
     
     def run(self,
@@ -213,45 +296,43 @@ class FunnelAnalysisTask(AnalysisTask):
         # Default segmentation properties
         segment_properties = segment_by or ["user_type", "platform"]
         
-        # Run analysis for each funnel
+        # Run analysis for each funnel. Each one is dominated by Mixpanel and
+        # database round trips, so funnels are analyzed on a thread pool.
         all_results = {}
         analyzed_count = 0
         
-        for funnel_name, funnel_steps in funnels.items():
-            try:
-                logger.info(f"Analyzing funnel: {funnel_name} with steps: {funnel_steps}")
-                
-                # Use the repository's advanced funnel analysis
-                funnel_results = self.repository.analyze_funnel_advanced(
-                    funnel_steps=funnel_steps,
-                    from_date=from_date,
-                    to_date=to_date,
-                    segment_column=segment_properties,
-                    time_period="day",
-                    compare_to_previous=True
+        with ThreadPoolExecutor(max_workers=min(len(funnels), 8)) as executor:
+            futures = [
+                executor.submit(
+                    self._analyze_funnel, funnel_name, funnel_steps,
+                    from_date, to_date, segment_properties
                 )
-                
-                if not funnel_results or "error" in funnel_results:
-                    logger.warning(f"Failed to analyze funnel {funnel_name}: {funnel_results.get('error', 'No data')}")
+                for funnel_name, funnel_steps in funnels.items()
+            ]
+            
+            for future in as_completed(futures):
+                funnel_name, funnel_results = future.result()
+                if funnel_results is None:
                     continue
                 
                 # Store results
                 all_results[funnel_name] = funnel_results
                 analyzed_count += 1
                 
-                # Store analysis results for later use
-                self.repository.store_analysis_results(
-                    analysis_type="funnel",
-                    from_date=from_date,
-                    to_date=to_date,
-                    results={funnel_name: funnel_results},
-                    metadata={"funnel_steps": funnel_steps}
-                )
-                
                 logger.info(f"Successfully analyzed funnel: {funnel_name}")
-                
-            except Exception as e:
-                logger.error(f"Error analyzing funnel {funnel_name}: {str(e)}", exc_info=True)
+        
+        # Store all funnel results for later use in a single write,
+        # as the trend analysis does for its metrics
+        if all_results:
+            self.repository.store_analysis_results(
+                analysis_type="funnel",
+                from_date=from_date,
+                to_date=to_date,
+                results=all_results,
+                metadata={
+                    "funnel_steps": {name: funnels[name] for name in all_results}
+                }
+            )
         
         logger.info(f"Completed funnel analysis for {analyzed_count} funnels")
         
@@ -264,6 +345,56 @@ class FunnelAnalysisTask(AnalysisTask):
         }
 
 
+    def _analyze_funnel(self,
+                        funnel_name: str,
+                        funnel_steps: List[str],
+                        from_date: str,
+                        to_date: str,
+                        segment_properties: List[str]
+                       ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Analyze a single funnel, catching errors so one funnel cannot fail the batch.
+        
+        Args:
+            funnel_name: Name of the funnel
+            funnel_steps: Ordered event names forming the funnel
+            from_date: Start date in YYYY-MM-DD format
+            to_date: End date in YYYY-MM-DD format
+            segment_properties: Properties to segment the analysis by
+            
+        Returns:
+            Tuple[str, Optional[Dict[str, Any]]]: The funnel name and its results,
+                or None if the analysis failed or returned no data
+        """
+        try:
+            logger.info(f"Analyzing funnel: {funnel_name} with steps: {funnel_steps}")
+            
+            # Use the repository's advanced funnel analysis
+            funnel_results = _cached_call(
+                _funnel_results_cache,
+                (tuple(funnel_steps), from_date, to_date, tuple(segment_properties)),
+                lambda: self.repository.analyze_funnel_advanced(
+                    funnel_steps=funnel_steps,
+                    from_date=from_date,
+                    to_date=to_date,
+                    segment_column=segment_properties,
+                    time_period="day",
+                    compare_to_previous=True
+                ),
+                should_cache=lambda results: bool(results) and "error" not in results
+            )
+            
+            if not funnel_results or "error" in funnel_results:
+                logger.warning(f"Failed to analyze funnel {funnel_name}: {(funnel_results or {}).get('error', 'No data')}")
+                return funnel_name, None
+            
+            return funnel_name, funnel_results
+            
+        except Exception as e:
+            logger.error(f"Error analyzing funnel {funnel_name}: {str(e)}", exc_info=True)
+            return funnel_name, None
+
+
 class CohortAnalysisTask(AnalysisTask):
     """
     Task for analyzing user cohorts.
@@ -277,7 +408,7 @@ class CohortAnalysisTask(AnalysisTask):
         description = "Analyze user cohorts for retention and engagement"
         super().__init__(task_id, description)
         
-        self.repository = EventsRepository()
+        self.repository = get_events_repository()
         self.cohort_analyzer = CohortAnalyzer()
     
     def run(self,
@@ -317,7 +448,7 @@ class CohortAnalysisTask(AnalysisTask):
                 to_date=to_date
             )
             
-            if user_events.empty:
+            if user_events.shape[0] == 0:
                 logger.warning(f"No user event data available for cohort analysis: {from_date} to {to_date}")
                 return {
                     "status": "no_data",
@@ -338,13 +469,25 @@ class CohortAnalysisTask(AnalysisTask):
                 metrics=["retention", "engagement", "conversion"]
             )
             
+            # Store the retention table split-oriented (index, columns, data) as
+            # plain lists, rather than a nested dict with one entry per cell
+            cohort_count = retention_cohorts.shape[0]
+            if cohort_count:
+                retention_data = {
+                    "index": retention_cohorts.index.tolist(),
+                    "columns": retention_cohorts.columns.tolist(),
+                    "data": retention_cohorts.to_numpy().tolist()
+                }
+            else:
+                retention_data = None
+            
             # Store results
             self.repository.store_analysis_results(
                 analysis_type="cohort",
                 from_date=from_date,
                 to_date=to_date,
                 results={
-                    "retention_cohorts": retention_cohorts.to_dict() if not retention_cohorts.empty else {},
+                    "retention_cohorts": retention_data,
                     "cohort_metrics": cohort_metrics
                 },
                 metadata={
@@ -360,7 +503,7 @@ class CohortAnalysisTask(AnalysisTask):
                 "from_date": from_date,
                 "to_date": to_date,
                 "cohort_period": cohort_period,
-                "cohorts_analyzed": len(retention_cohorts) if not retention_cohorts.empty else 0,
+                "cohorts_analyzed": cohort_count,
                 "metrics_calculated": list(cohort_metrics.keys())
             }
             
@@ -4,20 +4,42 @@ Data Collection Tasks
 This module implements concrete tasks for data collection from Mixpanel.
 """
 
+import itertools
 import logging
 import os
-from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 
-from hitcraft_analytics.data.connectors.mixpanel_connector import MixpanelConnector
-from hitcraft_analytics.data.repositories.events_repository import EventsRepository
+from hitcraft_analytics.workers.tasks.shared_resources import (
+    get_events_repository,
+    get_mixpanel_connector
+)
 from hitcraft_analytics.workers.scheduler.tasks import DataPullTask
-from hitcraft_analytics.workers.scheduler.config import DAILY_DATA_DAYS, FULL_BACKFILL_DAYS
+from hitcraft_analytics.workers.scheduler.config import (
+    DAILY_DATA_DAYS,
+    FULL_BACKFILL_DAYS,
+    BACKFILL_CHUNK_DAYS,
+    BACKFILL_MAX_WORKERS,
+    EVENT_STORE_BATCH_SIZE
+)
 from hitcraft_analytics.utils.logging_config import setup_logger
 
 # Set up logger
 logger = setup_logger("workers.tasks.data")
 
+
+def _batched(items: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    """Yield lists of up to ``size`` items from an iterable."""
+    iterator = iter(items)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
 class MixpanelDataPullTask(DataPullTask):
     """
     Task for pulling event data from Mixpanel.
@@ -38,8 +60,8 @@ class MixpanelDataPullTask(DataPullTask):
         super().__init__(task_id, description)
         
         self.event_types = event_types
-        self.connector = MixpanelConnector()
-        self.repository = EventsRepository()
+        self.connector = get_mixpanel_connector()
+        self.repository = get_events_repository()
     
     def run(self, 
             from_date: Optional[str] = None, 
@@ -65,14 +87,21 @@ class MixpanelDataPullTask(DataPullTask):
         
         logger.info(f"Pulling Mixpanel data from {from_date} to {to_date}")
         
-        # Pull events from Mixpanel
-        events = self.connector.get_events(
+        # Stream events from Mixpanel and store them in bounded batches, so
+        # memory stays at one batch and writes start before the export ends
+        events_count = 0
+        stored_count = 0
+        
+        events = self.connector.iter_events(
             from_date=from_date,
             to_date=to_date,
             event_names=self.event_types
         )
+        for batch in _batched(events, EVENT_STORE_BATCH_SIZE):
+            events_count += len(batch)
+            stored_count += self.repository.store_events(batch)
         
-        if not events:
+        if not events_count:
             logger.warning(f"No events retrieved from Mixpanel for period {from_date} to {to_date}")
             return {
                 "events_count": 0,
@@ -81,13 +110,10 @@ class MixpanelDataPullTask(DataPullTask):
                 "status": "completed_no_data"
             }
         
-        # Store events in the repository
-        stored_count = self.repository.store_events(events)
-        
         logger.info(f"Successfully pulled and stored {stored_count} events from Mixpanel")
         
         return {
-            "events_count": len(events),
+            "events_count": events_count,
             "stored_count": stored_count,
             "from_date": from_date,
             "to_date": to_date,
@@ -108,8 +134,8 @@ class UserProfileDataPullTask(DataPullTask):
         description = "Pull user profile data from Mixpanel Engage API"
         super().__init__(task_id, description)
         
-        self.connector = MixpanelConnector()
-        self.repository = EventsRepository()
+        self.connector = get_mixpanel_connector()
+        self.repository = get_events_repository()
     
     def run(self) -> Dict[str, Any]:
         """
@@ -160,8 +186,8 @@ class FullDataBackfillTask(DataPullTask):
         description = "Full historical data backfill from Mixpanel"
         super().__init__(task_id, description)
         
-        self.connector = MixpanelConnector()
-        self.repository = EventsRepository()
+        self.connector = get_mixpanel_connector()
+        self.repository = get_events_repository()
         
         # This task can take longer
         self.retry_delay = 1800  # 30 minutes between retries
@@ -176,62 +202,118 @@ class FullDataBackfillTask(DataPullTask):
         Returns:
             Dict[str, Any]: Results of the backfill operation
         """
-        to_date = datetime.now().date().isoformat()
-        from_date = (datetime.now() - timedelta(days=days_back)).date().isoformat()
+        end_ord = date.today().toordinal()
+        start_ord = end_ord - days_back
+        to_date = date.fromordinal(end_ord).isoformat()
+        from_date = date.fromordinal(start_ord).isoformat()
         
         logger.info(f"Starting full data backfill from {from_date} to {to_date}")
         
-        # Track progress for the backfill
-        total_events = 0
-        total_days = days_back
-        days_processed = 0
+        # Split the range into chunks up front so they can be pulled concurrently;
+        # chunk bounds are integer day ordinals, formatted only once each
+        chunks: List[Tuple[str, str, int]] = []
+        for chunk_start in range(start_ord, end_ord, BACKFILL_CHUNK_DAYS):
+            chunk_end = min(chunk_start + BACKFILL_CHUNK_DAYS, end_ord)
+            chunks.append((
+                date.fromordinal(chunk_start).isoformat(),
+                date.fromordinal(chunk_end).isoformat(),
+                chunk_end - chunk_start
+            ))
+        
+        # Pulls are network-bound and run on a small pool; a single writer
+        # thread drains a bounded queue so database writes never contend
+        pulled: "queue.Queue[Optional[Tuple[str, str, int, List[Dict]]]]" = queue.Queue(
+            maxsize=BACKFILL_MAX_WORKERS
+        )
+        progress = {"total_events": 0, "days_processed": 0}
+        
+        writer = threading.Thread(
+            target=self._store_pulled_chunks,
+            args=(pulled, progress),
+            name=f"{self.task_id}-writer",
+            daemon=True
+        )
+        writer.start()
         
-        current_date = datetime.strptime(from_date, "%Y-%m-%d")
-        end_date = datetime.strptime(to_date, "%Y-%m-%d")
+        try:
+            with ThreadPoolExecutor(max_workers=BACKFILL_MAX_WORKERS) as executor:
+                for chunk in chunks:
+                    executor.submit(self._pull_chunk, *chunk, pulled)
+        finally:
+            pulled.put(None)
+            writer.join()
         
-        # Process data in smaller chunks (7 days at a time)
-        chunk_size = 7  # days
+        total_events = progress["total_events"]
+        days_processed = progress["days_processed"]
         
-        while current_date < end_date:
-            chunk_end = min(current_date + timedelta(days=chunk_size), end_date)
-            
-            chunk_from = current_date.date().isoformat()
-            chunk_to = chunk_end.date().isoformat()
-            
-            logger.info(f"Processing backfill chunk from {chunk_from} to {chunk_to}")
+        logger.info(f"Completed full data backfill, processed {days_processed} days, stored {total_events} events")
+        
+        return {
+            "total_events": total_events,
+            "days_processed": days_processed,
+            "from_date": from_date,
+            "to_date": to_date,
+            "status": "completed_success"
+        }
+    
+    def _pull_chunk(self,
+                    chunk_from: str,
+                    chunk_to: str,
+                    days_in_chunk: int,
+                    pulled: "queue.Queue"
+                   ) -> None:
+        """
+        Stream one backfill chunk from Mixpanel and hand it to the writer in batches.
+        
+        The chunk's days are reported with a final empty batch once the whole
+        chunk has been read. Errors are logged and the rest of the chunk is
+        skipped so the backfill continues.
+        
+        Args:
+            chunk_from: Chunk start date in YYYY-MM-DD format
+            chunk_to: Chunk end date in YYYY-MM-DD format
+            days_in_chunk: Number of days covered by the chunk
+            pulled: Queue consumed by the writer thread
+        """
+        logger.info(f"Processing backfill chunk from {chunk_from} to {chunk_to}")
+        
+        try:
+            events = self.connector.iter_events(
+                from_date=chunk_from,
+                to_date=chunk_to
+            )
+            for batch in _batched(events, EVENT_STORE_BATCH_SIZE):
+                pulled.put((chunk_from, chunk_to, 0, batch))
+        except Exception as e:
+            logger.error(f"Error during backfill for period {chunk_from} to {chunk_to}: {str(e)}", exc_info=True)
+            return
+        
+        pulled.put((chunk_from, chunk_to, days_in_chunk, []))
+    
+    def _store_pulled_chunks(self, pulled: "queue.Queue", progress: Dict[str, int]) -> None:
+        """
+        Store pulled chunks until the end-of-backfill sentinel arrives.
+        
+        Args:
+            pulled: Queue of (chunk_from, chunk_to, days_completed, events), ended by None
+            progress: Counters updated in place with stored events and processed days
+        """
+        while True:
+            item = pulled.get()
+            if item is None:
+                return
             
+            chunk_from, chunk_to, days_completed, events = item
             try:
-                # Pull events for this chunk
-                events = self.connector.get_events(
-                    from_date=chunk_from,
-                    to_date=chunk_to
-                )
-                
                 if events:
                     # Store events
                     stored_count = self.repository.store_events(events)
-                    total_events += stored_count
+                    progress["total_events"] += stored_count
                     
                     logger.info(f"Stored {stored_count} events for period {chunk_from} to {chunk_to}")
                 
                 # Update progress
-                days_in_chunk = (chunk_end - current_date).days
-                days_processed += days_in_chunk
-                
-                # Move to next chunk
-                current_date = chunk_end
+                progress["days_processed"] += days_completed
                 
             except Exception as e:
                 logger.error(f"Error during backfill for period {chunk_from} to {chunk_to}: {str(e)}", exc_info=True)
-                # Continue with next chunk despite errors
-                current_date = chunk_end
-        
-        logger.info(f"Completed full data backfill, processed {days_processed} days, stored {total_events} events")
-        
-        return {
-            "total_events": total_events,
-            "days_processed": days_processed,
-            "from_date": from_date,
-            "to_date": to_date,
-            "status": "completed_success"
-        }
@@ -7,10 +7,13 @@ results into actionable business insights.
 """
 
 import logging
+from collections import Counter, defaultdict
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 
-from hitcraft_analytics.data.repositories.events_repository import EventsRepository
+import pandas as pd
+
+from hitcraft_analytics.workers.tasks.shared_resources import get_events_repository
 from hitcraft_analytics.insights.insights_engine import InsightsEngine
 from hitcraft_analytics.insights.processors.insight_prioritizer import InsightPrioritizer
 from hitcraft_analytics.insights.processors.insight_enricher import InsightEnricher
@@ -33,7 +36,7 @@ class DailyInsightsGenerationTask(InsightGenerationTask):
         description = "Generate daily insights from analyzed data"
         super().__init__(task_id, description)
         
-        self.repository = EventsRepository()
+        self.repository = get_events_repository()
         self.insights_engine = InsightsEngine()
         self.insight_prioritizer = InsightPrioritizer()
         self.insight_enricher = InsightEnricher()
@@ -56,9 +59,12 @@ class DailyInsightsGenerationTask(InsightGenerationTask):
         Returns:
             Dict[str, Any]: Generated insights
         """
+        # Sample the clock once so every timestamp in this run agrees
+        now = datetime.now()
+        
         # Default date range: last 7 days
         if not from_date or not to_date:
-            to_date_obj = datetime.now().date()
+            to_date_obj = now.date()
             from_date_obj = to_date_obj - timedelta(days=7)
             to_date = to_date or to_date_obj.isoformat()
             from_date = from_date or from_date_obj.isoformat()
@@ -95,7 +101,8 @@ class DailyInsightsGenerationTask(InsightGenerationTask):
             
             # Enrich insights with business context and recommendations
             enriched_insights = self.insight_enricher.enrich_insights(
-                insights=prioritized_insights
+                insights=prioritized_insights,
+                now=now
             )
             
             # Store generated insights
@@ -105,17 +112,12 @@ class DailyInsightsGenerationTask(InsightGenerationTask):
                 to_date=to_date,
                 metadata={
                     "insight_types": insight_types,
-                    "generation_date": datetime.now().isoformat()
+                    "generation_date": now.isoformat()
                 }
             )
             
             # Group insights by type for the result summary
-            insights_by_type = {}
-            for insight in enriched_insights:
-                insight_type = insight.get("type", "unknown")
-                if insight_type not in insights_by_type:
-                    insights_by_type[insight_type] = 0
-                insights_by_type[insight_type] += 1
+            insights_by_type = dict(Counter(insight.get("type", "unknown") for insight in enriched_insights))
             
             logger.info(f"Generated and stored {len(enriched_insights)} insights")
             
@@ -145,7 +147,7 @@ class WeeklyInsightsSummaryTask(InsightGenerationTask):
         description = "Generate weekly summary of key insights"
         super().__init__(task_id, description)
         
-        self.repository = EventsRepository()
+        self.repository = get_events_repository()
         self.insights_engine = InsightsEngine()
         self.insight_prioritizer = InsightPrioritizer()
         self.insight_enricher = InsightEnricher()
@@ -160,25 +162,26 @@ class WeeklyInsightsSummaryTask(InsightGenerationTask):
         Returns:
             Dict[str, Any]: Weekly insights summary
         """
-        # Calculate date range for the past week
-        to_date = datetime.now().date()
-        from_date = to_date - timedelta(days=7)
+        # Calculate date range for the past week, sampling the clock once
+        now = datetime.now()
+        to_date = now.date().isoformat()
+        from_date = (now.date() - timedelta(days=7)).isoformat()
         
-        logger.info(f"Generating weekly insights summary for {from_date.isoformat()} to {to_date.isoformat()}")
+        logger.info(f"Generating weekly insights summary for {from_date} to {to_date}")
         
         try:
             # Retrieve all insights generated in the past week
             weekly_insights = self.repository.get_insights(
-                from_date=from_date.isoformat(),
-                to_date=to_date.isoformat()
+                from_date=from_date,
+                to_date=to_date
             )
             
             if not weekly_insights:
                 logger.warning(f"No insights found for the past week")
                 return {
                     "status": "no_insights",
-                    "from_date": from_date.isoformat(),
-                    "to_date": to_date.isoformat()
+                    "from_date": from_date,
+                    "to_date": to_date
                 }
             
             # Identify the top insights for the week using the prioritizer
@@ -186,25 +189,23 @@ class WeeklyInsightsSummaryTask(InsightGenerationTask):
                 insights=weekly_insights,
                 max_insights=max_insights,
                 prioritization_criteria={
-                    "importance": 0.5,  # Weight for importance score
+                    "impact": 0.5,      # Weight for the insight's impact score
                     "recency": 0.3,     # Weight for recency
-                    "impact": 0.2       # Weight for business impact
+                    "trend": 0.2        # Weight for trend direction and strength
                 }
             )
             
             # Group insights by category
-            categorized_insights = {}
+            categorized_insights = defaultdict(list)
             for insight in prioritized_weekly_insights:
-                category = insight.get("category", "Other")
-                if category not in categorized_insights:
-                    categorized_insights[category] = []
-                categorized_insights[category].append(insight)
+                categorized_insights[insight.get("category", "Other")].append(insight)
+            categorized_insights = dict(categorized_insights)
             
             # Create the weekly summary
             summary = {
                 "period": {
-                    "from_date": from_date.isoformat(),
-                    "to_date": to_date.isoformat()
+                    "from_date": from_date,
+                    "to_date": to_date
                 },
                 "total_insights": len(weekly_insights),
                 "top_insights_count": len(prioritized_weekly_insights),
@@ -212,23 +213,23 @@ class WeeklyInsightsSummaryTask(InsightGenerationTask):
                     category: len(insights) for category, insights in categorized_insights.items()
                 },
                 "categorized_insights": categorized_insights,
-                "generation_date": datetime.now().isoformat()
+                "generation_date": now.isoformat()
             }
             
             # Store the weekly summary
             self.repository.store_insight_summary(
                 summary_type="weekly",
                 summary=summary,
-                from_date=from_date.isoformat(),
-                to_date=to_date.isoformat()
+                from_date=from_date,
+                to_date=to_date
             )
             
             logger.info(f"Generated weekly insights summary with {len(prioritized_weekly_insights)} top insights")
             
             return {
                 "status": "completed",
-                "from_date": from_date.isoformat(),
-                "to_date": to_date.isoformat(),
+                "from_date": from_date,
+                "to_date": to_date,
                 "total_insights": len(weekly_insights),
                 "top_insights_count": len(prioritized_weekly_insights),
                 "categories": list(categorized_insights.keys())
@@ -252,7 +253,7 @@ class MonthlyTrendsAnalysisTask(InsightGenerationTask):
         description = "Generate monthly comprehensive trends analysis"
         super().__init__(task_id, description)
         
-        self.repository = EventsRepository()
+        self.repository = get_events_repository()
         self.insights_engine = InsightsEngine()
     
     def run(self) -> Dict[str, Any]:
@@ -262,8 +263,9 @@ class MonthlyTrendsAnalysisTask(InsightGenerationTask):
         Returns:
             Dict[str, Any]: Monthly trends analysis
         """
-        # Calculate date range for the past month
-        to_date = datetime.now().date()
+        # Calculate date range for the past month, sampling the clock once
+        now = datetime.now()
+        to_date = now.date()
         from_date = to_date.replace(day=1) - timedelta(days=1)  # Last day of previous month
         from_date = from_date.replace(day=1)  # First day of previous month
         
@@ -271,16 +273,22 @@ class MonthlyTrendsAnalysisTask(InsightGenerationTask):
         comparison_from_date = from_date.replace(day=1) - timedelta(days=1)  # Last day of month before last
         comparison_from_date = comparison_from_date.replace(day=1)  # First day of month before last
         
-        logger.info(f"Generating monthly trends analysis for {from_date.isoformat()} to {to_date.isoformat()}")
+        # Format the dates once for queries, storage and the result
+        month_label = from_date.strftime("%B %Y")
+        comparison_from_date = comparison_from_date.isoformat()
+        from_date = from_date.isoformat()
+        to_date = to_date.isoformat()
+        
+        logger.info(f"Generating monthly trends analysis for {from_date} to {to_date}")
         
         try:
             # Generate monthly trend insights with comparison to previous month
             monthly_insights = self.insights_engine.generate_trend_insights(
-                from_date=from_date.isoformat(),
-                to_date=to_date.isoformat(),
+                from_date=from_date,
+                to_date=to_date,
                 comparison_period={
-                    "from_date": comparison_from_date.isoformat(),
-                    "to_date": from_date.isoformat()
+                    "from_date": comparison_from_date,
+                    "to_date": from_date
                 },
                 metrics=["dau", "mau", "retention", "conversion_rate", "revenue"],
                 timeframe="month"
@@ -290,38 +298,38 @@ class MonthlyTrendsAnalysisTask(InsightGenerationTask):
                 logger.warning(f"No trend insights generated for the month")
                 return {
                     "status": "no_insights",
-                    "from_date": from_date.isoformat(),
-                    "to_date": to_date.isoformat()
+                    "from_date": from_date,
+                    "to_date": to_date
                 }
             
             # Create monthly summary with key metrics
             monthly_summary = {
                 "period": {
-                    "month": from_date.strftime("%B %Y"),
-                    "from_date": from_date.isoformat(),
-                    "to_date": to_date.isoformat()
+                    "month": month_label,
+                    "from_date": from_date,
+                    "to_date": to_date
                 },
                 "insights_count": len(monthly_insights),
                 "insights": monthly_insights,
                 "key_metrics": self._extract_key_metrics(monthly_insights),
-                "generation_date": datetime.now().isoformat()
+                "generation_date": now.isoformat()
             }
             
             # Store monthly summary
             self.repository.store_insight_summary(
                 summary_type="monthly",
                 summary=monthly_summary,
-                from_date=from_date.isoformat(),
-                to_date=to_date.isoformat()
+                from_date=from_date,
+                to_date=to_date
             )
             
             logger.info(f"Generated monthly trends analysis with {len(monthly_insights)} insights")
             
             return {
                 "status": "completed",
-                "month": from_date.strftime("%B %Y"),
-                "from_date": from_date.isoformat(),
-                "to_date": to_date.isoformat(),
+                "month": month_label,
+                "from_date": from_date,
+                "to_date": to_date,
                 "insights_count": len(monthly_insights),
                 "metrics_analyzed": list(monthly_summary.get("key_metrics", {}).keys())
             }
@@ -340,26 +348,26 @@ class MonthlyTrendsAnalysisTask(InsightGenerationTask):
         Returns:
             Dict[str, Any]: Key metrics with their values and trends
         """
-        key_metrics = {}
+        if not insights:
+            return {}
         
-        for insight in insights:
-            metric_name = insight.get("metric")
-            if not metric_name:
-                continue
-                
-            # Extract metric values and changes
-            current_value = insight.get("current_value")
-            previous_value = insight.get("previous_value")
-            percent_change = insight.get("percent_change")
-            trend_direction = insight.get("trend_direction")
-            
-            if current_value is not None:
-                key_metrics[metric_name] = {
-                    "value": current_value,
-                    "previous_value": previous_value,
-                    "percent_change": percent_change,
-                    "trend": trend_direction,
-                    "significant": insight.get("is_significant", False)
-                }
+        columns = ["metric", "current_value", "previous_value", "percent_change",
+                   "trend_direction", "is_significant"]
+        df = pd.DataFrame(insights, columns=columns, dtype=object)
+        
+        # Keep insights with a metric name and a current value; the latest
+        # insight for each metric wins
+        df = df[df["metric"].notna() & (df["metric"] != "") & df["current_value"].notna()]
+        df = df.drop_duplicates("metric", keep="last").set_index("metric")
+        df["is_significant"] = df["is_significant"].fillna(False)
+        
+        # Extract metric values and changes
+        df = df.rename(columns={
+            "current_value": "value",
+            "trend_direction": "trend",
+            "is_significant": "significant"
+        })
+        df = df.where(df.notna(), None)
+        key_metrics = df.to_dict("index")
         
         return key_metrics
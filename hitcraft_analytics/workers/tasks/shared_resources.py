@@ -0,0 +1,50 @@
+"""
+Shared Task Resources
+
+This module provides process-wide instances of the Mixpanel connector and
+events repository used by scheduled tasks, so every task shares one HTTP
+session and one database connection pool instead of creating its own.
+"""
+
+import threading
+from typing import Optional
+
+from hitcraft_analytics.data.connectors.mixpanel_connector import MixpanelConnector
+from hitcraft_analytics.data.repositories.events_repository import EventsRepository
+
+_connector: Optional[MixpanelConnector] = None
+_repository: Optional[EventsRepository] = None
+_lock = threading.Lock()
+
+
+def get_mixpanel_connector() -> MixpanelConnector:
+    """
+    Get the shared Mixpanel connector, creating it on first use.
+
+    Returns:
+        MixpanelConnector: Connector shared by all tasks in this process
+    """
+    global _connector
+
+    with _lock:
+        if _connector is None:
+            _connector = MixpanelConnector()
+        return _connector
+
+
+def get_events_repository() -> EventsRepository:
+    """
+    Get the shared events repository, creating it on first use.
+
+    The repository is built on the shared Mixpanel connector.
+
+    Returns:
+        EventsRepository: Repository shared by all tasks in this process
+    """
+    global _repository
+
+    connector = get_mixpanel_connector()
+    with _lock:
+        if _repository is None:
+            _repository = EventsRepository(mixpanel_connector=connector)
+        return _repository
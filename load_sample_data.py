@@ -6,11 +6,19 @@ This script loads sample event data into the database to test the analytics engi
 instead of using fallback sample data in the AnthropicClient.
 """
 
+import os
+import sys
 import uuid
-import random
 from datetime import datetime, timedelta
 import logging
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; profile scoring falls back to plain NumPy
+    njit = None
+
 from hitcraft_analytics.data.connectors.database_connector import DatabaseConnector
 from hitcraft_analytics.utils.logging.logger import get_logger
 
@@ -35,6 +43,12 @@ EVENT_TYPES = [
     "visit_landing_page"
 ]
 
+# Events counted as page views
+PAGE_VIEW_SET = frozenset({"view_content", "visit_landing_page"})
+
+# Project events among the sample event types
+PROJECT_EVENTS = frozenset({"create_new_project", "save_project", "share_project"})
+
 # Sample distinct IDs (user IDs)
 DISTINCT_IDS = [
     f"user_{i}" for i in range(1, 101)  # 100 sample users
@@ -56,346 +70,481 @@ CITIES = ["San Francisco", "New York", "London", "Tokyo", "Berlin", "Paris"]
 # Sample countries
 COUNTRIES = ["US", "UK", "JP", "DE", "FR", "CA"]
 
+# Intern the categorical values so every generated event shares one string
+# object per value, letting dict and set lookups on them match by identity
+EVENT_TYPES = [sys.intern(s) for s in EVENT_TYPES]
+DISTINCT_IDS = [sys.intern(s) for s in DISTINCT_IDS]
+BROWSERS = [sys.intern(s) for s in BROWSERS]
+BROWSER_VERSIONS = [sys.intern(s) for s in BROWSER_VERSIONS]
+OPERATING_SYSTEMS = [sys.intern(s) for s in OPERATING_SYSTEMS]
+DEVICES = [sys.intern(s) for s in DEVICES]
+CITIES = [sys.intern(s) for s in CITIES]
+COUNTRIES = [sys.intern(s) for s in COUNTRIES]
 
-def create_sample_event(event_name, distinct_id, timestamp):
-    """Create a sample event record with realistic properties."""
-    # Generate basic event data
-    event = {
-        "event_id": str(uuid.uuid4()),
-        "event_name": event_name,
-        "distinct_id": distinct_id,
-        "time": timestamp,
-        "insert_time": datetime.utcnow(),
-        "browser": random.choice(BROWSERS),
-        "browser_version": random.choice(BROWSER_VERSIONS),
-        "os": random.choice(OPERATING_SYSTEMS),
-        "device": random.choice(DEVICES),
-        "city": random.choice(CITIES),
-        "country_code": random.choice(COUNTRIES),
-        "screen_height": random.choice([768, 900, 1080, 1440]),
-        "screen_width": random.choice([1366, 1440, 1920, 2560])
-    }
-    
-    # Add some event-specific properties as JSON
+# Events that can follow the app_open which starts every session
+NON_APP_OPEN_EVENTS = tuple(EVENT_TYPES[1:])
+
+# Event kind flags; an event name can carry several
+KIND_PROJECT = 1        # project work ("project" in the name)
+KIND_ACCOUNT = 2        # registration and profile steps that carry user attributes
+KIND_SIGNUP = 4         # signup form views
+KIND_COMMERCE = 8       # cart, checkout and purchase steps
+KIND_PAGE_VIEW = 16     # content and landing page views
+KIND_PRODUCTION = 32    # new project creation
+KIND_SKETCH = 64        # project saves
+
+
+def classify_event(event_name):
+    """Return the kind flags of an event name."""
+    kind = 0
+    if "project" in event_name:
+        kind |= KIND_PROJECT
+    if "registration" in event_name or "profile" in event_name:
+        kind |= KIND_ACCOUNT
+    if "signup" in event_name:
+        kind |= KIND_SIGNUP
+    if "cart" in event_name or "checkout" in event_name or "purchase" in event_name:
+        kind |= KIND_COMMERCE
+    if event_name in PAGE_VIEW_SET:
+        kind |= KIND_PAGE_VIEW
+    if event_name == "create_new_project":
+        kind |= KIND_PRODUCTION
+    if event_name == "save_project":
+        kind |= KIND_SKETCH
+    return kind
+
+
+# Kind flags of every sample event, so hot loops do a dict lookup instead of
+# substring searches
+EVENT_KIND = {name: classify_event(name) for name in EVENT_TYPES}
+
+
+def event_kind(event_name):
+    """Look up the kind flags of an event name, classifying unknown names."""
+    kind = EVENT_KIND.get(event_name)
+    return classify_event(event_name) if kind is None else kind
+
+
+# Events whose properties carry their own generated ID
+ID_PROPERTY_EVENTS = ["app_open", "view_content", *sorted(PROJECT_EVENTS)]
+
+
+def batch_uuids(n):
+    """Generate n random (version 4) UUIDs from a single os.urandom call."""
+    buf = os.urandom(16 * n)
+    return [uuid.UUID(bytes=buf[i * 16:(i + 1) * 16], version=4) for i in range(n)]
+
+
+def choose(rng, values, n):
+    """
+    Draw n values uniformly from a sequence as an object array.
+    
+    Unlike rng.choice on a list of strings, this returns the original string
+    objects (so interned values stay interned) rather than fresh copies.
+    """
+    return np.array(values, dtype=object)[rng.integers(0, len(values), n)]
+
+
+def create_event_properties(event_name, rng, uuid_iter):
+    """Create the event-specific properties for a sample event."""
     properties = {}
+    kind = event_kind(event_name)
     
     if event_name == "app_open":
-        properties["session_id"] = str(uuid.uuid4())
-        properties["app_version"] = f"{random.randint(1, 3)}.{random.randint(0, 9)}.{random.randint(0, 9)}"
-        properties["login_method"] = random.choice(["email", "google", "apple", "guest"])
+        properties["session_id"] = str(next(uuid_iter))
+        properties["app_version"] = f"{rng.integers(1, 4)}.{rng.integers(0, 10)}.{rng.integers(0, 10)}"
+        properties["login_method"] = str(rng.choice(["email", "google", "apple", "guest"]))
         
     elif event_name == "view_content":
-        properties["content_id"] = str(uuid.uuid4())
-        properties["content_type"] = random.choice(["song", "lyrics", "chord", "beat"])
-        properties["content_category"] = random.choice(["pop", "rock", "hip-hop", "electronic"])
-        properties["duration"] = random.randint(10, 300)
+        properties["content_id"] = str(next(uuid_iter))
+        properties["content_type"] = str(rng.choice(["song", "lyrics", "chord", "beat"]))
+        properties["content_category"] = str(rng.choice(["pop", "rock", "hip-hop", "electronic"]))
+        properties["duration"] = int(rng.integers(10, 301))
         
-    elif "project" in event_name:
-        properties["project_id"] = str(uuid.uuid4())
-        properties["project_type"] = random.choice(["song", "lyrics", "chord", "beat"])
-        properties["track_count"] = random.randint(1, 8)
-        properties["duration"] = random.randint(60, 240)
+    elif kind & KIND_PROJECT:
+        properties["project_id"] = str(next(uuid_iter))
+        properties["project_type"] = str(rng.choice(["song", "lyrics", "chord", "beat"]))
+        properties["track_count"] = int(rng.integers(1, 9))
+        properties["duration"] = int(rng.integers(60, 241))
         
-    elif "registration" in event_name or "signup" in event_name or "profile" in event_name:
-        properties["method"] = random.choice(["email", "google", "apple"])
-        properties["user_type"] = random.choice(["songwriter", "producer", "artist", "musician"])
-        properties["experience_level"] = random.choice(["beginner", "intermediate", "professional"])
+    elif kind & (KIND_ACCOUNT | KIND_SIGNUP):
+        properties["method"] = str(rng.choice(["email", "google", "apple"]))
+        properties["user_type"] = str(rng.choice(["songwriter", "producer", "artist", "musician"]))
+        properties["experience_level"] = str(rng.choice(["beginner", "intermediate", "professional"]))
         
-    elif "cart" in event_name or "checkout" in event_name or "purchase" in event_name:
-        properties["item_count"] = random.randint(1, 5)
-        properties["total_amount"] = round(random.uniform(4.99, 99.99), 2)
+    elif kind & KIND_COMMERCE:
+        properties["item_count"] = int(rng.integers(1, 6))
+        properties["total_amount"] = round(float(rng.uniform(4.99, 99.99)), 2)
         properties["currency"] = "USD"
-        properties["payment_method"] = random.choice(["credit_card", "paypal", "apple_pay", "google_pay"])
-    
-    # Add properties to the event
-    event["properties"] = properties
+        properties["payment_method"] = str(rng.choice(["credit_card", "paypal", "apple_pay", "google_pay"]))
     
-    return event
+    return properties
 
 
-def generate_user_session(distinct_id, start_time, session_duration=30):
-    """Generate a set of events representing a coherent user session."""
-    session_events = []
-    current_time = start_time
-    
-    # Start with app_open
-    session_events.append(create_sample_event("app_open", distinct_id, current_time))
-    
-    # Generate 3-10 events per session
-    num_events = random.randint(3, 10)
-    for _ in range(num_events):
-        current_time += timedelta(minutes=random.randint(1, 5))
-        event_name = random.choice(EVENT_TYPES[1:])  # Exclude app_open
-        session_events.append(create_sample_event(event_name, distinct_id, current_time))
+def iter_sample_data(num_days=30, events_per_day=100):
+    """
+    Generate sample event data for the specified number of days, session by session.
+    
+    Each day gets a random number of user sessions. A session starts with an
+    app_open event followed by 3-10 other events a few minutes apart. Events
+    are yielded one session at a time, in time order within each session;
+    sessions of the same user may overlap in time, so the stream is not in
+    global time order. All random columns are drawn as whole arrays up front
+    rather than per event, and event dicts are only built as they are yielded.
+    """
+    rng = np.random.default_rng()
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=num_days)
     
-    return session_events
+    # Lay out the sessions: the day, user and start time of each one
+    num_dates = (end_date - start_date).days + 1
+    day_starts = np.datetime64(start_date.date(), "s") + np.arange(num_dates).astype("timedelta64[D]")
+    sessions_per_day = rng.integers(max(1, events_per_day - 20), events_per_day + 21, num_dates)
+    n_sessions = int(sessions_per_day.sum())
+    session_starts = (np.repeat(day_starts, sessions_per_day) +
+                      rng.integers(0, 86400, n_sessions).astype("timedelta64[s]"))
+    session_users = choose(rng, DISTINCT_IDS, n_sessions)
+    
+    # Each session is an app_open plus 3-10 further events
+    session_lengths = rng.integers(3, 11, n_sessions) + 1
+    n_total = int(session_lengths.sum())
+    session_offsets = np.concatenate(([0], np.cumsum(session_lengths)[:-1]))
+    
+    event_names = choose(rng, NON_APP_OPEN_EVENTS, n_total)
+    event_names[session_offsets] = EVENT_TYPES[0]
+    
+    # Events are 1-5 minutes apart within a session
+    minute_steps = rng.integers(1, 6, n_total)
+    minute_steps[session_offsets] = 0
+    elapsed_minutes = np.cumsum(minute_steps)
+    elapsed_minutes -= np.repeat(elapsed_minutes[session_offsets], session_lengths)
+    event_times = (np.repeat(session_starts, session_lengths) +
+                   elapsed_minutes.astype("timedelta64[m]"))
+    distinct_ids = np.repeat(session_users, session_lengths)
+    
+    # Emit events session by session, so each session's events stay together
+    columns = zip(
+        event_names.tolist(),
+        distinct_ids.tolist(),
+        event_times.tolist(),
+        choose(rng, BROWSERS, n_total).tolist(),
+        choose(rng, BROWSER_VERSIONS, n_total).tolist(),
+        choose(rng, OPERATING_SYSTEMS, n_total).tolist(),
+        choose(rng, DEVICES, n_total).tolist(),
+        choose(rng, CITIES, n_total).tolist(),
+        choose(rng, COUNTRIES, n_total).tolist(),
+        rng.choice([768, 900, 1080, 1440], n_total).tolist(),
+        rng.choice([1366, 1440, 1920, 2560], n_total).tolist()
+    )
+    insert_time = datetime.utcnow()
+    
+    # One ID per event plus one for each event that carries an ID property
+    uuid_iter = iter(batch_uuids(n_total + int(np.isin(event_names, ID_PROPERTY_EVENTS).sum())))
+    
+    for (event_name, distinct_id, event_time, browser, browser_version, os_name,
+         device, city, country_code, screen_height, screen_width) in columns:
+        yield {
+            "event_id": str(next(uuid_iter)),
+            "event_name": event_name,
+            "distinct_id": distinct_id,
+            "time": event_time,
+            "insert_time": insert_time,
+            "browser": browser,
+            "browser_version": browser_version,
+            "os": os_name,
+            "device": device,
+            "city": city,
+            "country_code": country_code,
+            "screen_height": screen_height,
+            "screen_width": screen_width,
+            "properties": create_event_properties(event_name, rng, uuid_iter)
+        }
 
 
 def generate_sample_data(num_days=30, events_per_day=100):
     """Generate sample event data for the specified number of days."""
-    all_events = []
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=num_days)
-    
-    current_date = start_date
-    
-    while current_date <= end_date:
-        # Generate events for this day
-        day_events_count = random.randint(max(1, events_per_day - 20), events_per_day + 20)
-        
-        for _ in range(day_events_count):
-            # Select a random user
-            distinct_id = random.choice(DISTINCT_IDS)
-            
-            # Generate a random time during the day
-            hour = random.randint(0, 23)
-            minute = random.randint(0, 59)
-            second = random.randint(0, 59)
-            event_time = datetime(current_date.year, current_date.month, current_date.day, 
-                                hour, minute, second)
-            
-            # Generate a session of events
-            session_events = generate_user_session(distinct_id, event_time)
-            all_events.extend(session_events)
-        
-        current_date += timedelta(days=1)
-    
-    return all_events
+    return list(iter_sample_data(num_days, events_per_day))
+
+
+def load_records(table_name, records, noun):
+    """
+    Stream records (any iterable) into a table with a single COPY.
+    
+    Returns:
+        int: Number of rows loaded.
+    """
+    try:
+        db = DatabaseConnector()
+        rows_loaded = db.copy_records(table_name, records)
+        logger.info(f"Loaded {rows_loaded} {noun} into {table_name}")
+        return rows_loaded
+    except Exception as e:
+        logger.error(f"Error loading {noun} into {table_name}: {str(e)}")
+        return 0
 
 
 def load_data_to_database(events):
-    """Load the generated events into the database."""
-    db = DatabaseConnector()
-    
-    # Split events into batches to avoid memory issues
-    batch_size = 100
-    total_loaded = 0
-    
-    for i in range(0, len(events), batch_size):
-        batch = events[i:i+batch_size]
-        try:
-            rows_inserted = db.bulk_insert("events", batch)
-            total_loaded += rows_inserted
-            logger.info(f"Loaded batch {i//batch_size + 1}: {rows_inserted} events")
-        except Exception as e:
-            logger.error(f"Error loading batch {i//batch_size + 1}: {str(e)}")
-    
-    return total_loaded
+    """Load the generated events (any iterable) into the database in one COPY."""
+    return load_records("events", events, "events")
 
 
-def create_user_sessions(events):
-    """Create user session records from the event data."""
-    # Group events by user ID
-    sessions_by_user = {}
+def new_derived_state():
+    """Create the empty session/profile state updated by add_event_to_derived."""
+    return {"sessions_by_user": {}, "profiles": {}}
+
+
+def add_event_to_derived(state, event):
+    """
+    Fold one event into the session and profile state.
+    
+    Events must arrive session by session, each session's events in time
+    order, as iter_sample_data yields them. Sessions keep running aggregates
+    rather than their events, so the state grows with the number of
+    sessions and users, not events.
+    """
+    distinct_id = event["distinct_id"]
+    event_name = event["event_name"]
+    event_time = event["time"]
+    kind = event_kind(event_name)
+    
+    # Session tracking: app_open starts a new session, anything else is
+    # added to the user's latest session (the one being emitted) if one exists
+    user_sessions = state["sessions_by_user"].setdefault(distinct_id, [])
+    if event_name == "app_open":
+        user_sessions.append({
+            "session_id": event.get("properties", {}).get("session_id", str(uuid.uuid4())),
+            "distinct_id": distinct_id,
+            "start_time": event_time,
+            "first_event": event_name,
+            "browser": event["browser"],
+            "os": event["os"],
+            "device_type": event["device"],
+            "event_count": 0,
+            "page_view_count": 0,
+            "feature_used_count": 0,
+            "production_count": 0
+        })
+    
+    if user_sessions:
+        session = user_sessions[-1]
+        session["end_time"] = event_time
+        session["last_event"] = event_name
+        session["event_count"] += 1
+        if kind & KIND_PAGE_VIEW:
+            session["page_view_count"] += 1
+        if kind & KIND_PROJECT:
+            session["feature_used_count"] += 1
+        if kind & KIND_PRODUCTION:
+            session["production_count"] += 1
+    
+    # Profile tracking
+    profiles = state["profiles"]
+    profile = profiles.get(distinct_id)
+    if profile is None:
+        # Initialize new profile
+        profile = profiles[distinct_id] = {
+            "distinct_id": distinct_id,
+            "first_seen": event_time,
+            "last_seen": event_time,
+            "session_count": 0,
+            "event_count": 1,
+            "feature_count": 0,
+            "production_count": 0,
+            "sketch_count": 0,
+            "days_active": 1
+        }
+    else:
+        # Update profile; sessions may arrive out of time order
+        profile["event_count"] += 1
+        if event_time < profile["first_seen"]:
+            profile["first_seen"] = event_time
+        if event_time > profile["last_seen"]:
+            profile["last_seen"] = event_time
+    
+    # Count sessions (app opens)
+    if event_name == "app_open":
+        profile["session_count"] += 1
     
-    for event in events:
-        distinct_id = event["distinct_id"]
-        event_time = event["time"]
+    # Update feature counts
+    if kind & KIND_PROJECT:
+        profile["feature_count"] += 1
         
-        if distinct_id not in sessions_by_user:
-            sessions_by_user[distinct_id] = []
+    if kind & KIND_PRODUCTION:
+        profile["production_count"] += 1
         
-        # Check if this is an app_open event (session start)
-        if event["event_name"] == "app_open":
-            # Create a new session
-            session = {
-                "session_id": event.get("properties", {}).get("session_id", str(uuid.uuid4())),
-                "distinct_id": distinct_id,
-                "start_time": event_time,
-                "events": [event]
-            }
-            sessions_by_user[distinct_id].append(session)
-        else:
-            # Add to the last session if it exists
-            if sessions_by_user[distinct_id]:
-                sessions_by_user[distinct_id][-1]["events"].append(event)
-    
-    # Process sessions to create session records
-    session_records = []
-    
-    for user_sessions in sessions_by_user.values():
-        for session in user_sessions:
-            if not session["events"]:
-                continue
-                
-            # Sort events by time
-            sorted_events = sorted(session["events"], key=lambda e: e["time"])
-            
-            # Get session end time (time of last event)
-            end_time = sorted_events[-1]["time"]
-            
-            # Create session record
-            session_record = {
-                "session_id": session["session_id"],
-                "distinct_id": session["distinct_id"],
-                "start_time": session["start_time"],
-                "end_time": end_time,
-                "duration_seconds": int((end_time - session["start_time"]).total_seconds()),
-                "event_count": len(session["events"]),
-                "page_view_count": sum(1 for e in session["events"] if e["event_name"] in ["view_content", "visit_landing_page"]),
-                "feature_used_count": sum(1 for e in session["events"] if "project" in e["event_name"]),
-                "production_count": sum(1 for e in session["events"] if e["event_name"] == "create_new_project"),
-                "browser": sorted_events[0]["browser"],
-                "os": sorted_events[0]["os"],
-                "device_type": sorted_events[0]["device"],
-                "properties": {
-                    "first_event": sorted_events[0]["event_name"],
-                    "last_event": sorted_events[-1]["event_name"]
-                }
-            }
+    if kind & KIND_SKETCH:
+        profile["sketch_count"] += 1
+        
+    # Extract user properties from registration events
+    if kind & KIND_ACCOUNT:
+        props = event.get("properties", {})
+        
+        if "user_type" in props:
+            profile["user_type"] = props["user_type"]
             
-            session_records.append(session_record)
-    
-    return session_records
+        if "experience_level" in props:
+            profile["experience_level"] = props["experience_level"]
 
 
-def load_sessions_to_database(sessions):
-    """Load session records into the database."""
-    db = DatabaseConnector()
-    
-    # Split sessions into batches
-    batch_size = 50
-    total_loaded = 0
-    
-    for i in range(0, len(sessions), batch_size):
-        batch = sessions[i:i+batch_size]
-        try:
-            rows_inserted = db.bulk_insert("user_sessions", batch)
-            total_loaded += rows_inserted
-            logger.info(f"Loaded session batch {i//batch_size + 1}: {rows_inserted} sessions")
-        except Exception as e:
-            logger.error(f"Error loading session batch {i//batch_size + 1}: {str(e)}")
-    
-    return total_loaded
+def finish_derived(state):
+    """
+    Turn the accumulated state into session and profile records.
+    
+    Returns:
+        tuple: (session_records, profile_records)
+    """
+    session_records = [
+        _session_record(session)
+        for user_sessions in state["sessions_by_user"].values()
+        for session in user_sessions
+    ]
+    
+    profile_records = list(state["profiles"].values())
+    score_profiles(profile_records)
+    
+    return session_records, profile_records
+
+
+def track_derived(events, state):
+    """Pass events through unchanged while folding each one into state."""
+    for event in events:
+        add_event_to_derived(state, event)
+        yield event
+
+
+def build_derived(events):
+    """
+    Build user session and profile records from the event data in one pass.
+    
+    Events must be in the per-session order generate_sample_data produces:
+    each session's events together, starting with its app_open. They are
+    not re-sorted by time, since sessions of the same user can overlap and a
+    global time order would move events into the wrong session.
+    
+    Returns:
+        tuple: (session_records, profile_records)
+    """
+    state = new_derived_state()
+    for event in events:
+        add_event_to_derived(state, event)
+    return finish_derived(state)
+
+
+def _session_record(session):
+    """Create a session record from a session's aggregates."""
+    return {
+        "session_id": session["session_id"],
+        "distinct_id": session["distinct_id"],
+        "start_time": session["start_time"],
+        "end_time": session["end_time"],
+        "duration_seconds": int((session["end_time"] - session["start_time"]).total_seconds()),
+        "event_count": session["event_count"],
+        "page_view_count": session["page_view_count"],
+        "feature_used_count": session["feature_used_count"],
+        "production_count": session["production_count"],
+        "browser": session["browser"],
+        "os": session["os"],
+        "device_type": session["device_type"],
+        "properties": {
+            "first_event": session["first_event"],
+            "last_event": session["last_event"]
+        }
+    }
+
+
+def _compute_scores(days_active, days_between, event_count, feature_count, production_count):
+    """Compute retention, churn risk and value scores for arrays of profiles."""
+    # Calculate retention score (days active / days between)
+    retention = np.where(days_between > 0, days_active / np.maximum(days_between, 1) * 100, 100.0)
+    
+    # Churn risk is the inverse of retention
+    churn = np.maximum(0.0, 100 - retention)
+    
+    value = (
+        days_active * 0.4 + 
+        event_count * 0.1 + 
+        feature_count * 0.3 + 
+        production_count * 0.2
+    )
+    return retention, churn, value
+
+
+# Compile the scoring kernel with Numba when it is installed
+_score_kernel = njit(cache=True)(_compute_scores) if njit is not None else _compute_scores
+
+
+def score_profiles(profiles, rng=None):
+    """Fill in the activity and engagement scores of all profiles at once."""
+    if not profiles:
+        return
+    
+    rng = rng or np.random.default_rng()
+    
+    # Get days between first and last seen
+    days_between = np.array([(p["last_seen"] - p["first_seen"]).days + 1 for p in profiles], dtype=np.float64)
+    
+    # Simulate activity on random days
+    days_active = rng.integers(1, days_between.astype(np.int64) + 1).astype(np.float64)
+    
+    # Add random satisfaction score
+    satisfaction = rng.uniform(50, 100, len(profiles))
+    
+    retention, churn, value = _score_kernel(
+        days_active,
+        days_between,
+        np.array([p["event_count"] for p in profiles], dtype=np.float64),
+        np.array([p["feature_count"] for p in profiles], dtype=np.float64),
+        np.array([p["production_count"] for p in profiles], dtype=np.float64)
+    )
+    
+    for profile, active, retention_score, satisfaction_score, churn_risk, value_score in zip(
+            profiles, days_active.astype(np.int64).tolist(), retention.tolist(),
+            satisfaction.tolist(), churn.tolist(), value.tolist()):
+        profile["days_active"] = active
+        profile["retention_score"] = retention_score
+        profile["satisfaction_score"] = satisfaction_score
+        profile["churn_risk"] = churn_risk
+        profile["value_score"] = value_score
+
+
+def create_user_sessions(events):
+    """Create user session records from the event data."""
+    return build_derived(events)[0]
 
 
 def create_user_profiles(events):
     """Create user profile records from the event data."""
-    profiles = {}
-    
-    for event in events:
-        distinct_id = event["distinct_id"]
-        event_time = event["time"]
-        
-        if distinct_id not in profiles:
-            # Initialize new profile
-            profiles[distinct_id] = {
-                "distinct_id": distinct_id,
-                "first_seen": event_time,
-                "last_seen": event_time,
-                "session_count": 0,
-                "event_count": 1,
-                "feature_count": 0,
-                "production_count": 0,
-                "sketch_count": 0,
-                "days_active": 1
-            }
-        else:
-            # Update profile
-            profile = profiles[distinct_id]
-            profile["event_count"] += 1
-            
-            # Update first/last seen
-            profile["first_seen"] = min(profile["first_seen"], event_time)
-            profile["last_seen"] = max(profile["last_seen"], event_time)
-        
-        # Update feature counts
-        if "project" in event["event_name"]:
-            profiles[distinct_id]["feature_count"] += 1
-            
-        if event["event_name"] == "create_new_project":
-            profiles[distinct_id]["production_count"] += 1
-            
-        if event["event_name"] == "save_project":
-            profiles[distinct_id]["sketch_count"] += 1
-            
-        # Extract user properties from registration events
-        if "registration" in event["event_name"] or "profile" in event["event_name"]:
-            props = event.get("properties", {})
-            
-            if "user_type" in props:
-                profiles[distinct_id]["user_type"] = props["user_type"]
-                
-            if "experience_level" in props:
-                profiles[distinct_id]["experience_level"] = props["experience_level"]
-    
-    # Calculate active days for each user
-    for distinct_id, profile in profiles.items():
-        # Get days between first and last seen
-        days_between = (profile["last_seen"] - profile["first_seen"]).days + 1
-        
-        # Simulate activity on random days
-        active_days = min(days_between, random.randint(1, days_between))
-        profile["days_active"] = active_days
-        
-        # Calculate retention score (days active / days between)
-        if days_between > 0:
-            profile["retention_score"] = (active_days / days_between) * 100
-        else:
-            profile["retention_score"] = 100
-            
-        # Add random satisfaction score
-        profile["satisfaction_score"] = random.uniform(50, 100)
-        
-        # Add churn risk (inverse of retention)
-        profile["churn_risk"] = max(0, 100 - profile["retention_score"])
-        
-        # Add value score
-        profile["value_score"] = (
-            profile["days_active"] * 0.4 + 
-            profile["event_count"] * 0.1 + 
-            profile["feature_count"] * 0.3 + 
-            profile["production_count"] * 0.2
-        )
-        
-        # Count sessions (app opens)
-        profile["session_count"] = sum(1 for e in events if e["distinct_id"] == distinct_id and e["event_name"] == "app_open")
-    
-    # Convert to list of records
-    profile_records = list(profiles.values())
-    
-    return profile_records
+    return build_derived(events)[1]
+
+
+def load_sessions_to_database(sessions):
+    """Load session records into the database."""
+    return load_records("user_sessions", sessions, "sessions")
 
 
 def load_profiles_to_database(profiles):
     """Load profile records into the database."""
-    db = DatabaseConnector()
-    
-    # Split profiles into batches
-    batch_size = 50
-    total_loaded = 0
-    
-    for i in range(0, len(profiles), batch_size):
-        batch = profiles[i:i+batch_size]
-        try:
-            rows_inserted = db.bulk_insert("user_profiles", batch)
-            total_loaded += rows_inserted
-            logger.info(f"Loaded profile batch {i//batch_size + 1}: {rows_inserted} profiles")
-        except Exception as e:
-            logger.error(f"Error loading profile batch {i//batch_size + 1}: {str(e)}")
-    
-    return total_loaded
+    return load_records("user_profiles", profiles, "profiles")
 
 
 def main():
     """Main function to generate and load sample data."""
     logger.info("Starting sample data generation...")
     
-    # Generate sample events for the last 30 days
-    events = generate_sample_data(num_days=30, events_per_day=100)
-    logger.info(f"Generated {len(events)} sample events")
-    
-    # Load events into the database
+    # Stream sample events for the last 30 days into the database, deriving
+    # user sessions and profiles from the same pass
+    derived = new_derived_state()
+    events = track_derived(iter_sample_data(num_days=30, events_per_day=100), derived)
     events_loaded = load_data_to_database(events)
     logger.info(f"Loaded {events_loaded} events into the database")
     
-    # Create and load user sessions
-    sessions = create_user_sessions(events)
+    sessions, profiles = finish_derived(derived)
+    
+    # Load user sessions
     sessions_loaded = load_sessions_to_database(sessions)
     logger.info(f"Loaded {sessions_loaded} user sessions into the database")
     
-    # Create and load user profiles
-    profiles = create_user_profiles(events)
+    # Load user profiles
     profiles_loaded = load_profiles_to_database(profiles)
     logger.info(f"Loaded {profiles_loaded} user profiles into the database")
     
@@ -6,16 +6,63 @@ This script loads a small set of test events directly using SQL to ensure
 we have real data for testing the AI insights functionality.
 """
 
+import itertools
 import uuid
 import json
 from datetime import datetime, timedelta
 
+try:
+    import msgspec
+except ImportError:  # msgspec is optional; properties fall back to orjson or json
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; properties fall back to the json module
+    orjson = None
+
+from psycopg2.extras import register_uuid
+
 from hitcraft_analytics.data.connectors.database_connector import DatabaseConnector
 from hitcraft_analytics.utils.logging.logger import get_logger
 
 # Set up logger
 logger = get_logger("load_test_data")
 
+
+# Let psycopg2 adapt uuid.UUID event IDs directly
+register_uuid()
+
+# Reusable msgspec encoder, when msgspec is installed
+PROPERTIES_ENCODER = msgspec.json.Encoder() if msgspec is not None else None
+
+
+def dumps_properties(properties):
+    """Serialize an event properties dict (which may hold UUIDs) to a JSON string."""
+    if PROPERTIES_ENCODER is not None:
+        return PROPERTIES_ENCODER.encode(properties).decode()
+    if orjson is not None:
+        return orjson.dumps(properties).decode()
+    return json.dumps(properties, default=str)
+
+
+# Client attributes shared by every test event
+TEST_CLIENT = {"browser": "Chrome", "browser_version": "88.0", "os": "macOS", "device": "Desktop"}
+
+
+def make_row(event_name, user_id, event_time, properties, insert_time):
+    """Build one events row for a test event."""
+    return {
+        "event_id": uuid.uuid4(),
+        "event_name": event_name,
+        "distinct_id": user_id,
+        "time": event_time,
+        "insert_time": insert_time,
+        **TEST_CLIENT,
+        "properties": dumps_properties(properties)
+    }
+
+
 def create_test_data():
     """Create a small set of test data for the events table."""
     # Get database connector
@@ -26,100 +73,54 @@ def create_test_data():
     
     # Base timestamp (1 month ago)
     base_time = datetime.now() - timedelta(days=30)
+    insert_time = datetime.now()
     
     # User IDs
     user_ids = ["test_user_1", "test_user_2", "test_user_3", "test_user_4", "test_user_5"]
     
-    # Event types
-    event_types = ["app_open", "view_content", "add_to_cart", "purchase"]
+    # Each user opens the app every day of the last month, and completes
+    # a purchase on every other day (a 50% chance)
+    days = [base_time + timedelta(days=day, minutes=day % 60) for day in range(30)]
+    user_days = list(itertools.product(days, user_ids))
+    purchase_user_days = list(itertools.product(days[::2], user_ids))
+    
+    # Event types: name, hour of day, the (day, user) pairs it occurs on and
+    # a factory for its properties
+    event_types = [
+        ("app_open", timedelta(hours=9), user_days,  # Morning
+         lambda: {"session_id": uuid.uuid4(), "version": "1.0.0"}),
+        ("view_content", timedelta(hours=10), purchase_user_days,
+         lambda: {"content_id": uuid.uuid4(), "category": "music"}),
+        ("add_to_cart", timedelta(hours=11), purchase_user_days,
+         lambda: {"item_id": uuid.uuid4(), "price": 19.99}),
+        ("purchase", timedelta(hours=12), purchase_user_days,
+         lambda: {"order_id": uuid.uuid4(), "total": 19.99})
+    ]
+    
+    rows = [
+        make_row(event_name, user_id, current_date + offset, make_properties(), insert_time)
+        for event_name, offset, occurrences, make_properties in event_types
+        for current_date, user_id in occurrences
+    ]
     
-    # Direct SQL query to insert events
-    for day in range(30):  # For each day in the last month
-        current_date = base_time + timedelta(days=day)
-        
-        # Each user does some events each day
-        for user_id in user_ids:
-            # Create app_open event
-            event_id = str(uuid.uuid4())
-            event_time = current_date + timedelta(hours=9, minutes=day % 60)  # Morning
-            properties = json.dumps({"session_id": str(uuid.uuid4()), "version": "1.0.0"})
-            
-            insert_query = f"""
-            INSERT INTO events (
-                event_id, event_name, distinct_id, time, insert_time, 
-                browser, browser_version, os, device, properties
-            ) VALUES (
-                '{event_id}', 'app_open', '{user_id}', '{event_time.isoformat()}', '{datetime.now().isoformat()}',
-                'Chrome', '88.0', 'macOS', 'Desktop', '{properties}'
-            );
-            """
-            
-            try:
-                db.execute_query(insert_query)
-            except Exception as e:
-                logger.error(f"Error inserting app_open event: {str(e)}")
-            
-            # 50% chance of completing a purchase
-            if day % 2 == 0:
-                # View content
-                event_id = str(uuid.uuid4())
-                event_time = current_date + timedelta(hours=10, minutes=day % 60)
-                properties = json.dumps({"content_id": str(uuid.uuid4()), "category": "music"})
-                
-                insert_query = f"""
-                INSERT INTO events (
-                    event_id, event_name, distinct_id, time, insert_time, 
-                    browser, browser_version, os, device, properties
-                ) VALUES (
-                    '{event_id}', 'view_content', '{user_id}', '{event_time.isoformat()}', '{datetime.now().isoformat()}',
-                    'Chrome', '88.0', 'macOS', 'Desktop', '{properties}'
-                );
-                """
-                
-                try:
-                    db.execute_query(insert_query)
-                except Exception as e:
-                    logger.error(f"Error inserting view_content event: {str(e)}")
-                
-                # Add to cart
-                event_id = str(uuid.uuid4())
-                event_time = current_date + timedelta(hours=11, minutes=day % 60)
-                properties = json.dumps({"item_id": str(uuid.uuid4()), "price": 19.99})
-                
-                insert_query = f"""
-                INSERT INTO events (
-                    event_id, event_name, distinct_id, time, insert_time, 
-                    browser, browser_version, os, device, properties
-                ) VALUES (
-                    '{event_id}', 'add_to_cart', '{user_id}', '{event_time.isoformat()}', '{datetime.now().isoformat()}',
-                    'Chrome', '88.0', 'macOS', 'Desktop', '{properties}'
-                );
-                """
-                
-                try:
-                    db.execute_query(insert_query)
-                except Exception as e:
-                    logger.error(f"Error inserting add_to_cart event: {str(e)}")
-                
-                # Purchase
-                event_id = str(uuid.uuid4())
-                event_time = current_date + timedelta(hours=12, minutes=day % 60)
-                properties = json.dumps({"order_id": str(uuid.uuid4()), "total": 19.99})
-                
-                insert_query = f"""
-                INSERT INTO events (
-                    event_id, event_name, distinct_id, time, insert_time, 
-                    browser, browser_version, os, device, properties
-                ) VALUES (
-                    '{event_id}', 'purchase', '{user_id}', '{event_time.isoformat()}', '{datetime.now().isoformat()}',
-                    'Chrome', '88.0', 'macOS', 'Desktop', '{properties}'
-                );
-                """
-                
-                try:
-                    db.execute_query(insert_query)
-                except Exception as e:
-                    logger.error(f"Error inserting purchase event: {str(e)}")
+    try:
+        # Send all rows to the server in a single COPY
+        inserted = db.copy_records("events", rows, synchronous_commit=False)
+        logger.info(f"Inserted {inserted} test events")
+    except Exception as e:
+        # Fall back to multi-row INSERT ... VALUES statements, e.g. when
+        # triggers or rules on the table don't support COPY
+        logger.warning(f"COPY of test events failed, retrying with batched INSERTs: {str(e)}")
+        try:
+            columns = list(rows[0])
+            inserted = db.execute_many(
+                f"INSERT INTO events ({', '.join(columns)}) VALUES %s",
+                [tuple(row[column] for column in columns) for row in rows],
+                page_size=500
+            )
+            logger.info(f"Inserted {inserted} test events")
+        except Exception as e:
+            logger.error(f"Error inserting test events: {str(e)}")
     
     logger.info("Test data creation complete!")
 
@@ -38,6 +38,13 @@ def main():
     else:
         print("Anthropic API key found. AI Insights feature will be enabled.")
     
+    # Import the analytics stack before Streamlit starts. The dashboard script
+    # runs in this process, so its imports are then already loaded on the
+    # first page view instead of paying for them on that request.
+    import pandas
+    import plotly
+    import hitcraft_analytics.ui.dashboard.main_dashboard
+    
     # Launch Streamlit with our dashboard
     sys.argv = [
         "streamlit", "run", 
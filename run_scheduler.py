@@ -10,12 +10,18 @@ Usage:
 The scheduler will run continuously, executing tasks according to their defined schedules.
 """
 
+import asyncio
 import os
 import sys
 import logging
 import time
 from datetime import datetime, timedelta, time as dt_time
 
+try:
+    import uvloop
+except ImportError:  # uvloop is optional; the default asyncio loop is used instead
+    uvloop = None
+
 # Add the project path to system path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
@@ -47,7 +53,8 @@ from hitcraft_analytics.utils.logging_config import setup_logger
 # Set up logger
 logger = setup_logger("scheduler.runner")
 
-def next_execution_time(hour: int, minute: int, day_of_week: int = None) -> datetime:
+def next_execution_time(hour: int, minute: int, day_of_week: int = None,
+                        now: datetime = None) -> datetime:
     """
     Calculate the next execution time for a scheduled task.
     
@@ -55,11 +62,12 @@ def next_execution_time(hour: int, minute: int, day_of_week: int = None) -> date
         hour: Hour of day (0-23)
         minute: Minute (0-59)
         day_of_week: Day of week (0=Monday, 6=Sunday) or None for daily
+        now: Reference time to schedule from (defaults to the current time)
         
     Returns:
         datetime: Next execution time
     """
-    now = datetime.now()
+    now = now or datetime.now()
     target_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
     
     # If target time is in the past, move to next day
@@ -111,49 +119,49 @@ def setup_scheduler() -> TaskScheduler:
     scheduler.register_task(weekly_insights, dependencies=["daily_insights_generation"])
     scheduler.register_task(monthly_trends, dependencies=["trend_analysis"])
     
-    # Schedule initial execution times
+    # Schedule initial execution times from a single reference time
     now = datetime.now()
     
     # Schedule data collection tasks
     data_pull_time = DAILY_DATA_PULL_TIME
     scheduler.schedule_task(
         "mixpanel_data_pull", 
-        next_execution_time(data_pull_time.hour, data_pull_time.minute)
+        next_execution_time(data_pull_time.hour, data_pull_time.minute, now=now)
     )
     
     # Schedule user profile pull weekly
     scheduler.schedule_task(
         "mixpanel_user_profiles_pull", 
-        next_execution_time(data_pull_time.hour, data_pull_time.minute + 15)
+        next_execution_time(data_pull_time.hour, data_pull_time.minute + 15, now=now)
     )
     
     # Schedule analysis tasks
     analysis_time = DAILY_ANALYSIS_TIME
     scheduler.schedule_task(
         "trend_analysis", 
-        next_execution_time(analysis_time.hour, analysis_time.minute)
+        next_execution_time(analysis_time.hour, analysis_time.minute, now=now)
     )
     scheduler.schedule_task(
         "funnel_analysis", 
-        next_execution_time(analysis_time.hour, analysis_time.minute + 15)
+        next_execution_time(analysis_time.hour, analysis_time.minute + 15, now=now)
     )
     scheduler.schedule_task(
         "cohort_analysis", 
-        next_execution_time(analysis_time.hour, analysis_time.minute + 30)
+        next_execution_time(analysis_time.hour, analysis_time.minute + 30, now=now)
     )
     
     # Schedule insight generation tasks
     insights_time = INSIGHTS_GENERATION_TIME
     scheduler.schedule_task(
         "daily_insights_generation", 
-        next_execution_time(insights_time.hour, insights_time.minute)
+        next_execution_time(insights_time.hour, insights_time.minute, now=now)
     )
     
     # Schedule weekly insights for Monday mornings
     weekly_time = WEEKLY_REPORT_TIME
     scheduler.schedule_task(
         "weekly_insights_summary", 
-        next_execution_time(weekly_time.hour, weekly_time.minute, day_of_week=0)  # Monday
+        next_execution_time(weekly_time.hour, weekly_time.minute, day_of_week=0, now=now)  # Monday
     )
     
     # Schedule monthly trends for the 1st of each month
@@ -173,8 +181,10 @@ def main():
     scheduler = setup_scheduler()
     
     try:
-        # Run the scheduler
-        scheduler.start()
+        # Run the scheduler on an asyncio event loop (uvloop's when installed)
+        if uvloop is not None:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        asyncio.run(scheduler.run())
     except KeyboardInterrupt:
         print("\nStopping scheduler...")
         scheduler.stop()
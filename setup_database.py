@@ -5,13 +5,18 @@ Setup Database for HitCraft Analytics
 This script sets up the database tables and loads sample data for testing.
 """
 
+import csv
+import io
+import itertools
 import os
-import random
 import uuid
 import json
+import multiprocessing
+from collections import defaultdict
 from datetime import datetime, timedelta
+import numpy as np
 import psycopg2
-from psycopg2.extras import Json
+from psycopg2.extras import execute_values
 
 from hitcraft_analytics.config.db_config import (
     DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD
@@ -21,19 +26,478 @@ from hitcraft_analytics.utils.logging.logger import get_logger
 # Set up logger
 logger = get_logger("setup_database")
 
+# Sample user IDs
+SAMPLE_USER_IDS = [f"user_{i}" for i in range(1, 11)]
+
+# Project events, counted as feature usage
+PROJECT_EVENTS = ["create_new_project", "save_project", "share_project"]
+
+# Rows sent per COPY (or fallback INSERT batch), to cap client memory on large loads
+COPY_BATCH_SIZE = 10000
+
+# Columns loaded into each sample-data table, in row tuple order
+PROFILE_COLUMNS = (
+    "distinct_id", "first_seen", "last_seen", "session_count", "event_count",
+    "feature_count", "days_active", "retention_score", "satisfaction_score",
+    "churn_risk", "user_type", "experience_level", "properties"
+)
+SESSION_COLUMNS = (
+    "session_id", "distinct_id", "start_time", "end_time", "duration_seconds",
+    "event_count", "page_view_count", "feature_used_count", "production_count",
+    "browser", "os", "device_type", "properties"
+)
+SEQUENCE_COLUMNS = (
+    "sequence_id", "distinct_id", "funnel_name", "step_index", "step_name",
+    "event_name", "event_time", "previous_step_time", "is_completed",
+    "is_converted", "time_from_start_seconds"
+)
+
+# Secondary indexes per table, built once the table's sample data is loaded
+TABLE_INDEXES = {
+    "events": (
+        ("idx_events_event_id", "event_id"),
+        ("idx_events_event_name", "event_name"),
+        ("idx_events_distinct_id", "distinct_id"),
+        ("idx_events_time", "time"),
+        ("idx_events_time_event", "time, event_name"),
+        ("idx_events_user_time", "distinct_id, time"),
+        ("idx_events_event_user", "event_name, distinct_id"),
+    ),
+    "user_profiles": (
+        ("idx_user_profiles_distinct_id", "distinct_id"),
+    ),
+    "user_sessions": (
+        ("idx_user_sessions_session_id", "session_id"),
+        ("idx_user_sessions_distinct_id", "distinct_id"),
+        ("idx_session_user_time", "distinct_id, start_time"),
+    ),
+    "event_sequences": (
+        ("idx_event_sequences_sequence_id", "sequence_id"),
+        ("idx_event_sequences_distinct_id", "distinct_id"),
+        ("idx_sequence_funnel", "sequence_id, funnel_name"),
+        ("idx_sequence_user_funnel", "distinct_id, funnel_name"),
+    ),
+}
+
+
+def bulk_uuids(n):
+    """Generate n random (version 4) UUID strings from a single os.urandom call."""
+    raw = os.urandom(16 * n)
+    return [str(uuid.UUID(bytes=raw[i * 16:(i + 1) * 16], version=4)) for i in range(n)]
+
+
+def encode_row(row):
+    """Serialize the dict and list values of a row tuple as compact JSON strings."""
+    return tuple(
+        json.dumps(value, separators=(",", ":")) if isinstance(value, (dict, list)) else value
+        for value in row
+    )
+
+
+def copy_rows(cursor, table, columns, rows):
+    """Load row tuples (in column order) into a table with one COPY ... FROM STDIN."""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(encode_row(row) for row in rows)
+    buffer.seek(0)
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer
+    )
+
+
+def insert_rows(cursor, table, columns, rows):
+    """Insert row tuples (in column order) with multi-row INSERT ... VALUES statements."""
+    execute_values(
+        cursor,
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s",
+        [encode_row(row) for row in rows],
+        page_size=1000
+    )
+
+
+def load_rows(cursor, table, columns, rows):
+    """
+    Load row tuples into a table in batches of COPY_BATCH_SIZE.
+    
+    Batches are sent with COPY. If the server rejects COPY for the table
+    (for example because of a trigger or rule), the failed batch and all
+    later ones use batched INSERTs instead. Inside a transaction each COPY
+    runs under a savepoint, so a rejected batch does not abort the
+    surrounding transaction.
+    
+    Returns:
+        int: Number of rows loaded.
+    """
+    iterator = iter(rows)
+    use_copy = True
+    total = 0
+    
+    while True:
+        batch = list(itertools.islice(iterator, COPY_BATCH_SIZE))
+        if not batch:
+            return total
+        
+        if use_copy:
+            in_transaction = not cursor.connection.autocommit
+            if in_transaction:
+                cursor.execute("SAVEPOINT load_rows")
+            try:
+                copy_rows(cursor, table, columns, batch)
+                if in_transaction:
+                    cursor.execute("RELEASE SAVEPOINT load_rows")
+            except psycopg2.Error as e:
+                if in_transaction:
+                    cursor.execute("ROLLBACK TO SAVEPOINT load_rows")
+                logger.warning(f"COPY into {table} failed, using batched INSERTs: {str(e)}")
+                use_copy = False
+        
+        if not use_copy:
+            insert_rows(cursor, table, columns, batch)
+        
+        total += len(batch)
+
+
+def create_indexes(cursor, table):
+    """Create the secondary indexes listed in TABLE_INDEXES for a table."""
+    for index_name, columns in TABLE_INDEXES[table]:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table}({columns})")
+
+
+def load_profiles(cursor):
+    """Create one user profile per sample user from their loaded events."""
+    logger.info("Creating user profiles...")
+    
+    # Aggregate every sample user's events in a single scan
+    cursor.execute(
+        """
+        SELECT distinct_id, MIN(time), MAX(time), COUNT(*),
+               COUNT(*) FILTER (WHERE event_name = ANY(%s)),
+               COUNT(*) FILTER (WHERE event_name = 'app_open')
+        FROM events
+        WHERE distinct_id = ANY(%s)
+        GROUP BY distinct_id
+        """,
+        (PROJECT_EVENTS, SAMPLE_USER_IDS)
+    )
+    user_stats = {row[0]: row[1:] for row in cursor.fetchall()}
+    
+    # Draw the random profile metrics and properties for all users at once
+    rng = np.random.default_rng()
+    num_users = len(SAMPLE_USER_IDS)
+    days_active = rng.integers(1, 31, num_users).tolist()
+    retention_scores = rng.uniform(10.0, 100.0, num_users).tolist()
+    satisfaction_scores = rng.uniform(50.0, 100.0, num_users).tolist()
+    themes = rng.choice(["light", "dark", "auto"], num_users).tolist()
+    notifications = rng.choice([True, False], num_users).tolist()
+    languages = rng.choice(["en", "fr", "es", "de"], num_users).tolist()
+    user_types = rng.choice(["songwriter", "producer", "artist", "musician"], num_users).tolist()
+    experience_levels = rng.choice(["beginner", "intermediate", "professional"], num_users).tolist()
+    
+    # 1-3 distinct interests per user: the first k columns of a random permutation of each row
+    interest_pool = np.array(["music", "production", "songwriting", "beats", "vocals"])
+    interest_order = np.argsort(rng.random((num_users, len(interest_pool))), axis=1)
+    interest_counts = rng.integers(1, 4, num_users).tolist()
+    
+    profile_rows = []
+    for i, user_id in enumerate(SAMPLE_USER_IDS):
+        first_seen, last_seen, event_count, feature_count, session_count = user_stats.get(
+            user_id, (None, None, 0, 0, 0)
+        )
+        
+        retention_score = retention_scores[i]
+        churn_risk = 100.0 - retention_score
+        
+        # Profile properties
+        properties = {
+            "preferences": {
+                "theme": themes[i],
+                "notifications": notifications[i],
+                "language": languages[i]
+            },
+            "interests": interest_pool[interest_order[i, :interest_counts[i]]].tolist()
+        }
+        
+        profile_rows.append((
+            user_id, first_seen, last_seen, session_count, event_count,
+            feature_count, days_active[i], retention_score, satisfaction_scores[i],
+            churn_risk, user_types[i], experience_levels[i], properties
+        ))
+    
+    load_rows(cursor, "user_profiles", PROFILE_COLUMNS, profile_rows)
+    create_indexes(cursor, "user_profiles")
+
+
+def load_sessions(cursor):
+    """Create a user session for every app_open event."""
+    logger.info("Creating user sessions...")
+    # Build every session and its event counts in one query. A session runs
+    # from an app_open to the user's next app_open (LEAD); a user's last
+    # session lasts a random 10-60 minutes. Counts cover [start, end).
+    cursor.execute(
+        """
+        WITH sessions AS (
+            SELECT distinct_id, time AS start_time, properties,
+                   COALESCE(
+                       LEAD(time) OVER (PARTITION BY distinct_id ORDER BY time),
+                       time + make_interval(mins => 10 + floor(random() * 51)::int)
+                   ) AS end_time
+            FROM events
+            WHERE event_name = 'app_open'
+        )
+        SELECT s.distinct_id, s.start_time, s.end_time, s.properties,
+               c.event_count, c.page_view_count, c.feature_used_count, c.production_count
+        FROM sessions s
+        CROSS JOIN LATERAL (
+            SELECT COUNT(*) AS event_count,
+                   COUNT(*) FILTER (WHERE e.event_name = 'view_content') AS page_view_count,
+                   COUNT(*) FILTER (WHERE e.event_name = ANY(%s)) AS feature_used_count,
+                   COUNT(*) FILTER (WHERE e.event_name = 'create_new_project') AS production_count
+            FROM events e
+            WHERE e.distinct_id = s.distinct_id
+            AND e.time >= s.start_time AND e.time < s.end_time
+        ) c
+        ORDER BY s.distinct_id, s.start_time
+        """,
+        (PROJECT_EVENTS,)
+    )
+    sessions = cursor.fetchall()
+    
+    # Draw the random session attributes for all sessions at once
+    rng = np.random.default_rng()
+    num_sessions = len(sessions)
+    screen_sizes = [
+        f"{width}x{height}"
+        for width, height in zip(rng.choice([1080, 1440, 1920], num_sessions).tolist(),
+                                 rng.choice([720, 900, 1080], num_sessions).tolist())
+    ]
+    connections = rng.choice(["wifi", "cellular", "ethernet"], num_sessions).tolist()
+    exit_pages = rng.choice(["home", "profile", "content", "checkout"], num_sessions).tolist()
+    
+    session_rows = []
+    for i, (user_id, start_time, end_time, properties, *event_counts) in enumerate(sessions):
+        # Session ID from properties or generate a new one
+        session_id = properties.get("session_id", str(uuid.uuid4())) if properties else str(uuid.uuid4())
+        
+        # Calculate duration
+        duration = int((end_time - start_time).total_seconds())
+        
+        # Session properties
+        session_properties = {
+            "device_info": {
+                "screen_size": screen_sizes[i],
+                "connection": connections[i]
+            },
+            "exit_page": exit_pages[i]
+        }
+        
+        session_rows.append((
+            session_id, user_id, start_time, end_time, duration,
+            *event_counts,
+            "Chrome", "macOS", "Desktop", session_properties
+        ))
+    
+    load_rows(cursor, "user_sessions", SESSION_COLUMNS, session_rows)
+    create_indexes(cursor, "user_sessions")
+
+
+def load_sequences(cursor):
+    """Create purchase and project funnel sequences from the loaded events."""
+    logger.info("Creating funnel sequences...")
+    purchase_funnel = ["app_open", "view_content", "add_to_cart", "purchase"]
+    project_funnel = ["app_open", "create_new_project", "save_project", "share_project"]
+    
+    # Process purchase funnel
+    cursor.execute(
+        """
+        SELECT DISTINCT distinct_id FROM events 
+        WHERE event_name = 'app_open'
+        """
+    )
+    users = [row[0] for row in cursor.fetchall()]
+    
+    # First occurrence of each funnel step per user, one query per funnel
+    first_step_times = {}
+    for funnel_name, funnel_steps in (("purchase_funnel", purchase_funnel), ("project_funnel", project_funnel)):
+        cursor.execute(
+            """
+            SELECT distinct_id, event_name, MIN(time)
+            FROM events
+            WHERE event_name = ANY(%s)
+            GROUP BY distinct_id, event_name
+            """,
+            (funnel_steps,)
+        )
+        step_times = defaultdict(dict)
+        for distinct_id, event_name, first_time in cursor.fetchall():
+            step_times[distinct_id][event_name] = first_time
+        first_step_times[funnel_name] = step_times
+    
+    sequence_rows = []
+    
+    # One purchase and one project sequence ID per user
+    sequence_ids = iter(bulk_uuids(2 * len(users)))
+    for user_id in users:
+        # Create a purchase funnel sequence
+        sequence_id = next(sequence_ids)
+        funnel_name = "purchase_funnel"
+        
+        # First time the user reached each step of this funnel
+        event_dict = first_step_times[funnel_name].get(user_id)
+        
+        # Skip if no events
+        if not event_dict:
+            continue
+        
+        # Check if user completed at least some steps
+        steps_completed = [step for step in purchase_funnel if step in event_dict]
+        if len(steps_completed) <= 1:
+            continue
+        
+        # Create sequence with the steps the user actually completed
+        prev_time = None
+        is_converted = "purchase" in event_dict
+        
+        for i, step_name in enumerate(purchase_funnel):
+            if step_name not in event_dict:
+                # User didn't complete this step
+                continue
+            
+            event_time = event_dict[step_name]
+            
+            # Calculate time metrics
+            time_from_start = None
+            if i > 0 and prev_time:
+                time_from_start = int((event_time - prev_time).total_seconds())
+            
+            sequence_rows.append((
+                sequence_id, user_id, funnel_name, i, step_name,
+                step_name, event_time, prev_time, True,
+                is_converted, time_from_start
+            ))
+            
+            prev_time = event_time
+        
+        # Process project funnel similarly
+        sequence_id = next(sequence_ids)
+        funnel_name = "project_funnel"
+        
+        # First time the user reached each step of this funnel
+        event_dict = first_step_times[funnel_name].get(user_id)
+        
+        # Skip if no events
+        if not event_dict:
+            continue
+        
+        # Check if user completed at least some steps
+        steps_completed = [step for step in project_funnel if step in event_dict]
+        if len(steps_completed) <= 1:
+            continue
+        
+        # Create sequence with the steps the user actually completed
+        prev_time = None
+        is_converted = "share_project" in event_dict
+        
+        for i, step_name in enumerate(project_funnel):
+            if step_name not in event_dict:
+                # User didn't complete this step
+                continue
+            
+            event_time = event_dict[step_name]
+            
+            # Calculate time metrics
+            time_from_start = None
+            if i > 0 and prev_time:
+                time_from_start = int((event_time - prev_time).total_seconds())
+            
+            sequence_rows.append((
+                sequence_id, user_id, funnel_name, i, step_name,
+                step_name, event_time, prev_time, True,
+                is_converted, time_from_start
+            ))
+            
+            prev_time = event_time
+    
+    load_rows(cursor, "event_sequences", SEQUENCE_COLUMNS, sequence_rows)
+    create_indexes(cursor, "event_sequences")
+
+
+# Tables derived from the loaded events, each filled by its own worker process
+DERIVED_TABLE_LOADERS = {
+    "user_profiles": load_profiles,
+    "user_sessions": load_sessions,
+    "event_sequences": load_sequences,
+}
+
+
+def connect():
+    """Open a new connection to the analytics database."""
+    return psycopg2.connect(
+        host=DB_HOST,
+        port=DB_PORT,
+        dbname=DB_NAME,
+        user=DB_USER,
+        password=DB_PASSWORD
+    )
+
+
+def start_load_transaction(cursor):
+    """
+    Configure the current transaction for bulk loading.
+    
+    The sample data is reproducible, so commits do not wait for a WAL flush,
+    and index builds get extra memory.
+    """
+    cursor.execute("SET LOCAL synchronous_commit = off")
+    cursor.execute("SET LOCAL maintenance_work_mem = '512MB'")
+
+
+def load_derived_table(table):
+    """
+    Fill one derived table in a worker process, over its own connection.
+    
+    The table is switched to LOGGED in the same transaction as its load, so
+    it is crash-safe as soon as its rows are committed.
+    
+    Args:
+        table: Name of the table, a key of DERIVED_TABLE_LOADERS.
+    """
+    conn = connect()
+    try:
+        cursor = conn.cursor()
+        start_load_transaction(cursor)
+        DERIVED_TABLE_LOADERS[table](cursor)
+        cursor.execute(f"ALTER TABLE {table} SET LOGGED")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def set_tables_logged(conn):
+    """
+    Switch every table to LOGGED, one autocommitted statement per table.
+    
+    A failed load, in this run or an earlier one, can leave tables UNLOGGED,
+    and PostgreSQL truncates those after a crash. SET LOGGED is a no-op on a
+    table that is already logged.
+    
+    Args:
+        conn: Open connection with no transaction in progress.
+    """
+    conn.autocommit = True
+    cursor = conn.cursor()
+    for table in TABLE_INDEXES:
+        try:
+            cursor.execute(f"ALTER TABLE {table} SET LOGGED")
+        except Exception as e:
+            logger.error(f"Failed to set table {table} LOGGED: {str(e)}")
+
+
 def setup_database():
     """Set up the database tables and load sample data."""
     logger.info("Setting up database...")
     
     # Connect to PostgreSQL
     try:
-        conn = psycopg2.connect(
-            host=DB_HOST,
-            port=DB_PORT,
-            dbname=DB_NAME,
-            user=DB_USER,
-            password=DB_PASSWORD
-        )
+        conn = connect()
         conn.autocommit = True
         cursor = conn.cursor()
         logger.info("Connected to database")
@@ -41,11 +505,13 @@ def setup_database():
         logger.error(f"Failed to connect to database: {str(e)}")
         return
     
-    # Create tables
+    # Create tables. New tables start out UNLOGGED so the sample-data load
+    # skips the WAL; each is switched to LOGGED when its load commits, and
+    # set_tables_logged runs after the load whether or not it succeeded.
     try:
         # Events table
         cursor.execute("""
-        CREATE TABLE IF NOT EXISTS events (
+        CREATE UNLOGGED TABLE IF NOT EXISTS events (
             id SERIAL PRIMARY KEY,
             event_id VARCHAR(64) NOT NULL,
             event_name VARCHAR(256) NOT NULL,
@@ -66,18 +532,9 @@ def setup_database():
         )
         """)
         
-        # Create indexes for events table
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_event_id ON events(event_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_event_name ON events(event_name)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_distinct_id ON events(distinct_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_time ON events(time)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_time_event ON events(time, event_name)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_user_time ON events(distinct_id, time)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_event_user ON events(event_name, distinct_id)")
-        
         # User profiles table
         cursor.execute("""
-        CREATE TABLE IF NOT EXISTS user_profiles (
+        CREATE UNLOGGED TABLE IF NOT EXISTS user_profiles (
             id SERIAL PRIMARY KEY,
             distinct_id VARCHAR(256) NOT NULL UNIQUE,
             email VARCHAR(256),
@@ -105,11 +562,9 @@ def setup_database():
         )
         """)
         
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_profiles_distinct_id ON user_profiles(distinct_id)")
-        
         # User sessions table
         cursor.execute("""
-        CREATE TABLE IF NOT EXISTS user_sessions (
+        CREATE UNLOGGED TABLE IF NOT EXISTS user_sessions (
             id SERIAL PRIMARY KEY,
             session_id VARCHAR(64) NOT NULL UNIQUE,
             distinct_id VARCHAR(256) NOT NULL,
@@ -131,13 +586,9 @@ def setup_database():
         )
         """)
         
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_sessions_session_id ON user_sessions(session_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_sessions_distinct_id ON user_sessions(distinct_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_session_user_time ON user_sessions(distinct_id, start_time)")
-        
         # Event sequences table
         cursor.execute("""
-        CREATE TABLE IF NOT EXISTS event_sequences (
+        CREATE UNLOGGED TABLE IF NOT EXISTS event_sequences (
             id SERIAL PRIMARY KEY,
             sequence_id VARCHAR(64) NOT NULL,
             distinct_id VARCHAR(256) NOT NULL,
@@ -156,21 +607,19 @@ def setup_database():
         )
         """)
         
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_event_sequences_sequence_id ON event_sequences(sequence_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_event_sequences_distinct_id ON event_sequences(distinct_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_sequence_funnel ON event_sequences(sequence_id, funnel_name)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_sequence_user_funnel ON event_sequences(distinct_id, funnel_name)")
-        
         logger.info("Tables created successfully")
     except Exception as e:
         logger.error(f"Error creating tables: {str(e)}")
         conn.close()
         return
     
-    # Generate sample data
+    # Generate sample data. Events are loaded and committed first; the
+    # derived tables are then filled in parallel, one worker process and
+    # connection per table. Each table's indexes are built in one pass after
+    # its rows are loaded, rather than being updated row by row.
+    conn.autocommit = False
     try:
-        # Sample user IDs
-        user_ids = [f"user_{i}" for i in range(1, 11)]
+        start_load_transaction(cursor)
         
         # Sample event types
         event_types = [
@@ -187,381 +636,102 @@ def setup_database():
         logger.info("Generating sample events...")
         end_date = datetime.now()
         start_date = end_date - timedelta(days=30)
-        current_date = start_date
-        
-        while current_date <= end_date:
-            # For each day
-            for user_id in user_ids:
-                # Each user does 3-7 events per day
-                num_events = random.randint(3, 7)
-                
-                # Always start with app_open
-                event_id = str(uuid.uuid4())
-                event_time = datetime.combine(
-                    current_date.date(),
-                    datetime.min.time()
-                ) + timedelta(hours=random.randint(8, 20), minutes=random.randint(0, 59))
-                
-                properties = {
-                    "session_id": str(uuid.uuid4()),
-                    "version": "1.0.0",
-                    "platform": random.choice(["web", "ios", "android"])
-                }
-                
-                cursor.execute(
-                    """
-                    INSERT INTO events (
-                        event_id, event_name, distinct_id, time, insert_time,
-                        browser, browser_version, os, device, properties
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """,
-                    (
-                        event_id, "app_open", user_id, event_time, datetime.now(),
-                        "Chrome", "88.0", "macOS", "Desktop", Json(properties)
-                    )
-                )
-                
-                # Additional events
-                last_time = event_time
-                for _ in range(1, num_events):
-                    event_id = str(uuid.uuid4())
-                    last_time = last_time + timedelta(minutes=random.randint(5, 30))
-                    event_name = random.choice(event_types[1:])  # Skip app_open
-                    
-                    # Create appropriate properties based on event type
-                    if event_name == "view_content":
-                        properties = {
-                            "content_id": str(uuid.uuid4()),
-                            "category": random.choice(["music", "lyrics", "chord", "beat"]),
-                            "duration": random.randint(10, 300)
-                        }
-                    elif event_name == "add_to_cart":
-                        properties = {
-                            "item_id": str(uuid.uuid4()),
-                            "item_name": f"Product {random.randint(1, 100)}",
-                            "price": round(random.uniform(4.99, 99.99), 2)
-                        }
-                    elif event_name == "purchase":
-                        properties = {
-                            "order_id": str(uuid.uuid4()),
-                            "total": round(random.uniform(9.99, 199.99), 2),
-                            "items": random.randint(1, 5)
-                        }
-                    elif "project" in event_name:
-                        properties = {
-                            "project_id": str(uuid.uuid4()),
-                            "project_type": random.choice(["song", "lyrics", "chord", "beat"]),
-                            "duration": random.randint(60, 240)
-                        }
-                    else:
-                        properties = {"generic": "property"}
-                    
-                    cursor.execute(
-                        """
-                        INSERT INTO events (
-                            event_id, event_name, distinct_id, time, insert_time,
-                            browser, browser_version, os, device, properties
-                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        """,
-                        (
-                            event_id, event_name, user_id, last_time, datetime.now(),
-                            "Chrome", "88.0", "macOS", "Desktop", Json(properties)
-                        )
-                    )
-            
-            # Move to next day
-            current_date += timedelta(days=1)
-        
-        # Create user profiles based on events
-        logger.info("Creating user profiles...")
-        for user_id in user_ids:
-            # Get user's first and last seen times
-            cursor.execute(
-                """
-                SELECT MIN(time), MAX(time), COUNT(*) 
-                FROM events 
-                WHERE distinct_id = %s
-                """, 
-                (user_id,)
-            )
-            first_seen, last_seen, event_count = cursor.fetchone()
-            
-            # Calculate feature counts
-            cursor.execute(
-                """
-                SELECT COUNT(*) FROM events 
-                WHERE distinct_id = %s AND event_name LIKE %s
-                """, 
-                (user_id, '%project%')
-            )
-            feature_count = cursor.fetchone()[0]
-            
-            # Calculate session count (app opens)
-            cursor.execute(
-                """
-                SELECT COUNT(*) FROM events 
-                WHERE distinct_id = %s AND event_name = %s
-                """, 
-                (user_id, 'app_open')
-            )
-            session_count = cursor.fetchone()[0]
-            
-            # Random metrics for demonstration
-            days_active = random.randint(1, 30)
-            retention_score = random.uniform(10.0, 100.0)
-            satisfaction_score = random.uniform(50.0, 100.0)
-            churn_risk = 100.0 - retention_score
-            
-            # Profile properties
-            properties = {
-                "preferences": {
-                    "theme": random.choice(["light", "dark", "auto"]),
-                    "notifications": random.choice([True, False]),
-                    "language": random.choice(["en", "fr", "es", "de"])
-                },
-                "interests": random.sample(["music", "production", "songwriting", "beats", "vocals"], 
-                                          random.randint(1, 3))
-            }
-            
-            # Insert user profile
-            cursor.execute(
-                """
-                INSERT INTO user_profiles (
-                    distinct_id, first_seen, last_seen, session_count, event_count,
-                    feature_count, days_active, retention_score, satisfaction_score,
-                    churn_risk, user_type, experience_level, properties
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                (
-                    user_id, first_seen, last_seen, session_count, event_count,
-                    feature_count, days_active, retention_score, satisfaction_score,
-                    churn_risk, 
-                    random.choice(["songwriter", "producer", "artist", "musician"]),
-                    random.choice(["beginner", "intermediate", "professional"]),
-                    Json(properties)
-                )
-            )
         
-        # Create sessions based on app_open events
-        logger.info("Creating user sessions...")
+        # Generate every event on the server in one statement. Each user has
+        # 3-7 events per day: an app_open at a random time between 08:00 and
+        # 20:59, then other events 5-30 minutes apart. insert_time takes its
+        # CURRENT_TIMESTAMP default.
         cursor.execute(
             """
-            SELECT distinct_id, time, properties 
-            FROM events 
-            WHERE event_name = 'app_open' 
-            ORDER BY distinct_id, time
-            """
-        )
-        app_opens = cursor.fetchall()
-        
-        for i, (user_id, start_time, properties) in enumerate(app_opens):
-            # Session ID from properties or generate a new one
-            session_id = properties.get("session_id", str(uuid.uuid4())) if properties else str(uuid.uuid4())
-            
-            # Find next app_open for this user to determine session end
-            if i < len(app_opens) - 1 and app_opens[i+1][0] == user_id:
-                end_time = app_opens[i+1][1]
-            else:
-                # Last session or last for this user, estimate end time
-                end_time = start_time + timedelta(minutes=random.randint(10, 60))
-            
-            # Calculate duration
-            duration = int((end_time - start_time).total_seconds())
-            
-            # Count events in this session
-            cursor.execute(
-                """
-                SELECT COUNT(*), 
-                       SUM(CASE WHEN event_name = 'view_content' THEN 1 ELSE 0 END),
-                       SUM(CASE WHEN event_name LIKE '%project%' THEN 1 ELSE 0 END),
-                       SUM(CASE WHEN event_name = 'create_new_project' THEN 1 ELSE 0 END)
-                FROM events 
-                WHERE distinct_id = %s AND time BETWEEN %s AND %s
-                """,
-                (user_id, start_time, end_time)
-            )
-            event_count, page_view_count, feature_used_count, production_count = cursor.fetchone()
-            
-            # Set nulls to 0
-            page_view_count = page_view_count or 0
-            feature_used_count = feature_used_count or 0
-            production_count = production_count or 0
-            
-            # Session properties
-            session_properties = {
-                "device_info": {
-                    "screen_size": f"{random.choice([1080, 1440, 1920])}x{random.choice([720, 900, 1080])}",
-                    "connection": random.choice(["wifi", "cellular", "ethernet"])
-                },
-                "exit_page": random.choice(["home", "profile", "content", "checkout"])
-            }
-            
-            # Insert session
-            cursor.execute(
-                """
-                INSERT INTO user_sessions (
-                    session_id, distinct_id, start_time, end_time, duration_seconds,
-                    event_count, page_view_count, feature_used_count, production_count,
-                    browser, os, device_type, properties
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                (
-                    session_id, user_id, start_time, end_time, duration,
-                    event_count, page_view_count, feature_used_count, production_count,
-                    "Chrome", "macOS", "Desktop", Json(session_properties)
-                )
+            INSERT INTO events (
+                event_id, event_name, distinct_id, time,
+                browser, browser_version, os, device, properties
             )
-        
-        # Create sample funnel sequences
-        logger.info("Creating funnel sequences...")
-        purchase_funnel = ["app_open", "view_content", "add_to_cart", "purchase"]
-        project_funnel = ["app_open", "create_new_project", "save_project", "share_project"]
-        
-        # Process purchase funnel
-        cursor.execute(
-            """
-            SELECT DISTINCT distinct_id FROM events 
-            WHERE event_name = 'app_open'
-            """
-        )
-        users = [row[0] for row in cursor.fetchall()]
-        
-        for user_id in users:
-            # Create a purchase funnel sequence
-            sequence_id = str(uuid.uuid4())
-            funnel_name = "purchase_funnel"
-            
-            # Get user's relevant events
-            cursor.execute(
-                """
-                SELECT event_name, time 
-                FROM events 
-                WHERE distinct_id = %s 
-                AND event_name IN %s
-                ORDER BY time
-                """,
-                (user_id, tuple(purchase_funnel))
+            WITH user_days AS (
+                SELECT
+                    d::date AS day,
+                    u AS distinct_id,
+                    3 + floor(random() * 5)::int AS num_events,
+                    d::date + make_interval(
+                        hours => 8 + floor(random() * 13)::int,
+                        mins => floor(random() * 60)::int
+                    ) AS first_time
+                FROM generate_series(%(start_date)s::date, %(end_date)s::date, interval '1 day') AS d,
+                     unnest(%(user_ids)s::text[]) AS u
+            ),
+            steps AS (
+                SELECT
+                    ud.day,
+                    ud.distinct_id,
+                    ud.first_time,
+                    n,
+                    CASE WHEN n = 1 THEN 'app_open'
+                         ELSE (%(other_events)s::text[])[1 + floor(random() * %(other_event_count)s)::int]
+                    END AS event_name,
+                    CASE WHEN n = 1 THEN 0 ELSE 5 + floor(random() * 26)::int END AS gap_minutes
+                FROM user_days ud, generate_series(1, ud.num_events) AS n
+            ),
+            timed AS (
+                SELECT
+                    distinct_id,
+                    event_name,
+                    first_time + make_interval(
+                        mins => (SUM(gap_minutes) OVER (PARTITION BY distinct_id, day ORDER BY n))::int
+                    ) AS time
+                FROM steps
             )
-            user_events = cursor.fetchall()
-            
-            # Skip if no events
-            if not user_events:
-                continue
-            
-            # Find sequences in user events
-            event_dict = {}
-            for event_name, event_time in user_events:
-                if event_name not in event_dict:
-                    event_dict[event_name] = []
-                event_dict[event_name].append(event_time)
-            
-            # Check if user completed at least some steps
-            steps_completed = [step for step in purchase_funnel if step in event_dict]
-            if len(steps_completed) <= 1:
-                continue
-            
-            # Create sequence with the steps the user actually completed
-            prev_time = None
-            is_converted = "purchase" in event_dict
-            
-            for i, step_name in enumerate(purchase_funnel):
-                if step_name not in event_dict:
-                    # User didn't complete this step
-                    continue
-                
-                # Use the first occurrence of this event
-                event_time = event_dict[step_name][0]
-                
-                # Calculate time metrics
-                time_from_start = None
-                if i > 0 and prev_time:
-                    time_from_start = int((event_time - prev_time).total_seconds())
-                
-                # Insert sequence step
-                cursor.execute(
-                    """
-                    INSERT INTO event_sequences (
-                        sequence_id, distinct_id, funnel_name, step_index, step_name,
-                        event_name, event_time, previous_step_time, is_completed,
-                        is_converted, time_from_start_seconds
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """,
-                    (
-                        sequence_id, user_id, funnel_name, i, step_name,
-                        step_name, event_time, prev_time, True,
-                        is_converted, time_from_start
+            SELECT
+                md5(random()::text || clock_timestamp()::text)::uuid::text,
+                event_name,
+                distinct_id,
+                time,
+                'Chrome', '88.0', 'macOS', 'Desktop',
+                CASE
+                    WHEN event_name = 'app_open' THEN jsonb_build_object(
+                        'session_id', md5(random()::text || clock_timestamp()::text)::uuid::text,
+                        'version', '1.0.0',
+                        'platform', (ARRAY['web', 'ios', 'android'])[1 + floor(random() * 3)::int]
                     )
-                )
-                
-                prev_time = event_time
-            
-            # Process project funnel similarly
-            sequence_id = str(uuid.uuid4())
-            funnel_name = "project_funnel"
-            
-            # Get user's relevant events
-            cursor.execute(
-                """
-                SELECT event_name, time 
-                FROM events 
-                WHERE distinct_id = %s 
-                AND event_name IN %s
-                ORDER BY time
-                """,
-                (user_id, tuple(project_funnel))
-            )
-            user_events = cursor.fetchall()
-            
-            # Skip if no events
-            if not user_events:
-                continue
-            
-            # Find sequences in user events
-            event_dict = {}
-            for event_name, event_time in user_events:
-                if event_name not in event_dict:
-                    event_dict[event_name] = []
-                event_dict[event_name].append(event_time)
-            
-            # Check if user completed at least some steps
-            steps_completed = [step for step in project_funnel if step in event_dict]
-            if len(steps_completed) <= 1:
-                continue
-            
-            # Create sequence with the steps the user actually completed
-            prev_time = None
-            is_converted = "share_project" in event_dict
-            
-            for i, step_name in enumerate(project_funnel):
-                if step_name not in event_dict:
-                    # User didn't complete this step
-                    continue
-                
-                # Use the first occurrence of this event
-                event_time = event_dict[step_name][0]
-                
-                # Calculate time metrics
-                time_from_start = None
-                if i > 0 and prev_time:
-                    time_from_start = int((event_time - prev_time).total_seconds())
-                
-                # Insert sequence step
-                cursor.execute(
-                    """
-                    INSERT INTO event_sequences (
-                        sequence_id, distinct_id, funnel_name, step_index, step_name,
-                        event_name, event_time, previous_step_time, is_completed,
-                        is_converted, time_from_start_seconds
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """,
-                    (
-                        sequence_id, user_id, funnel_name, i, step_name,
-                        step_name, event_time, prev_time, True,
-                        is_converted, time_from_start
+                    WHEN event_name = 'view_content' THEN jsonb_build_object(
+                        'content_id', md5(random()::text || clock_timestamp()::text)::uuid::text,
+                        'category', (ARRAY['music', 'lyrics', 'chord', 'beat'])[1 + floor(random() * 4)::int],
+                        'duration', 10 + floor(random() * 291)::int
+                    )
+                    WHEN event_name = 'add_to_cart' THEN jsonb_build_object(
+                        'item_id', md5(random()::text || clock_timestamp()::text)::uuid::text,
+                        'item_name', 'Product ' || (1 + floor(random() * 100)::int),
+                        'price', round((4.99 + random() * 95)::numeric, 2)
+                    )
+                    WHEN event_name = 'purchase' THEN jsonb_build_object(
+                        'order_id', md5(random()::text || clock_timestamp()::text)::uuid::text,
+                        'total', round((9.99 + random() * 190)::numeric, 2),
+                        'items', 1 + floor(random() * 5)::int
                     )
-                )
-                
-                prev_time = event_time
+                    WHEN event_name = ANY(%(project_events)s) THEN jsonb_build_object(
+                        'project_id', md5(random()::text || clock_timestamp()::text)::uuid::text,
+                        'project_type', (ARRAY['song', 'lyrics', 'chord', 'beat'])[1 + floor(random() * 4)::int],
+                        'duration', 60 + floor(random() * 181)::int
+                    )
+                    ELSE jsonb_build_object('generic', 'property')
+                END
+            FROM timed
+            """,
+            {
+                "start_date": start_date.date(),
+                "end_date": end_date.date(),
+                "user_ids": SAMPLE_USER_IDS,
+                "other_events": event_types[1:],  # Skip app_open
+                "other_event_count": len(event_types) - 1,
+                "project_events": PROJECT_EVENTS
+            }
+        )
+        logger.info(f"Generated {cursor.rowcount} sample events")
+        create_indexes(cursor, "events")
+        cursor.execute("ALTER TABLE events SET LOGGED")
+        conn.commit()
+        
+        with multiprocessing.get_context("spawn").Pool(len(DERIVED_TABLE_LOADERS)) as pool:
+            pool.map(load_derived_table, DERIVED_TABLE_LOADERS)
         
         # Get counts of data loaded
         cursor.execute("SELECT COUNT(*) FROM events")
@@ -576,10 +746,15 @@ def setup_database():
         cursor.execute("SELECT COUNT(*) FROM event_sequences")
         sequence_count = cursor.fetchone()[0]
         
+        conn.commit()
         logger.info(f"Sample data loaded: {event_count} events, {profile_count} profiles, {session_count} sessions, {sequence_count} funnel steps")
         
     except Exception as e:
+        conn.rollback()
         logger.error(f"Error loading sample data: {str(e)}")
+    finally:
+        # Always leave the tables crash-safe, even when a load failed
+        set_tables_logged(conn)
     
     # Close the connection
     conn.close()
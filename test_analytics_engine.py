@@ -6,10 +6,14 @@ including Mixpanel data fetching, funnel analysis, and insights generation.
 """
 
 import os
+import io
 import sys
 import json
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
 # Add the project path to system path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -32,6 +36,97 @@ BLUE = "\033[94m"
 RESET = "\033[0m"
 BOLD = "\033[1m"
 
+# Event properties masked before a sample event is printed
+SENSITIVE_KEYS = frozenset({"distinct_id", "$email", "email", "name", "user_id"})
+
+class CachedMixpanelConnector(MixpanelConnector):
+    """
+    Mixpanel connector that fetches each distinct event query only once.
+    
+    The cache holds one Future per query, so concurrent callers asking for
+    the same query wait on the fetch already in flight instead of repeating it.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._events_cache = {}
+        self._events_cache_lock = threading.Lock()
+    
+    def get_events(self,
+                  event_names: Optional[List[str]] = None,
+                  from_date: Optional[str] = None,
+                  to_date: Optional[str] = None,
+                  properties: Optional[List[str]] = None,
+                  where: Optional[str] = None) -> List[Dict]:
+        """Get event data, reusing the result of an identical earlier call."""
+        key = (
+            tuple(event_names) if event_names is not None else None,
+            from_date,
+            to_date,
+            tuple(properties) if properties is not None else None,
+            where
+        )
+        with self._events_cache_lock:
+            future = self._events_cache.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._events_cache[key] = future
+        
+        if is_owner:
+            try:
+                future.set_result(super().get_events(
+                    event_names=event_names,
+                    from_date=from_date,
+                    to_date=to_date,
+                    properties=properties,
+                    where=where
+                ))
+            except Exception as e:
+                # Let later calls retry a failed query; current waiters see the error
+                with self._events_cache_lock:
+                    del self._events_cache[key]
+                future.set_exception(e)
+        
+        return list(future.result())
+
+@functools.lru_cache(maxsize=None)
+def get_mixpanel_connector() -> CachedMixpanelConnector:
+    """Get the connector shared by every test in this run."""
+    return CachedMixpanelConnector()
+
+# Per-thread capture buffers for test output
+_output = threading.local()
+
+class ThreadLocalStdout:
+    """Stdout proxy that sends each thread's writes to its capture buffer, if it has one."""
+    
+    def __init__(self, stream):
+        self._stream = stream
+    
+    def write(self, text):
+        return getattr(_output, "buffer", self._stream).write(text)
+    
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+def run_captured(test, *args):
+    """
+    Run a test function with its printed output buffered.
+    
+    Args:
+        test: Test function to run
+        *args: Arguments passed to the test
+        
+    Returns:
+        Tuple of the test's return value and the text it printed
+    """
+    _output.buffer = io.StringIO()
+    try:
+        return test(*args), _output.buffer.getvalue()
+    finally:
+        del _output.buffer
+
 def print_header(title):
     """Print a section header."""
     print(f"\n{BOLD}{BLUE}{'=' * 80}{RESET}")
@@ -58,8 +153,8 @@ def test_mixpanel_connection():
     print_header("Testing Mixpanel Connection")
     
     try:
-        # Initialize Mixpanel connector
-        connector = MixpanelConnector()
+        # Get the shared Mixpanel connector
+        connector = get_mixpanel_connector()
         
         # Get events from the last 30 days
         from_date = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
@@ -78,12 +173,14 @@ def test_mixpanel_connection():
         
         # If we have events, show a sample
         if events:
-            sample_event = events[0]
-            # Mask potential sensitive data
+            sample_event = dict(events[0])
+            # Mask potential sensitive data in a copy, leaving the fetched
+            # (and cached) event untouched
             if "properties" in sample_event:
-                for key in ["distinct_id", "$email", "email", "name", "user_id"]:
-                    if key in sample_event["properties"]:
-                        sample_event["properties"][key] = f"[MASKED {key}]"
+                properties = dict(sample_event["properties"])
+                for key in SENSITIVE_KEYS.intersection(properties):
+                    properties[key] = f"[MASKED {key}]"
+                sample_event["properties"] = properties
             
             details["sample_event"] = sample_event
         
@@ -186,8 +283,8 @@ def test_events_repository():
     print_header("Testing Events Repository")
     
     try:
-        # Initialize repository
-        repo = EventsRepository()
+        # Initialize repository on the shared connector
+        repo = EventsRepository(mixpanel_connector=get_mixpanel_connector())
         
         # Fetch events from the last 7 days
         from_date = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
@@ -225,8 +322,10 @@ def test_insights_engine():
     print_header("Testing Insights Engine")
     
     try:
-        # Initialize insights engine
-        engine = InsightsEngine()
+        # Initialize insights engine on the shared connector
+        engine = InsightsEngine(
+            events_repository=EventsRepository(mixpanel_connector=get_mixpanel_connector())
+        )
         
         # Generate insights for the last 30 days
         from_date = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
@@ -263,28 +362,41 @@ def main():
     print(f"\n{BOLD}{YELLOW}HitCraft AI Analytics Engine - Integration Test{RESET}\n")
     print(f"Starting tests at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
     
-    # Store test results
-    results = {}
-    
-    # Test Mixpanel connection
-    mixpanel_success, events = test_mixpanel_connection()
-    results["Mixpanel Connection"] = mixpanel_success
-    
-    # Test data transformation
-    transform_success, events_df = test_data_transformation(events)
-    results["Data Transformation"] = transform_success
+    # Mixpanel fetch -> transformation -> funnel analysis depend on each
+    # other; the repository and insights tests are independent of them
+    def run_events_pipeline():
+        (mixpanel_success, events), mixpanel_output = run_captured(test_mixpanel_connection)
+        (transform_success, events_df), transform_output = run_captured(test_data_transformation, events)
+        (funnel_success, _), funnel_output = run_captured(test_funnel_analysis, events_df)
+        return [
+            ("Mixpanel Connection", mixpanel_success, mixpanel_output),
+            ("Data Transformation", transform_success, transform_output),
+            ("Funnel Analysis", funnel_success, funnel_output)
+        ]
     
-    # Test funnel analysis
-    funnel_success, _ = test_funnel_analysis(events_df)
-    results["Funnel Analysis"] = funnel_success
+    def run_single(name, test):
+        (success, _), output = run_captured(test)
+        return [(name, success, output)]
     
-    # Test events repository
-    repo_success, _ = test_events_repository()
-    results["Events Repository"] = repo_success
+    # Run the network-bound stages concurrently, buffering each stage's output
+    stdout = sys.stdout
+    sys.stdout = ThreadLocalStdout(stdout)
+    try:
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(run_events_pipeline),
+                executor.submit(run_single, "Events Repository", test_events_repository),
+                executor.submit(run_single, "Insights Engine", test_insights_engine)
+            ]
+            stages = [stage for future in futures for stage in future.result()]
+    finally:
+        sys.stdout = stdout
     
-    # Test insights engine
-    insights_success, _ = test_insights_engine()
-    results["Insights Engine"] = insights_success
+    # Print each stage's output in the original order
+    results = {}
+    for name, success, output in stages:
+        print(output, end="")
+        results[name] = success
     
     # Print summary
     print_header("Test Summary")
@@ -14,6 +14,11 @@ import logging
 import json
 from unittest.mock import patch, MagicMock
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 # Configure basic logging
 logging.basicConfig(
     level=logging.INFO,
@@ -24,21 +29,63 @@ def get_logger(name):
     """Simple logger function"""
     return logging.getLogger(name)
 
+def _trend_kernel(y):
+    """
+    Fit a least-squares line to y against its index.
+    
+    Args:
+        y: float64 array of observations
+        
+    Returns:
+        Tuple of (slope, intercept, r_squared)
+    """
+    n = y.shape[0]
+    
+    # Closed-form fit from the running sums
+    sum_x = 0.0
+    sum_y = 0.0
+    sum_xy = 0.0
+    sum_xx = 0.0
+    for i in range(n):
+        sum_x += i
+        sum_y += y[i]
+        sum_xy += i * y[i]
+        sum_xx += i * i
+    slope = (n * sum_xy - sum_x * sum_y) / (n * sum_xx - sum_x * sum_x)
+    intercept = (sum_y - slope * sum_x) / n
+    
+    # R-squared
+    mean_y = sum_y / n
+    ss_total = 0.0
+    ss_residual = 0.0
+    for i in range(n):
+        ss_total += (y[i] - mean_y) ** 2
+        ss_residual += (y[i] - (slope * i + intercept)) ** 2
+    r_squared = 1 - (ss_residual / ss_total)
+    
+    return slope, intercept, r_squared
+
+# Compile the kernel when numba is available
+if njit is not None:
+    _trend_kernel = njit(cache=True, fastmath=True, error_model="numpy")(_trend_kernel)
+
 # Create sample time series data for testing
 def create_sample_time_series():
     """Create sample time series data for testing trend detection"""
     dates = pd.date_range(start='2025-01-01', periods=30, freq='D')
     
+    days = np.arange(30)
+    
     # Upward trend
-    upward_values = [100 + i*5 + np.random.normal(0, 10) for i in range(30)]
+    upward_values = 100 + days*5 + np.random.normal(0, 10, 30)
     upward_series = pd.Series(upward_values, index=dates)
     
     # Downward trend
-    downward_values = [500 - i*5 + np.random.normal(0, 10) for i in range(30)]
+    downward_values = 500 - days*5 + np.random.normal(0, 10, 30)
     downward_series = pd.Series(downward_values, index=dates)
     
     # No trend (random)
-    random_values = [300 + np.random.normal(0, 30) for _ in range(30)]
+    random_values = 300 + np.random.normal(0, 30, 30)
     random_series = pd.Series(random_values, index=dates)
     
     return upward_series, downward_series, random_series
@@ -57,18 +104,10 @@ def test_trend_detection():
         if len(time_series) < 7:
             return "Not enough data"
         
-        # Linear regression
-        x = np.arange(len(time_series))
-        y = time_series.values
-        
-        # Calculate slope using numpy's polyfit
-        slope, intercept = np.polyfit(x, y, 1)
-        
-        # Calculate R-squared
-        y_pred = slope * x + intercept
-        ss_total = np.sum((y - np.mean(y))**2)
-        ss_residual = np.sum((y - y_pred)**2)
-        r_squared = 1 - (ss_residual / ss_total)
+        # Linear regression and R-squared
+        slope, intercept, r_squared = _trend_kernel(
+            np.ascontiguousarray(time_series.values, dtype=np.float64)
+        )
         
         # Calculate percent change
         first_value = time_series.iloc[0]
@@ -108,75 +147,64 @@ def test_cohort_analysis():
     """Test basic cohort analysis functionality"""
     print("\n=== Testing Cohort Analysis Functionality ===")
     
-    # Create sample user data
-    user_data = []
-    
     # Create 3 cohorts (users who joined in different weeks)
-    cohort_start_dates = [
+    cohort_start_dates = pd.to_datetime([
         datetime(2025, 1, 1),
         datetime(2025, 1, 8),
         datetime(2025, 1, 15)
-    ]
+    ])
+    num_cohorts, users_per_cohort, num_days = len(cohort_start_dates), 10, 28
     
-    for cohort_idx, start_date in enumerate(cohort_start_dates):
-        cohort_name = f"Cohort {cohort_idx+1}"
-        
-        # 10 users per cohort
-        for user_idx in range(10):
-            user_id = f"user_{cohort_idx}_{user_idx}"
-            
-            # Each user has events on multiple days with diminishing activity
-            # (simulating retention drop-off)
-            for day in range(28):
-                # Retention drops off differently for each cohort
-                if cohort_idx == 0:  # First cohort has best retention
-                    retention_prob = 0.9 - (day * 0.02)
-                elif cohort_idx == 1:  # Second cohort has medium retention
-                    retention_prob = 0.8 - (day * 0.03)
-                else:  # Third cohort has worst retention
-                    retention_prob = 0.7 - (day * 0.04)
-                
-                # Skip if user churned (probability below threshold)
-                if np.random.random() > max(0.1, retention_prob):
-                    continue
-                
-                event_date = start_date + timedelta(days=day)
-                user_data.append({
-                    "user_id": user_id,
-                    "cohort": cohort_name,
-                    "date": event_date,
-                    "first_date": start_date,
-                    "day_number": day
-                })
+    # Retention drops off differently for each cohort: the first cohort has
+    # the best retention, the third the worst
+    day = np.arange(num_days)
+    retention_prob = np.array([0.9, 0.8, 0.7])[:, None] - np.array([0.02, 0.03, 0.04])[:, None] * day
+    
+    # Each user is active on a day unless they churned (random draw above
+    # the retention probability, floored at 0.1)
+    active = np.random.random((num_cohorts, users_per_cohort, num_days)) <= np.maximum(0.1, retention_prob)[:, None, :]
+    cohort_idx, user_idx, day_number = np.nonzero(active)
     
     # Convert to DataFrame
-    df = pd.DataFrame(user_data)
+    first_date = cohort_start_dates[cohort_idx]
+    df = pd.DataFrame({
+        "user_id": [f"user_{c}_{u}" for c, u in zip(cohort_idx, user_idx)],
+        "cohort": [f"Cohort {c+1}" for c in cohort_idx],
+        "date": first_date + pd.to_timedelta(day_number, unit="D"),
+        "first_date": first_date,
+        "day_number": day_number
+    })
     
     # Calculate retention by cohort and day
     def calculate_retention(df):
         """Calculate retention rates by cohort and day"""
-        # Count unique users by cohort and day
-        user_counts = df.groupby(['cohort', 'day_number'])['user_id'].nunique().reset_index()
+        cohort_codes, cohorts = pd.factorize(df['cohort'], sort=True)
+        day_codes, days = pd.factorize(df['day_number'], sort=True)
+        user_codes, users = pd.factorize(df['user_id'])
+        n_days, n_users = len(days), len(users)
         
-        # Get cohort sizes (users on day 0)
-        cohort_sizes = user_counts[user_counts['day_number'] == 0].copy()
-        cohort_sizes.rename(columns={'user_id': 'cohort_size'}, inplace=True)
-        cohort_sizes.drop('day_number', axis=1, inplace=True)
+        # Count unique users by cohort and day: one sorted key per distinct
+        # (cohort, day, user), then the number of keys in each cell
+        keys = np.unique((cohort_codes * n_days + day_codes) * n_users + user_codes)
+        cells, counts = np.unique(keys // n_users, return_counts=True)
+        user_counts = np.full(len(cohorts) * n_days, np.nan)
+        user_counts[cells] = counts
+        user_counts = user_counts.reshape(len(cohorts), n_days)
         
-        # Merge with cohort sizes
-        retention = user_counts.merge(cohort_sizes, on='cohort')
+        # Divide each cohort by its size (users on day 0)
+        if n_days == 0 or days[0] != 0:
+            return pd.DataFrame()
+        retention = user_counts / user_counts[:, :1]
         
-        # Calculate retention rate
-        retention['retention_rate'] = retention['user_id'] / retention['cohort_size']
+        # Keep cohorts with a day 0 and days seen in any of them
+        rows = ~np.isnan(retention[:, 0])
+        columns = ~np.isnan(retention[rows]).all(axis=0)
         
-        # Pivot for easier analysis
-        pivot = retention.pivot_table(
-            index='cohort',
-            columns='day_number',
-            values='retention_rate'
+        return pd.DataFrame(
+            retention[rows][:, columns],
+            index=pd.Index(cohorts[rows], name='cohort'),
+            columns=pd.Index(days[columns], name='day_number')
         )
-        
-        return pivot
     
     retention_pivot = calculate_retention(df)
     print("Retention rates by cohort and day:")
@@ -238,20 +266,9 @@ def test_data_transformation():
         if not events:
             return pd.DataFrame()
         
-        # Convert to DataFrame
-        records = []
-        for event in events:
-            record = {"event": event["event"]}
-            
-            # Add properties
-            if "properties" in event:
-                for key, value in event["properties"].items():
-                    record[key] = value
-            
-            records.append(record)
-        
-        # Create DataFrame
-        df = pd.DataFrame(records)
+        # Flatten the properties one level into columns, dropping their prefix
+        df = pd.json_normalize(events, max_level=1)
+        df.columns = df.columns.str.replace(r"^properties\.", "", regex=True)
         
         # Convert timestamp to datetime
         if "time" in df.columns:
@@ -267,13 +284,13 @@ def test_data_transformation():
     # Extract user metrics
     def extract_user_metrics(df):
         """Extract user-level metrics from event data"""
-        user_metrics = df.groupby("distinct_id").agg({
-            "event": ["count", "nunique"],
-            "time": ["min", "max"]
-        })
-        
-        # Flatten column names
-        user_metrics.columns = ["_".join(col).strip() for col in user_metrics.columns.values]
+        # Named aggregations give flat column names directly
+        user_metrics = df.groupby("distinct_id", sort=False).agg(
+            event_count=("event", "count"),
+            event_nunique=("event", "nunique"),
+            time_min=("time", "min"),
+            time_max=("time", "max")
+        )
         
         # Calculate session duration
         user_metrics["session_duration_hours"] = (
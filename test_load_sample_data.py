@@ -0,0 +1,34 @@
+"""
+HitCraft Analytics - Sample Data Test
+
+This script checks that the sessions and profiles derived from generated
+sample data match the way the sample sessions are built.
+"""
+
+import os
+import sys
+
+# Add the project path to system path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from load_sample_data import build_derived, generate_sample_data
+
+
+def test_derived_sessions_match_generated_sessions():
+    """Every derived session holds one generated session: an app_open plus 3-10 events."""
+    events = generate_sample_data(num_days=30, events_per_day=100)
+    sessions, profiles = build_derived(events)
+
+    assert len(sessions) == sum(1 for event in events if event["event_name"] == "app_open")
+    for session in sessions:
+        assert 4 <= session["event_count"] <= 11, session
+        assert session["end_time"] >= session["start_time"]
+
+    # Every event is counted in exactly one session and one profile
+    assert sum(session["event_count"] for session in sessions) == len(events)
+    assert sum(profile["event_count"] for profile in profiles) == len(events)
+
+
+if __name__ == "__main__":
+    test_derived_sessions_match_generated_sessions()
+    print("Sample data test PASSED")